@@ -0,0 +1,104 @@
+"""
+benchmarks/generators.py
+
+Seeded synthetic data for the benchmark suite. The same (size, seed)
+always produces the same data, so timings are comparable between runs.
+"""
+
+import random
+
+from datetime import datetime, timedelta
+
+from scout.listing import Listing
+
+WORDS = [
+    "nintendo", "ds", "lite", "console", "camera", "vintage", "lens",
+    "sony", "walkman", "cassette", "player", "blue", "black", "white",
+    "tested", "working", "mint", "boxed", "bundle", "charger", "games",
+]
+
+BAD_WORDS = ["for parts", "broken", "as is", "not working"]
+
+CONDITIONS = ["New", "Used", "Open box", "For parts or not working"]
+
+
+def make_prices(n: int, seed: int = 0) -> list:
+    """
+    Right-skewed prices around $40, like a typical used-goods search.
+    """
+    rng = random.Random(seed)
+    return [round(rng.lognormvariate(3.7, 0.5), 2) for _ in range(n)]
+
+
+def make_titles(n: int, seed: int = 0, bad_ratio: float = 0.1) -> list:
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(4, 10))
+        if rng.random() < bad_ratio:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(BAD_WORDS))
+        titles.append(" ".join(words).title())
+    return titles
+
+
+def make_listings(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    titles = make_titles(n, seed=seed)
+    start = datetime(2025, 1, 1)
+    listings = []
+    for i, title in enumerate(titles):
+        price = round(rng.lognormvariate(3.7, 0.5), 2)
+        listings.append(
+            Listing(
+                title=title,
+                price=price,
+                url=f"https://example.com/item/{i}",
+                source="synthetic",
+                image_urls=[f"https://example.com/img/{i}.jpg"],
+                current_bid=round(price * rng.uniform(0.3, 1.2), 2),
+                shipping_cost=rng.choice([None, 0.0, 4.99, 9.99]),
+                timestamp=start + timedelta(seconds=i),
+            )
+        )
+    return listings
+
+
+def make_browse_payload(n: int, seed: int = 0, offset: int = 0, total=None) -> dict:
+    """
+    A Browse API item_summary/search response with n itemSummaries.
+    """
+    rng = random.Random(seed * 1_000_003 + offset)
+    titles = make_titles(n, seed=seed + offset)
+    items = []
+    for i, title in enumerate(titles, start=offset):
+        item = {
+            "itemId": f"v1|{100000000 + i}|0",
+            "title": title,
+            "condition": rng.choice(CONDITIONS),
+            "conditionId": "3000",
+            "itemWebUrl": f"https://www.ebay.com/itm/{100000000 + i}",
+            "image": {"imageUrl": f"https://i.ebayimg.com/images/g/{i}/s-l225.jpg"},
+            "seller": {"username": f"seller{rng.randint(1, 5000)}", "feedbackScore": rng.randint(0, 10000)},
+            "buyingOptions": ["FIXED_PRICE"],
+            "itemLocation": {"postalCode": "9***", "country": "US"},
+        }
+        # A few listings have no or malformed prices, like the real API
+        roll = rng.random()
+        if roll < 0.01:
+            pass
+        elif roll < 0.02:
+            item["price"] = {"value": "n/a", "currency": "USD"}
+        else:
+            item["price"] = {
+                "value": f"{rng.lognormvariate(3.7, 0.5):.2f}",
+                "currency": "USD",
+            }
+        items.append(item)
+
+    return {
+        "href": "https://api.ebay.com/buy/browse/v1/item_summary/search",
+        "total": total if total is not None else offset + n,
+        "limit": n,
+        "offset": offset,
+        "itemSummaries": items,
+    }
@@ -0,0 +1,72 @@
+"""
+benchmarks/listing_memory.py
+
+Compare the memory cost of Listing and CompactListing.
+
+Usage:
+    python -m benchmarks.listing_memory --rows 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from datetime import datetime, timedelta
+
+from scout.listing import Listing, CompactListing
+
+
+def build_rows(cls, rows: int):
+    """
+    Build `rows` listings shaped like a real crawl: unique titles and URLs,
+    a handful of sources decoded as fresh strings, mostly one image URL.
+    """
+    sources = ["ebay", "mock", "craigslist"]
+    start = datetime(2025, 1, 1)
+    items = []
+    for i in range(rows):
+        # Decoding makes a new string object per row, like a JSON decoder would
+        source = sources[i % len(sources)].encode().decode()
+        image_urls = [f"https://example.com/img/{i}.jpg"] if i % 4 else []
+        items.append(
+            cls(
+                title=f"Listing number {i}",
+                price=10.0 + (i % 500),
+                url=f"https://example.com/item/{i}",
+                source=source,
+                image_urls=image_urls,
+                current_bid=5.0 + (i % 100),
+                shipping_cost=4.99,
+                timestamp=start + timedelta(seconds=i),
+            )
+        )
+    return items
+
+
+def bytes_per_listing(cls, rows: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build_rows(cls, rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    plain = bytes_per_listing(Listing, args.rows)
+    compact = bytes_per_listing(CompactListing, args.rows)
+
+    print(f"Rows: {args.rows:,}")
+    print(f"Listing:        {plain:8.1f} bytes/listing")
+    print(f"CompactListing: {compact:8.1f} bytes/listing")
+    print(f"Saved:          {100 * (1 - compact / plain):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+benchmarks/run.py
+
+Time and peak-memory benchmarks for the pricing, analyzer, pipeline and
+formatter hot paths.
+
+Usage:
+    python -m benchmarks.run                               # default sizes
+    python -m benchmarks.run --sizes 100,10000,1000000     # up to 10^6
+    python -m benchmarks.run --save baseline.json          # record a baseline
+    python -m benchmarks.run --compare baseline.json --threshold 0.25
+
+With --compare the run exits with status 1 if any benchmark got slower
+(or used more peak memory) than the baseline by more than the threshold.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generators import (
+    make_browse_payload,
+    make_listings,
+    make_prices,
+    make_titles,
+)
+from scout.analyzer import sort_by_profit
+from scout.confidence import approximate_intervals_many, bootstrap_intervals
+from scout.formatter import format_currency, print_table, write_rows
+from scout.parallel import summarize_keywords
+from scout.pipeline import run_pipeline
+from scout.priceindex import PriceIndex
+from scout.priceset import PriceSet
+from scout.sources import IterableSource
+from scout.browse import parse_browse_page
+from scout.pricing import (
+    _check_title,
+    classify_titles,
+    compute_confidence,
+    is_suspicious_title,
+    summarize_prices,
+    trimmed_mean,
+)
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+# ----- benchmark bodies -----
+# Each entry: name -> (setup(size) -> args, function(*args))
+
+def _bench_title_loop(titles):
+    return [is_suspicious_title(t) for t in titles]
+
+
+def _browse_body(size):
+    return (json.dumps(make_browse_payload(size)).encode("utf-8"),)
+
+
+def _bench_browse_page_dicts(body):
+    # Reference for the old path: full json decode, then one dict per item
+    summaries = json.loads(body).get("itemSummaries", [])
+    phrases = classify_titles([item.get("title", "") for item in summaries])
+    records = []
+    for item, phrase in zip(summaries, phrases):
+        price_info = item.get("price")
+        reason = None
+        value = None
+        if not price_info:
+            reason = "no price"
+        elif phrase is not None:
+            reason = f"suspicious title ('{phrase}')"
+        if reason is None:
+            try:
+                value = float(price_info["value"])
+            except (KeyError, ValueError, TypeError):
+                reason = "invalid price format"
+        image = item.get("image") or {}
+        records.append({
+            "item_id": item.get("itemId"),
+            "title": item.get("title", ""),
+            "condition": item.get("condition", ""),
+            "price": value,
+            "image_url": image.get("imageUrl"),
+            "item_url": item.get("itemWebUrl"),
+            "reason": reason,
+        })
+    return records
+
+
+def _bench_browse_page(body, incremental=None):
+    items = parse_browse_page(body, incremental=incremental).items
+    phrases = classify_titles([record.title for record in items])
+    return [_check_title(record, phrase) for record, phrase in zip(items, phrases)]
+
+
+def _bench_browse_page_incremental(body):
+    return _bench_browse_page(body, incremental=True)
+
+
+def _setup_repoll(size):
+    # Two polls of the same keyword that differ in 1% of the listings
+    prices = make_prices(size)
+    before = {f"item-{i}": price for i, price in enumerate(prices)}
+    after = dict(before)
+    for i in range(0, size, 100):
+        after[f"item-{i}"] = before[f"item-{i}"] * 1.05
+    return PriceSet(before), before, after
+
+
+def _bench_repoll(price_set, before, after):
+    price_set.apply(after)
+    price_set.apply(before)
+    return price_set.summary()
+
+
+def _bench_nearest_by_sort(prices):
+    # Reference for the old option 9: sort everything to take 10
+    median = prices[len(prices) // 2]
+    return sorted(prices, key=lambda p: abs(p - median))[:10]
+
+
+def _setup_price_index(size):
+    prices = make_prices(size)
+    return PriceIndex(prices), prices[size // 2]
+
+
+def _bench_price_index_queries(index, price):
+    return index.nearest(price, 10), index.percentile_rank(price), index.range_count(price / 2, price * 2)
+
+
+def _keyword_prices(size):
+    # `size` prices spread over keywords of 100 listings each
+    prices = make_prices(size)
+    return ({f"keyword {i // 100}": prices[i:i + 100] for i in range(0, size, 100)},)
+
+
+def _bench_keywords_loop(price_data):
+    return {
+        keyword: compute_confidence(summarize_prices(prices))
+        for keyword, prices in price_data.items()
+    }
+
+
+def _bench_bootstrap(prices):
+    return bootstrap_intervals(prices, seed=0)
+
+
+def _table_rows(size):
+    rows = [
+        [r["title"], format_currency(r["market_value"]),
+         format_currency(r["total_cost"]), format_currency(r["profit"])]
+        for r in run_pipeline(make_listings(size))
+    ]
+    return rows, ["Title", "Market Value", "Total Cost", "Profit"]
+
+
+def _bench_pipeline_stream(listings):
+    # The staged pipeline end to end: event loop, queues and top-k sink
+    return run_pipeline(sources=[IterableSource(listings)], top_k=10)
+
+
+def _bench_print_table(rows, headers):
+    with contextlib.redirect_stdout(io.StringIO()):
+        print_table(rows, headers)
+
+
+def _bench_stream_table(rows, headers):
+    write_rows(iter(rows), headers, "table", stream=io.StringIO())
+
+
+def _bench_tsv(rows, headers):
+    write_rows(iter(rows), headers, "tsv", stream=io.StringIO())
+
+
+BENCHMARKS = {
+    "summarize_prices": (lambda n: (make_prices(n),), summarize_prices),
+    "trimmed_mean": (lambda n: (make_prices(n),), trimmed_mean),
+    "priceset_repoll": (_setup_repoll, _bench_repoll),
+    "nearest_by_sort": (lambda n: (make_prices(n),), _bench_nearest_by_sort),
+    "price_index_build": (lambda n: (make_prices(n),), PriceIndex),
+    "price_index_queries": (_setup_price_index, _bench_price_index_queries),
+    "summarize_keywords_loop": (_keyword_prices, _bench_keywords_loop),
+    "summarize_keywords": (_keyword_prices, summarize_keywords),
+    "bootstrap_intervals": (lambda n: (make_prices(n),), _bench_bootstrap),
+    "approximate_intervals_many": (_keyword_prices, approximate_intervals_many),
+    "is_suspicious_title": (lambda n: (make_titles(n),), _bench_title_loop),
+    "classify_titles": (lambda n: (make_titles(n),), classify_titles),
+    "browse_page_dicts": (_browse_body, _bench_browse_page_dicts),
+    "browse_page_parse": (_browse_body, _bench_browse_page),
+    "browse_page_incremental": (_browse_body, _bench_browse_page_incremental),
+    "sort_by_profit": (lambda n: (make_listings(n),), sort_by_profit),
+    "run_pipeline": (lambda n: (make_listings(n),), run_pipeline),
+    "pipeline_stream_top10": (lambda n: (make_listings(n),), _bench_pipeline_stream),
+    "print_table": (_table_rows, _bench_print_table),
+    "write_table_stream": (_table_rows, _bench_stream_table),
+    "write_tsv": (_table_rows, _bench_tsv),
+}
+
+
+# ----- measurement -----
+
+def measure(func, args, repeat: int) -> dict:
+    """
+    Best-of-`repeat` wall time, then one extra traced run for peak memory
+    (tracing is kept out of the timed runs because it slows them down).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run_suite(sizes, names=None, repeat: int = 3, log=print) -> dict:
+    results = {}
+    for name, (setup, func) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            args = setup(size)
+            result = measure(func, args, repeat)
+            key = f"{name}@{size}"
+            results[key] = result
+            log(
+                f"{key:<32} {result['seconds'] * 1000:>12.3f} ms"
+                f" {result['peak_bytes'] / 1024:>12.1f} KiB"
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, noise_floor: float = 0.001) -> list:
+    """
+    Return a list of human-readable regressions (empty if none).
+    Timings where both runs are under `noise_floor` seconds are too noisy
+    to judge and are skipped.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            old, new = base[metric], result[metric]
+            if metric == "seconds" and max(old, new) < noise_floor:
+                continue
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append(
+                    f"{key} {metric}: {old:.6g} -> {new:.6g} (+{(new / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the resell-scout benchmarks.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated input sizes (default: %(default)s)")
+    parser.add_argument("--only", default="",
+                        help="comma-separated benchmark names to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing, e.g. 0.25 = 25%%")
+    parser.add_argument("--noise-floor", type=float, default=0.001,
+                        help="ignore timings below this many seconds (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    names = [n for n in args.only.split(",") if n]
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    results = run_suite(sizes, names, repeat=args.repeat)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nSaved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.noise_floor)
+        if regressions:
+            print(f"\nRegressions over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%}.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
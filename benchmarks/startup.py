@@ -0,0 +1,107 @@
+"""
+benchmarks/startup.py
+
+Cold-start check for the scout CLI.
+
+Measures how long a fresh interpreter takes to import the CLI entry
+modules (minus bare interpreter startup) and verifies that heavy
+subsystems are not imported eagerly. Exits with status 1 if the import
+time goes over the budget or a heavy module shows up.
+
+Usage:
+    python -m benchmarks.startup --budget-ms 60
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Imported by a short invocation such as printing mock listings
+TARGETS = ["scout", "scout.app", "scout.__main__"]
+
+# Only the menu options / commands that need them may load these
+HEAVY_MODULES = [
+    "requests",
+    "numpy",
+    "sqlite3",
+    "scout.pricing",
+    "scout.cache",
+    "scout.images",
+    "scout.scheduler",
+    "scout.transport",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {targets!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def wall_time(code: str) -> float:
+    """
+    Total wall time of `python -c code` in a fresh process, in seconds.
+    """
+    import time
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def measure(runs: int) -> dict:
+    probe = PROBE.format(targets=TARGETS, heavy=HEAVY_MODULES)
+
+    import_times = []
+    loaded = set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+        )
+        result = json.loads(out.stdout)
+        import_times.append(result["seconds"])
+        loaded.update(result["loaded"])
+
+    bare = min(wall_time("pass") for _ in range(runs))
+    cold = min(wall_time("import scout.app") for _ in range(runs))
+
+    return {
+        "import_ms": min(import_times) * 1000,
+        "interpreter_ms": bare * 1000,
+        "cold_start_ms": cold * 1000,
+        "heavy_loaded": sorted(loaded),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check scout CLI cold-start time.")
+    parser.add_argument("--budget-ms", type=float, default=60.0,
+                        help="max time to import the CLI modules (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs)
+    print(f"Interpreter startup:   {result['interpreter_ms']:8.1f} ms")
+    print(f"Cold start (scout.app):{result['cold_start_ms']:8.1f} ms")
+    print(f"CLI module imports:    {result['import_ms']:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if result["heavy_loaded"]:
+        print(f"Eagerly imported heavy modules: {', '.join(result['heavy_loaded'])}")
+        failed = True
+    if result["import_ms"] > args.budget_ms:
+        print("Import time is over budget.")
+        failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,14 @@
 main.py
 
 Small entry script for the AI Resell Scout project.
-Delegates all application logic to scout.app.run_app().
+Delegates all application logic to scout.app.run_app()
+(through the `python -m scout` command line, so `--profile` works here too).
 """
 
-from scout.app import run_app
+import sys
+
+from scout.__main__ import main
 
 
 if __name__ == "__main__":
-    run_app()
+    sys.exit(main())
@@ -1,3 +1,27 @@
-from .listing import Listing
-from .mock_fetcher import fetch_mock_listings
-from .analyzer import total_cost, naive_profit, sort_by_profit
+# Public names are loaded on first access (PEP 562), so "import scout" or
+# running a single submodule does not pull in every subsystem up front.
+_EXPORTS = {
+    "Listing": "scout.listing",
+    "fetch_mock_listings": "scout.mock_fetcher",
+    "total_cost": "scout.analyzer",
+    "naive_profit": "scout.analyzer",
+    "sort_by_profit": "scout.analyzer",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'scout' has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,71 @@
+"""
+python -m scout                 -> interactive menu (same as main.py)
+python -m scout evaluate ...    -> headless bulk evaluation
+python -m scout --profile ...   -> either of the above, with a timing report
+"""
+
+import argparse
+import sys
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scout", description="AI Resell Scout")
+    parser.add_argument("--profile", action="store_true",
+                        help="time API calls, filtering, statistics and output; "
+                             "print a report to stderr on exit")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="also write the metrics in Prometheus text format "
+                             "to PATH on exit (implies --profile)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    evaluate = subparsers.add_parser(
+        "evaluate",
+        help="evaluate a file of candidate auctions against eBay market values",
+        description=(
+            "Read candidates (columns: keyword, current_bid, shipping_cost, "
+            "optional title/url) and write market value, total cost and profit "
+            "for each row as soon as it is priced."
+        ),
+    )
+    evaluate.add_argument("--in", dest="in_path", required=True,
+                          help="candidates file (.csv or .jsonl, '-' for stdin)")
+    evaluate.add_argument("--out", dest="out_path", default="-",
+                          help="results file (.csv or .jsonl, '-' for stdout)")
+    evaluate.add_argument("--concurrency", type=int, default=8,
+                          help="rows priced in parallel (default: %(default)s)")
+
+    args = parser.parse_args(argv)
+
+    if not (args.profile or args.metrics_file):
+        return _run(args)
+
+    from scout import metrics
+
+    metrics.enable()
+    try:
+        return _run(args)
+    finally:
+        # Stop recording first so the report's own output is not measured
+        metrics.disable()
+        metrics.report(sys.stderr)
+        if args.metrics_file:
+            with open(args.metrics_file, "w", encoding="utf-8") as f:
+                f.write(metrics.to_prometheus())
+
+
+def _run(args) -> int:
+    if args.command == "evaluate":
+        from scout.bulk import run_evaluate
+
+        counts = run_evaluate(args.in_path, args.out_path, concurrency=args.concurrency)
+        print(f"Evaluated {counts['rows']} rows ({counts['errors']} errors).", file=sys.stderr)
+        return 0
+
+    from scout.app import run_app
+
+    run_app()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
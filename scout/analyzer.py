@@ -1,3 +1,4 @@
+from scout import metrics
 from scout.listing import Listing
 
 def total_cost(listing: Listing) -> float:
@@ -17,6 +18,7 @@ def naive_profit(listing: Listing) -> float:
     market_value = listing.price
     return market_value - total_cost(listing)
 
+@metrics.timed("analyzer.sort_by_profit")
 def sort_by_profit(listings):
     """
     Returns a new list of listings sorted by estimated profit (highest first).
@@ -26,3 +28,11 @@ def sort_by_profit(listings):
         key=lambda item: naive_profit(item),
         reverse=True
     )
+
+
+def cost_percentile(listing: Listing, price_index) -> float:
+    """
+    Where the listing's total cost falls among market prices
+    (scout.priceindex.PriceIndex): the percentage of listings priced below it.
+    """
+    return price_index.percentile_rank(total_cost(listing))
@@ -1,20 +1,55 @@
-import requests
-import os
-import re
-
 from scout.mock_fetcher import fetch_mock_listings
-from scout.analyzer import total_cost, naive_profit, sort_by_profit
+from scout.analyzer import total_cost, naive_profit, sort_by_profit, cost_percentile
 from scout.pipeline import run_pipeline
 from scout.listing import Listing
-from scout.formatter import format_currency, print_table
-from scout.pricing import (
-    fetch_ebay_prices,
-    summarize_prices,
-    estimate_market_value,
-    EbayPricingError,
-    compute_confidence
-)
-from scout.formatter import format_currency, print_table
+from scout.formatter import format_currency, format_interval, print_table
+
+# requests, scout.pricing, scout.cache and scout.images are imported inside
+# the menu options that need them, so the mock-data options start fast.
+# benchmarks/startup.py checks this stays true.
+
+# How long option 9 waits for images before showing the table
+IMAGE_WAIT_SECONDS = 20
+
+# Shared price cache for menu options 7-9, opened on first use
+_price_cache = None
+
+
+def get_price_cache():
+    global _price_cache
+    if _price_cache is None:
+        from scout.cache import PriceCache
+        from scout.history import PriceHistory
+        from scout.keywords import KeywordIndex
+
+        _price_cache = PriceCache(keyword_index=KeywordIndex(), history=PriceHistory())
+    return _price_cache
+
+
+def note_similar_keyword(keyword: str):
+    """
+    Tell the user when a keyword will reuse the prices of a similar one.
+    """
+    from scout.cache import normalize_keyword
+
+    canonical = get_price_cache().resolve_keyword(keyword)
+    # Case and spacing differences are the same search; say nothing
+    if normalize_keyword(canonical) != normalize_keyword(keyword):
+        print(f"(Using market data for the similar keyword '{canonical}')")
+
+
+# Shared image downloader for option 9, started on first use
+_image_downloader = None
+
+
+def get_image_downloader():
+    global _image_downloader
+    if _image_downloader is None:
+        from scout.images import ImageDownloader
+
+        _image_downloader = ImageDownloader()
+    return _image_downloader
+
 
 def show_menu():
     print("=== AI Resell Scout ===") # Simple menu display
@@ -32,6 +67,8 @@ def test_internet_connection():
     """
     Test internet connection by making a request to GitHub API.
     """    
+    import requests
+
     url= "https://api.github.com"
     
     try:
@@ -69,6 +106,8 @@ def run_app():
             test_internet_connection()
 
         elif choice == "2":
+            if _image_downloader is not None:
+                _image_downloader.close()
             print("Goodbye.")
             break
 
@@ -123,6 +162,9 @@ def run_app():
             print_table(rows, headers)
         
         elif choice == "7":
+            from scout.confidence import assess_confidence
+            from scout.pricing import EbayPricingError, summarize_prices
+
             keyword = input("Enter a keyword for eBay search (e.g., 'Nintendo DS Lite'): ").strip()
             if not keyword:
                 print("Keyword cannot be empty.\n")
@@ -132,13 +174,16 @@ def run_app():
             debug_mode = debug_choice == "y"
 
             try:
+                note_similar_keyword(keyword)
+                cache = get_price_cache()
                 if debug_mode:
-                    prices, debug_info = fetch_ebay_prices(keyword, collect_debug=True)
+                    prices, debug_info = cache.fetch_ebay_prices(keyword, collect_debug=True)
                 else:
-                    prices = fetch_ebay_prices(keyword)
+                    prices = cache.fetch_ebay_prices(keyword)
                     debug_info = None
 
                 summary = summarize_prices(prices)
+                confidence = assess_confidence(prices, summary)
             except EbayPricingError as e:
                 print(f"Error while fetching prices: {e}\n")
                 continue
@@ -154,7 +199,9 @@ def run_app():
                 ["Trimmed mean", format_currency(summary["trimmed_mean"])],
                 ["Q3",           format_currency(summary["q3"])],
                 ["Max",          format_currency(summary["max"])],
-                ["Confidence",   compute_confidence(summary)],
+                ["Confidence",   confidence["label"]],
+                ["Median 95% CI", format_interval(confidence["median_ci"])],
+                ["Trimmed mean 95% CI", format_interval(confidence["trimmed_mean_ci"])],
             ]
 
             print_table(rows, headers)
@@ -188,6 +235,9 @@ def run_app():
 
 
         elif choice == "8":
+            from scout.confidence import assess_confidence
+            from scout.pricing import EbayPricingError
+
             # 1. Get keyword to describe the item
             keyword = input(
                 "Enter a keyword describing the item (e.g., 'Nintendo DS Lite'): "
@@ -208,7 +258,11 @@ def run_app():
 
             # 3. Query eBay to estimate market value
             try:
-                summary = estimate_market_value(keyword)
+                note_similar_keyword(keyword)
+                cache = get_price_cache()
+                summary = cache.estimate_market_value(keyword)
+                price_index = cache.price_index(keyword)
+                confidence = assess_confidence(price_index.prices, summary)
             except EbayPricingError as e:
                 print(f"Error while fetching eBay prices: {e}\n")
                 continue
@@ -228,6 +282,8 @@ def run_app():
             # 5. Reuse your analyzer functions
             total = total_cost(candidate)
             profit = naive_profit(candidate)
+            cost_rank = cost_percentile(candidate, price_index)
+            cheaper = price_index.range_count(high=total)
 
             # 6. Show a summarized table
             print("\nAuction evaluation:\n")
@@ -242,11 +298,17 @@ def run_app():
                 ["eBay trimmed mean", format_currency(summary["trimmed_mean"])],
                 ["eBay Q3", format_currency(summary["q3"])],
                 ["eBay max", format_currency(summary["max"])],
-                ["eBay confidence score", compute_confidence(summary)],
+                ["eBay confidence score", confidence["label"]],
+                ["eBay median 95% CI", format_interval(confidence["median_ci"])],
                 ["Your bid", format_currency(current_bid)],
                 ["Shipping", format_currency(shipping_cost)],
                 ["Total cost (bid + shipping)", format_currency(total)],
+                ["Total cost percentile rank", f"{cost_rank:.0f}%"],
+                ["eBay listings at or below total cost", f"{cheaper} of {len(price_index)}"],
                 ["Estimated profit (median - total)", format_currency(profit)],
+                ["Profit range (median 95% CI)", format_interval(
+                    (confidence["median_ci"][0] - total, confidence["median_ci"][1] - total)
+                )],
             ]
 
 
@@ -254,6 +316,9 @@ def run_app():
             print()
 
         elif choice == "9":
+            from concurrent.futures import wait
+            from scout.pricing import EbayPricingError
+
             keyword = input(
                 "Enter a keyword for which to inspect median-neighborhood listings: "
             ).strip()
@@ -262,48 +327,44 @@ def run_app():
                 continue
 
             try:
-                prices, debug_info = fetch_ebay_prices(keyword, collect_debug=True)
-                summary = summarize_prices(prices)
+                note_similar_keyword(keyword)
+                cache = get_price_cache()
+                price_index = cache.price_index(keyword)
+                summary = cache.estimate_market_value(keyword)
             except EbayPricingError as e:
                 print(f"Error while fetching prices: {e}\n")
                 continue
 
-            kept = debug_info.get("kept", [])
-            if not kept:
+            if not len(price_index):
                 print("No usable listings found for this keyword after filtering.\n")
                 continue
 
-            median = summary["median"]
-
-            # Sort kept listings by distance from median price
-            kept_sorted = sorted(kept, key=lambda item: abs(item["price"] - median))
-            closest = kept_sorted[:10]
-
-            # Ensure images/ directory exists
-            images_dir = "images"
-            os.makedirs(images_dir, exist_ok=True)
-
-            # Create a safe prefix for filenames from the keyword
-            safe_keyword = re.sub(r"[^a-zA-Z0-9_-]+", "_", keyword.lower())[:30]
+            # The 10 kept listings closest to the median price (copied, since
+            # the index is shared through the cache)
+            closest = [dict(item) for item in price_index.nearest(summary["median"], 10)]
 
-            # Download first images
-            for idx, item in enumerate(closest, start=1):
+            # Download images on the shared worker pool; wait briefly so the
+            # table can show them, slower downloads keep going in background
+            downloader = get_image_downloader()
+            pending = []
+            for item in closest:
                 img_url = item.get("image_url")
                 if not img_url:
                     item["image_file"] = "(no image URL)"
                     continue
+                pending.append((downloader.submit(img_url), item))
 
-                try:
-                    resp = requests.get(img_url, timeout=15)
-                    if resp.status_code == 200:
-                        filename = os.path.join(images_dir, f"{safe_keyword}_{idx}.jpg")
-                        with open(filename, "wb") as f:
-                            f.write(resp.content)
-                        item["image_file"] = filename
-                    else:
-                        item["image_file"] = f"(HTTP {resp.status_code})"
-                except requests.RequestException:
-                    item["image_file"] = "(download error)"
+            wait([future for future, _ in pending], timeout=IMAGE_WAIT_SECONDS)
+            for future, item in pending:
+                if not future.done():
+                    item["image_file"] = "(still downloading)"
+                    continue
+                result = future.result()
+                if result.error:
+                    item["image_file"] = f"({result.error})"
+                else:
+                    item["image_file"] = result.path
+            downloader.save_index()
 
             # Display a table of the selected listings
             print("\nListings closest to median price (up to 10):\n")
@@ -323,7 +384,8 @@ def run_app():
 
             print_table(rows, headers)
             print(
-                f"\nImages (if downloaded successfully) are saved in the '{images_dir}' folder.\n"
+                f"\nImages (if downloaded successfully) are saved in the "
+                f"'{downloader.directory}' folder.\n"
             )
 
 
@@ -0,0 +1,180 @@
+import numpy as np
+
+from typing import List, Optional
+
+from scout.listing import Listing
+
+
+class ListingBatch:
+    """
+    Columnar container for many listings at once.
+
+    Numeric fields live in NumPy arrays so total cost, profit and ranking
+    are computed for the whole batch in one vectorized pass. Optional
+    numbers are stored as 0.0 with a boolean "missing" mask next to them,
+    which keeps the round trip to list[Listing] lossless (None stays None).
+    Text fields, image URLs and timestamps are kept as plain Python lists.
+    """
+
+    def __init__(
+        self,
+        price,
+        current_bid=None,
+        shipping_cost=None,
+        bid_missing=None,
+        shipping_missing=None,
+        titles: Optional[List[str]] = None,
+        urls: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        image_urls: Optional[list] = None,
+        timestamps: Optional[list] = None,
+    ):
+        self.price = np.asarray(price, dtype=np.float64)
+        n = len(self.price)
+
+        self.current_bid = _column(current_bid, n)
+        self.shipping_cost = _column(shipping_cost, n)
+        self.bid_missing = _mask(bid_missing, current_bid, n)
+        self.shipping_missing = _mask(shipping_missing, shipping_cost, n)
+
+        self.titles = titles if titles is not None else [""] * n
+        self.urls = urls if urls is not None else [""] * n
+        self.sources = sources if sources is not None else ["Unknown"] * n
+        self.image_urls = image_urls if image_urls is not None else [[] for _ in range(n)]
+        self.timestamps = timestamps if timestamps is not None else [None] * n
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    # ----- conversion -----
+
+    @classmethod
+    def from_listings(cls, listings) -> "ListingBatch":
+        listings = list(listings)
+        n = len(listings)
+
+        bids = np.zeros(n, dtype=np.float64)
+        shipping = np.zeros(n, dtype=np.float64)
+        bid_missing = np.zeros(n, dtype=bool)
+        shipping_missing = np.zeros(n, dtype=bool)
+
+        for i, item in enumerate(listings):
+            if item.current_bid is None:
+                bid_missing[i] = True
+            else:
+                bids[i] = item.current_bid
+            if item.shipping_cost is None:
+                shipping_missing[i] = True
+            else:
+                shipping[i] = item.shipping_cost
+
+        return cls(
+            price=np.fromiter((item.price for item in listings), dtype=np.float64, count=n),
+            current_bid=bids,
+            shipping_cost=shipping,
+            bid_missing=bid_missing,
+            shipping_missing=shipping_missing,
+            titles=[item.title for item in listings],
+            urls=[item.url for item in listings],
+            sources=[item.source for item in listings],
+            image_urls=[list(item.image_urls) for item in listings],
+            timestamps=[item.timestamp for item in listings],
+        )
+
+    def to_listings(self) -> List[Listing]:
+        return [self.listing_at(i) for i in range(len(self))]
+
+    def listing_at(self, index: int) -> Listing:
+        index = int(index)
+        kwargs = {}
+        if self.timestamps[index] is not None:
+            kwargs["timestamp"] = self.timestamps[index]
+
+        return Listing(
+            title=self.titles[index],
+            price=float(self.price[index]),
+            url=self.urls[index],
+            source=self.sources[index],
+            image_urls=list(self.image_urls[index]),
+            current_bid=None if self.bid_missing[index] else float(self.current_bid[index]),
+            shipping_cost=None if self.shipping_missing[index] else float(self.shipping_cost[index]),
+            **kwargs,
+        )
+
+    def take(self, indices) -> "ListingBatch":
+        """
+        Return a new batch with only the given rows, in the given order.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        pick = indices.tolist()
+        return ListingBatch(
+            price=self.price[indices],
+            current_bid=self.current_bid[indices],
+            shipping_cost=self.shipping_cost[indices],
+            bid_missing=self.bid_missing[indices],
+            shipping_missing=self.shipping_missing[indices],
+            titles=[self.titles[i] for i in pick],
+            urls=[self.urls[i] for i in pick],
+            sources=[self.sources[i] for i in pick],
+            image_urls=[self.image_urls[i] for i in pick],
+            timestamps=[self.timestamps[i] for i in pick],
+        )
+
+    # ----- vectorized analyzer functions -----
+
+    def total_cost(self) -> np.ndarray:
+        """
+        Vectorized scout.analyzer.total_cost: bid + shipping, missing as 0.
+        """
+        return self.current_bid + self.shipping_cost
+
+    def naive_profit(self, market_value=None) -> np.ndarray:
+        """
+        Vectorized scout.analyzer.naive_profit.
+        `market_value` (scalar or array) overrides the price column.
+        """
+        value = self.price if market_value is None else market_value
+        return value - self.total_cost()
+
+    def top_k_by_profit(self, k: int, market_value=None) -> np.ndarray:
+        """
+        Indices of the k most profitable rows, best first.
+        Uses argpartition so only the top k are actually sorted.
+        """
+        profit = self.naive_profit(market_value)
+        n = len(profit)
+        if k <= 0 or n == 0:
+            return np.empty(0, dtype=np.intp)
+        if k >= n:
+            return np.argsort(-profit, kind="stable")
+
+        top = np.argpartition(-profit, k - 1)[:k]
+        return top[np.argsort(-profit[top], kind="stable")]
+
+    def sort_by_profit(self, k: Optional[int] = None) -> List[Listing]:
+        """
+        Batch counterpart of scout.analyzer.sort_by_profit.
+        Returns the top k listings (all of them if k is None).
+        """
+        k = len(self) if k is None else k
+        return [self.listing_at(i) for i in self.top_k_by_profit(k)]
+
+
+def _column(values, n: int) -> np.ndarray:
+    if values is None:
+        return np.zeros(n, dtype=np.float64)
+
+    if isinstance(values, np.ndarray):
+        return np.nan_to_num(values.astype(np.float64, copy=False), nan=0.0)
+
+    return np.array([0.0 if v is None else v for v in values], dtype=np.float64)
+
+
+def _mask(mask, values, n: int) -> np.ndarray:
+    if mask is not None:
+        return np.asarray(mask, dtype=bool)
+    if values is None:
+        return np.ones(n, dtype=bool)
+    if isinstance(values, np.ndarray):
+        return np.isnan(values.astype(np.float64, copy=False))
+    return np.array([v is None for v in values], dtype=bool)
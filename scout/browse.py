@@ -0,0 +1,190 @@
+"""
+Parsing of Browse API item_summary/search responses.
+
+Only the fields the pricer uses (itemId, title, condition, price, image
+and item URLs) are copied out of each itemSummary, into BrowseItem tuples.
+
+JSON is decoded with orjson when it is installed and with the standard
+library otherwise (SCOUT_JSON_BACKEND=json forces the latter). Large
+bodies are decoded incrementally instead: one itemSummary at a time, so
+the full nested tree of a big page is never held in memory at once.
+"""
+
+import json
+import os
+import re
+
+from typing import List, NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+if os.getenv("SCOUT_JSON_BACKEND", "").lower() == "json":
+    orjson = None
+
+# Bodies above this size are decoded item by item (a 200-item page is ~150 KB)
+INCREMENTAL_THRESHOLD = 2 * 1024 * 1024
+
+
+class BrowseItem(NamedTuple):
+    item_id: Optional[str]
+    title: str
+    condition: str
+    price: Optional[float]
+    image_url: Optional[str]
+    item_url: Optional[str]
+    # None for usable listings, otherwise why the listing was filtered
+    reason: Optional[str] = None
+
+
+class BrowsePage(NamedTuple):
+    items: List[BrowseItem]
+    next: Optional[str]
+    total: int
+
+
+def json_backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(data):
+    """
+    Decode JSON from bytes or str with the fastest available backend.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def item_record(item: dict) -> BrowseItem:
+    """
+    Copy the fields we use out of one raw itemSummary.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("itemSummary is not a JSON object")
+
+    price_info = item.get("price")
+    price = None
+    reason = None
+
+    if not price_info:
+        reason = "no price"
+    else:
+        try:
+            price = float(price_info["value"])
+        except (KeyError, ValueError, TypeError):
+            reason = "invalid price format"
+
+    image = item.get("image")
+    return BrowseItem(
+        item.get("itemId"),
+        item.get("title", ""),
+        item.get("condition", ""),
+        price,
+        image.get("imageUrl") if image else None,
+        item.get("itemWebUrl"),
+        reason,
+    )
+
+
+def parse_browse_page(body, incremental: Optional[bool] = None) -> BrowsePage:
+    """
+    Parse one response body (bytes or str) into a BrowsePage.
+
+    incremental=None decodes bodies above INCREMENTAL_THRESHOLD item by
+    item and smaller ones in one go; True / False force either path.
+    Raises ValueError for malformed JSON.
+    """
+    if incremental is None:
+        incremental = len(body) > INCREMENTAL_THRESHOLD
+
+    if not incremental:
+        data = loads(body)
+        if not isinstance(data, dict):
+            raise ValueError("Browse API response is not a JSON object")
+        summaries = data.get("itemSummaries") or []
+        if not isinstance(summaries, list):
+            raise ValueError("itemSummaries is not a JSON array")
+        return BrowsePage(
+            [item_record(item) for item in summaries],
+            data.get("next"),
+            data.get("total", 0),
+        )
+
+    if isinstance(body, (bytes, bytearray)):
+        body = body.decode("utf-8")
+
+    meta = {}
+    items = [item_record(item) for item in _iter_summaries(body, meta)]
+    return BrowsePage(items, meta.get("next"), meta.get("total", 0))
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_scan_value = json.JSONDecoder().scan_once
+
+
+def _iter_summaries(text: str, meta: dict):
+    """
+    Walk the top-level response object, yielding each itemSummary as it is
+    decoded. Every other top-level value is stored in `meta`.
+    """
+    skip = _WHITESPACE.match
+
+    i = skip(text, 0).end()
+    if text[i:i + 1] != "{":
+        raise ValueError("Browse API response is not a JSON object")
+    i = skip(text, i + 1).end()
+
+    while text[i:i + 1] != "}":
+        key, i = _decode_at(text, i)
+        if not isinstance(key, str):
+            raise ValueError(f"Expected a property name at position {i}")
+        i = skip(text, i).end()
+        if text[i:i + 1] != ":":
+            raise ValueError(f"Expected ':' at position {i}")
+        i = skip(text, i + 1).end()
+
+        if key == "itemSummaries" and text[i:i + 1] == "[":
+            i = skip(text, i + 1).end()
+            while text[i:i + 1] != "]":
+                item, i = _decode_at(text, i)
+                yield item
+                i = skip(text, i).end()
+                if text[i:i + 1] == ",":
+                    i = _after_comma(text, i)
+                elif text[i:i + 1] != "]":
+                    raise ValueError(f"Expected ',' or ']' at position {i}")
+            i += 1
+        else:
+            meta[key], i = _decode_at(text, i)
+            if key == "itemSummaries" and meta[key] and not isinstance(meta[key], list):
+                raise ValueError("itemSummaries is not a JSON array")
+
+        i = skip(text, i).end()
+        if text[i:i + 1] == ",":
+            i = _after_comma(text, i)
+        elif text[i:i + 1] != "}":
+            raise ValueError(f"Expected ',' or '}}' at position {i}")
+
+    i = skip(text, i + 1).end()
+    if i != len(text):
+        raise ValueError(f"Extra data at position {i}")
+
+
+def _after_comma(text: str, i: int) -> int:
+    # Skip a separator; a trailing comma before ] or } is not valid JSON
+    i = _WHITESPACE.match(text, i + 1).end()
+    if text[i:i + 1] in ("]", "}"):
+        raise ValueError(f"Expected a JSON value at position {i}")
+    return i
+
+
+def _decode_at(text: str, i: int):
+    try:
+        return _scan_value(text, i)
+    except StopIteration:
+        raise ValueError(f"Expected a JSON value at position {i}") from None
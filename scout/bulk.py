@@ -0,0 +1,246 @@
+import csv
+import json
+import sys
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+
+import requests
+
+from scout.analyzer import naive_profit, total_cost
+from scout.listing import Listing
+from scout.pricing import EbayPricingError, compute_confidence
+from scout.scheduler import BATCH, use_priority
+
+RESULT_FIELDS = [
+    "market_value",
+    "total_cost",
+    "profit",
+    "confidence",
+    "sample_size",
+    "error",
+]
+
+# CSV columns for input that has no header of its own (JSONL). `line` is
+# set on unreadable lines; any other key goes into `extra` as JSON.
+CANDIDATE_FIELDS = [
+    "keyword",
+    "current_bid",
+    "shipping_cost",
+    "title",
+    "url",
+    "line",
+]
+EXTRA_FIELD = "extra"
+
+
+def _format_of(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+@contextmanager
+def _open(path: str, mode: str):
+    if path == "-":
+        yield sys.stdin if "r" in mode else sys.stdout
+    else:
+        with open(path, mode, newline="", encoding="utf-8") as f:
+            yield f
+
+
+class _UnreadableRow(dict):
+    """
+    An input line that could not be read as a candidate; it carries the
+    line number and the error and is written out as-is.
+    """
+
+
+def read_candidates(f, fmt: str):
+    """
+    Yield candidate rows (dicts) one at a time from a CSV or JSONL stream.
+    A JSONL line that is not a JSON object becomes a row with `line` and
+    `error` set instead of stopping the run.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+
+    for number, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield _UnreadableRow(line=number, error=f"invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield _UnreadableRow(line=number, error="row is not a JSON object")
+            continue
+        yield row
+
+
+def _to_float(value) -> float:
+    if value is None or value == "":
+        return 0.0
+    return float(value)
+
+
+def evaluate_candidate(row: dict, lookup) -> dict:
+    """
+    Price one candidate row against its keyword's market value.
+    Errors are reported in the row instead of being raised.
+    """
+    result = dict(row)
+    if isinstance(row, _UnreadableRow):
+        return result
+
+    try:
+        keyword = row.get("keyword")
+        keyword = "" if keyword is None else str(keyword).strip()
+        if not keyword:
+            raise ValueError("missing keyword")
+        current_bid = _to_float(row.get("current_bid"))
+        shipping_cost = _to_float(row.get("shipping_cost"))
+
+        summary = lookup(keyword)
+    except (ValueError, TypeError, EbayPricingError, requests.RequestException) as e:
+        result["error"] = str(e) or type(e).__name__
+        return result
+
+    candidate = Listing(
+        title=row.get("title") or keyword,
+        price=summary["median"],
+        url=row.get("url") or "bulk-input",
+        source="bulk",
+        current_bid=current_bid,
+        shipping_cost=shipping_cost,
+    )
+
+    result.update(
+        market_value=summary["median"],
+        total_cost=total_cost(candidate),
+        profit=naive_profit(candidate),
+        confidence=compute_confidence(summary),
+        sample_size=summary["count"],
+        error="",
+    )
+    return result
+
+
+def _lookup_in_batch(lookup, row):
+    with use_priority(BATCH):
+        return evaluate_candidate(row, lookup)
+
+
+def evaluate_candidates(rows, lookup, concurrency: int = 8):
+    """
+    Evaluate candidate rows concurrently and yield results as they finish.
+    At most `concurrency` rows are in flight, so memory stays constant
+    however many rows come in.
+    """
+    row_iter = iter(rows)
+    pending = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            for row in row_iter:
+                pending[executor.submit(_lookup_in_batch, lookup, row)] = row
+                if len(pending) >= concurrency:
+                    break
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                row = pending.pop(future)
+                # Anything unexpected (e.g. a malformed summary) fails this
+                # row only, not the batch
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = dict(row, error=f"{type(e).__name__}: {e}")
+                yield result
+
+
+class _ResultWriter:
+    """
+    Writes result rows to CSV or JSONL, flushing every row so partial
+    output is usable while a long run is still going.
+    """
+
+    def __init__(self, f, fmt: str, input_fields=None):
+        self.f = f
+        self.fmt = fmt
+        # Without an input header the columns are fixed up front, so they
+        # do not depend on which row happens to finish first
+        self.input_fields = list(input_fields) if input_fields else None
+        self._csv = None
+
+    def write(self, result: dict):
+        if self.fmt == "jsonl":
+            self.f.write(json.dumps(result) + "\n")
+        else:
+            if self._csv is None:
+                if self.input_fields is None:
+                    fields = CANDIDATE_FIELDS + RESULT_FIELDS + [EXTRA_FIELD]
+                else:
+                    fields = self.input_fields + RESULT_FIELDS
+                self._csv = csv.DictWriter(self.f, fieldnames=fields, extrasaction="ignore")
+                self._csv.writeheader()
+            if self.input_fields is None:
+                result = self._with_extra(result)
+            self._csv.writerow(result)
+        self.f.flush()
+
+    @staticmethod
+    def _with_extra(result: dict) -> dict:
+        extra = {
+            k: v
+            for k, v in result.items()
+            if k not in CANDIDATE_FIELDS and k not in RESULT_FIELDS
+        }
+        if not extra:
+            return result
+        return dict(result, **{EXTRA_FIELD: json.dumps(extra)})
+
+
+def run_evaluate(
+    in_path: str,
+    out_path: str,
+    concurrency: int = 8,
+    lookup=None,
+    in_format=None,
+    out_format=None,
+) -> dict:
+    """
+    Stream candidates from in_path through market-value lookup, total_cost
+    and naive_profit into out_path ("-" means stdin / stdout).
+    Returns counts of evaluated rows and errors.
+    """
+    if lookup is None:
+        from scout.cache import PriceCache
+
+        lookup = PriceCache().estimate_market_value
+
+    in_format = in_format or _format_of(in_path)
+    out_format = out_format or _format_of(out_path)
+    counts = {"rows": 0, "errors": 0}
+
+    with _open(in_path, "r") as fin, _open(out_path, "w") as fout:
+        if in_format == "csv":
+            # Keep the input's column order for CSV output
+            rows = csv.DictReader(fin)
+            input_fields = rows.fieldnames
+        else:
+            rows = read_candidates(fin, in_format)
+            input_fields = None
+
+        writer = _ResultWriter(fout, out_format, input_fields)
+        for result in evaluate_candidates(rows, lookup, concurrency):
+            writer.write(result)
+            counts["rows"] += 1
+            if result.get("error"):
+                counts["errors"] += 1
+
+    return counts
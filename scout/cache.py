@@ -0,0 +1,318 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Optional
+
+from scout.priceindex import PriceIndex
+from scout.pricing import DEFAULT_MAX_ITEMS, fetch_ebay_prices, summarize_prices
+from scout.scheduler import BATCH, use_priority
+
+DEFAULT_CACHE_PATH = os.getenv("SCOUT_CACHE_PATH", "scout_cache.sqlite3")
+
+log = logging.getLogger(__name__)
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    Lowercase the keyword and collapse whitespace so that
+    "Nintendo  DS Lite" and "nintendo ds lite" share a cache entry.
+    """
+    return " ".join(keyword.lower().split())
+
+
+def make_cache_key(
+    keyword: str,
+    limit: int = 200,
+    filters: Optional[str] = None,
+    max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+) -> str:
+    return f"{normalize_keyword(keyword)}|{limit}|{filters or ''}|{max_items or limit}"
+
+
+class PriceCache:
+    """
+    Two-tier cache in front of fetch_ebay_prices / summarize_prices.
+
+    - Memory tier: small LRU of recently used entries.
+    - Disk tier: SQLite table so entries survive between runs.
+
+    Entries younger than `ttl` seconds are served as-is. Entries older than
+    `ttl` but younger than `ttl + stale_ttl` are still served, and a
+    background refresh is started (stale-while-revalidate). Anything older
+    is fetched again before returning.
+
+    With a `keyword_index` (scout.keywords.KeywordIndex), near-duplicate
+    keywords ("DS Lite Nintendo", "nintendo ds lite console") share the
+    entry of the first keyword priced, and each newly priced keyword is
+    added to the index.
+
+    With a `history` (scout.history.PriceHistory), the kept listings of
+    every fetch are also appended to the price history. That is best
+    effort: a failed write is logged and counted, and the fetch still
+    succeeds.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: float = 3600,
+        stale_ttl: float = 24 * 3600,
+        max_memory_items: int = 256,
+        fetcher=None,
+        keyword_index=None,
+        history=None,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_memory_items = max_memory_items
+        self.fetcher = fetcher or fetch_ebay_prices
+        self.keyword_index = keyword_index
+        self.history = history
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "history_errors": 0,
+        }
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS price_cache ("
+                " key TEXT PRIMARY KEY,"
+                " fetched_at REAL NOT NULL,"
+                " payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    # ----- public API -----
+
+    def get(
+        self,
+        keyword: str,
+        limit: int = 200,
+        filters: Optional[str] = None,
+        max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+    ) -> dict:
+        """
+        Return the cache entry for a lookup (up to `max_items` listings over
+        pages of `limit`, see fetch_ebay_prices), fetching it if needed.
+        The entry is a dict with: prices, debug_info, summary, fetched_at.
+        Raises EbayPricingError if a required fetch fails.
+        """
+        canonical = self.resolve_keyword(keyword)
+        if canonical != keyword:
+            # Remember the spelling so the next lookup is a dict hit
+            self.keyword_index.add(keyword)
+            keyword = canonical
+        key = make_cache_key(keyword, limit, filters, max_items)
+        entry, tier = self._lookup(key)
+
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age < self.ttl:
+                self._count(f"{tier}_hits")
+                return entry
+            if age < self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, keyword, limit, filters, max_items)
+                return entry
+
+        self._count("misses")
+        entry = self._fetch_and_store(key, keyword, limit, filters, max_items)
+        if self.keyword_index is not None:
+            self.keyword_index.add(keyword)
+        return entry
+
+    def resolve_keyword(self, keyword: str) -> str:
+        """
+        The keyword whose entry a lookup for `keyword` will use.
+        """
+        if self.keyword_index is None:
+            return keyword
+        return self.keyword_index.canonical(keyword)
+
+    def fetch_ebay_prices(
+        self,
+        keyword: str,
+        limit: int = 200,
+        collect_debug: bool = False,
+        filters: Optional[str] = None,
+        max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+    ):
+        """
+        Cached drop-in for scout.pricing.fetch_ebay_prices, except that it
+        reads DEFAULT_MAX_ITEMS listings unless told otherwise.
+        Returns copies so callers can annotate the listings freely.
+        """
+        entry = self.get(keyword, limit=limit, filters=filters, max_items=max_items)
+        prices = list(entry["prices"])
+        if not collect_debug:
+            return prices
+
+        debug_info = {
+            "kept": [dict(item) for item in entry["debug_info"]["kept"]],
+            "filtered": [dict(item) for item in entry["debug_info"]["filtered"]],
+        }
+        return prices, debug_info
+
+    def estimate_market_value(
+        self,
+        keyword: str,
+        limit: int = 200,
+        filters: Optional[str] = None,
+        max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+    ) -> dict:
+        """
+        Cached drop-in for scout.pricing.estimate_market_value.
+        """
+        return dict(self.get(keyword, limit=limit, filters=filters, max_items=max_items)["summary"])
+
+    def price_index(
+        self,
+        keyword: str,
+        limit: int = 200,
+        filters: Optional[str] = None,
+        max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+    ) -> PriceIndex:
+        """
+        Sorted PriceIndex of the kept listings for a lookup. It is built
+        once per cache entry and shared, so treat its listings as
+        read-only (copy them before annotating).
+        """
+        entry = self.get(keyword, limit=limit, filters=filters, max_items=max_items)
+        index = entry.get("price_index")
+        if index is None:
+            # Kept on the in-memory entry only; a refresh replaces the entry
+            index = PriceIndex.from_fetch(entry["prices"], entry["debug_info"])
+            entry["price_index"] = index
+        return index
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the hit/miss counters.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_items"] = len(self._memory)
+        return stats
+
+    def clear(self):
+        """
+        Drop every entry from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM price_cache")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # ----- internals -----
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _lookup(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry, "memory"
+
+            if self._db is None:
+                return None, None
+
+            row = self._db.execute(
+                "SELECT fetched_at, payload FROM price_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None, None
+
+        entry = json.loads(row[1])
+        entry["fetched_at"] = row[0]
+        self._remember(key, entry)
+        return entry, "disk"
+
+    def _remember(self, key: str, entry: dict):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _fetch_and_store(self, key, keyword, limit, filters, max_items) -> dict:
+        prices, debug_info = self.fetcher(
+            keyword, limit=limit, collect_debug=True, filters=filters, max_items=max_items
+        )
+        entry = {
+            "prices": prices,
+            "debug_info": debug_info,
+            "summary": summarize_prices(prices),
+            "fetched_at": time.time(),
+        }
+        if self.history is not None:
+            try:
+                self.history.record_fetch(keyword, debug_info, timestamp=entry["fetched_at"])
+            except Exception:
+                self._count("history_errors")
+                log.warning("Could not record price history for %r", keyword, exc_info=True)
+
+        self._remember(key, entry)
+        with self._lock:
+            if self._db is not None:
+                payload = json.dumps(
+                    {
+                        "prices": entry["prices"],
+                        "debug_info": entry["debug_info"],
+                        "summary": entry["summary"],
+                    }
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO price_cache (key, fetched_at, payload)"
+                    " VALUES (?, ?, ?)",
+                    (key, entry["fetched_at"], payload),
+                )
+                self._db.commit()
+        return entry
+
+    def _refresh_in_background(self, key, keyword, limit, filters, max_items):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                with use_priority(BATCH):
+                    self._fetch_and_store(key, keyword, limit, filters, max_items)
+                self._count("refreshes")
+            except Exception:
+                # Keep serving the stale entry; the next lookup will retry
+                self._count("refresh_errors")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
@@ -1,41 +1,214 @@
+import itertools
+import sys
+
+from scout import metrics
+
+OUTPUT_FORMATS = ("table", "csv", "jsonl", "tsv")
+
+
 def format_currency(value: float) -> str:
     return f"${value:,.2f}"
 
 
-def print_table(rows, headers):
+def format_interval(interval) -> str:
+    low, high = interval
+    return f"{format_currency(low)} - {format_currency(high)}"
+
+
+def print_table(rows, headers, stream=None):
     """
     Prints a clean aligned table.
-    
+
     rows: list of lists (data)
     headers: list of column titles
     """
+    # Every row is used for sizing, so long cells are never cut
+    write_table(rows, headers, stream=stream, sample_size=None)
+
+
+def write_rows(rows, headers, fmt: str = "table", stream=None, **options):
+    """
+    Write rows in one of OUTPUT_FORMATS through a single entry point.
+
+    rows can be any iterable (a generator is consumed lazily).
+    Extra options are passed to the table writer (widths, sample_size,
+    page_size, pager, chunk_rows); the other formats only use chunk_rows.
+    """
+    if fmt == "table":
+        return write_table(rows, headers, stream=stream, **options)
+
+    chunk_rows = options.get("chunk_rows", 500)
+    if fmt == "csv":
+        return write_csv(rows, headers, stream=stream, chunk_rows=chunk_rows)
+    if fmt == "jsonl":
+        return write_jsonl(rows, headers, stream=stream, chunk_rows=chunk_rows)
+    if fmt == "tsv":
+        return write_tsv(rows, headers, stream=stream, chunk_rows=chunk_rows)
+    raise ValueError(f"Unknown output format: {fmt!r} (choose from {', '.join(OUTPUT_FORMATS)})")
+
+
+class _ChunkedWriter:
+    """
+    Collects lines and writes them to the stream in chunks instead of one
+    write call per row.
+    """
+
+    def __init__(self, stream, chunk_rows: int = 500):
+        self.stream = stream if stream is not None else sys.stdout
+        self.chunk_rows = chunk_rows
+        self._lines = []
+
+    def line(self, text: str):
+        self._lines.append(text)
+        if len(self._lines) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self.stream.write("\n".join(self._lines) + "\n")
+            self._lines = []
+        self.stream.flush()
+
+
+def _format_row(row, widths) -> str:
+    cells = []
+    for value, width in zip(row, widths):
+        text = str(value)
+        if len(text) > width:
+            # Only possible when widths came from a sample or were fixed
+            text = text[: width - 3] + "..." if width > 3 else text[:width]
+        cells.append(text.ljust(width))
+    return "| " + " | ".join(cells) + " |"
+
+
+def _default_pager() -> bool:
+    """
+    Pause between pages when talking to a terminal.
+    Returns False if the user wants to stop.
+    """
+    if not sys.stdin.isatty():
+        return True
+    answer = input("-- More (Enter to continue, q to quit) --")
+    return answer.strip().lower() != "q"
+
+
+@metrics.timed("formatter.write_table")
+def write_table(
+    rows,
+    headers,
+    stream=None,
+    widths=None,
+    sample_size=100,
+    page_size=None,
+    pager=None,
+    chunk_rows: int = 500,
+):
+    """
+    Streaming version of print_table.
+
+    Column widths come from `widths` if given, otherwise from the headers
+    plus the first `sample_size` rows (None = every row, which needs the
+    whole table in memory). Later cells wider than their column are cut
+    with "...". Output is written in chunks of `chunk_rows` lines.
+
+    With `page_size`, the header is repeated every page_size rows and
+    `pager()` is called between pages (default: wait for Enter on a
+    terminal); returning False stops the output early.
+    """
+    out = _ChunkedWriter(stream, chunk_rows)
+    row_iter = iter(rows)
 
-    # Determine column widths
-    col_widths = []
-    for col_index in range(len(headers)):
-        header_width = len(headers[col_index])
-        column_items = [len(str(row[col_index])) for row in rows]
-        max_width = max([header_width] + column_items)
-        col_widths.append(max_width)
+    if widths is None:
+        if sample_size is None:
+            sample = list(row_iter)
+        else:
+            sample = list(itertools.islice(row_iter, sample_size))
+
+        widths = []
+        for col_index in range(len(headers)):
+            header_width = len(headers[col_index])
+            column_items = [len(str(row[col_index])) for row in sample]
+            widths.append(max([header_width] + column_items))
+        row_iter = itertools.chain(sample, row_iter)
 
     # Build horizontal line
-    line = "+" + "+".join("-" * (w + 2) for w in col_widths) + "+"
-
-    # Print header
-    print(line)
-    header_row = "| " + " | ".join(
-        headers[i].ljust(col_widths[i])
-        for i in range(len(headers))
-    ) + " |"
-    print(header_row)
-    print(line)
-
-    # Print rows
+    line = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    header_row = _format_row(headers, widths)
+
+    pager = pager or _default_pager
+
+    out.line(line)
+    out.line(header_row)
+    out.line(line)
+
+    end = object()
+    count = 0
+    row = next(row_iter, end)
+    while row is not end:
+        out.line(_format_row(row, widths))
+        count += 1
+        row = next(row_iter, end)
+
+        # Page break, unless that was the last row
+        if page_size and count % page_size == 0 and row is not end:
+            out.line(line)
+            out.flush()
+            if not pager():
+                return
+            out.line(line)
+            out.line(header_row)
+            out.line(line)
+
+    out.line(line)
+    out.flush()
+
+
+@metrics.timed("formatter.write_csv")
+def write_csv(rows, headers, stream=None, chunk_rows: int = 500):
+    # csv / io / json are only imported by the writers that use them,
+    # keeping them off the interactive menu's startup path
+    import csv
+    import io
+
+    stream = stream if stream is not None else sys.stdout
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(headers)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % chunk_rows == 0:
+            stream.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+
+    stream.write(buffer.getvalue())
+    stream.flush()
+
+
+@metrics.timed("formatter.write_jsonl")
+def write_jsonl(rows, headers, stream=None, chunk_rows: int = 500):
+    import json
+
+    out = _ChunkedWriter(stream, chunk_rows)
     for row in rows:
-        row_str = "| " + " | ".join(
-            str(row[i]).ljust(col_widths[i])
-            for i in range(len(row))
-        ) + " |"
-        print(row_str)
+        out.line(json.dumps(dict(zip(headers, row))))
+    out.flush()
+
+
+@metrics.timed("formatter.write_tsv")
+def write_tsv(rows, headers, stream=None, chunk_rows: int = 500):
+    """
+    Compact tab-separated output; tabs and newlines inside cells become spaces.
+    """
+    out = _ChunkedWriter(stream, chunk_rows)
+    clean = str.maketrans({"\t": " ", "\n": " ", "\r": " "})
 
-    print(line)
+    for row in itertools.chain([headers], rows):
+        cells = [str(value) for value in row]
+        text = "\t".join(cells)
+        # Only pay for cleaning when a cell actually has a tab or newline
+        if text.count("\t") != len(cells) - 1 or "\n" in text or "\r" in text:
+            text = "\t".join(cell.translate(clean) for cell in cells)
+        out.line(text)
+    out.flush()
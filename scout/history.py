@@ -0,0 +1,491 @@
+"""
+Append-only, memory-mapped store of every price we have observed.
+
+Layout of a history directory (all files are append-only):
+
+    keyword.i4      keyword id per row        (int32)
+    item.u8         itemId hash per row       (uint64)
+    price.f8        price per row             (float64)
+    condition.u1    condition code per row    (uint8)
+    time.i8         observed at, epoch µs     (int64)
+    segments.i8     one row per append: keyword id, first row, end row,
+                    min time, max time        (int64 x 5)
+    keywords.jsonl  keyword text, line number = keyword id
+    conditions.jsonl condition text, line number = condition code
+
+Columns are read through np.memmap, so queries slice the files without
+copying them into memory first. The segment table is the index: it is
+kept in memory grouped by keyword, so a query for one keyword and time
+window only touches the appends for that keyword whose time range
+overlaps the window, and gathers their rows in one vectorized read.
+
+One process writes a directory at a time. Readers open it with
+read_only=True: they never modify the files, and each query first picks
+up the segments the writer has completed since, so rows a writer is still
+in the middle of appending stay invisible until their segment lands.
+
+Condition codes are one byte. The first 255 distinct conditions get
+their own code; any further ones share OTHER_CONDITION.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from scout.cache import normalize_keyword
+from scout.pricing import EbayPricingError
+from scout.stats import MIN_TRIM_COUNT, TRIM_FRACTION, trim_count
+
+DEFAULT_HISTORY_DIR = os.getenv("SCOUT_HISTORY_DIR", "price_history")
+
+COLUMNS = {
+    "keyword": ("keyword.i4", np.int32),
+    "item": ("item.u8", np.uint64),
+    "price": ("price.f8", np.float64),
+    "condition": ("condition.u1", np.uint8),
+    "time": ("time.i8", np.int64),
+}
+
+_SEGMENT_FIELDS = 5  # keyword id, start row, end row, min time, max time
+
+# Shared by every condition past the first 255 (codes are uint8)
+OTHER_CONDITION = "(other)"
+_OTHER_CODE = int(np.iinfo(np.uint8).max)
+
+
+def item_hash(item_id: str) -> int:
+    """
+    Stable 64-bit hash of an itemId (Python's hash() changes between runs).
+    """
+    return int.from_bytes(hashlib.blake2b(item_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class PriceHistory:
+    """
+    Columnar price history for every keyword, see the module docstring.
+
+    append() / record_fetch() add one poll's worth of rows; prices() and
+    summary() read any keyword and time window back.
+
+    Opening for writing (the default) first cuts off any rows an
+    interrupted append left without a segment, so only one process may
+    have a directory open for writing. Any number may open it with
+    `read_only=True` alongside the writer; see the module docstring.
+    """
+
+    def __init__(self, directory: str = DEFAULT_HISTORY_DIR, read_only: bool = False):
+        self.directory = directory
+        self.read_only = read_only
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._keyword_ids = _load_names(self._path("keywords.jsonl"))
+        self._condition_codes = _load_names(self._path("conditions.jsonl"))
+
+        if not read_only:
+            self._repair()
+        self._rows = 0
+        self._segment_count = 0
+        self._by_keyword = {}
+        self._refresh()
+        self._maps = None
+        self._mapped_rows = -1
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self.read_only:
+                self._refresh()
+            return self._rows
+
+    def keywords(self):
+        with self._lock:
+            if self.read_only:
+                self._refresh()
+            return list(self._keyword_ids)
+
+    # ----- writing -----
+
+    def append(self, keyword: str, item_ids, prices, conditions=None, timestamp: Optional[float] = None) -> int:
+        """
+        Store one poll of a keyword: parallel sequences of itemIds, prices
+        and (optional) condition strings, all observed at `timestamp`
+        (epoch seconds, default now). Returns the number of rows written.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        n = len(prices)
+        if n == 0:
+            return 0
+        if len(item_ids) != n or (conditions is not None and len(conditions) != n):
+            raise ValueError("item_ids, prices and conditions must have the same length")
+        if self.read_only:
+            raise ValueError(f"{self.directory} was opened read-only")
+
+        observed = int((time.time() if timestamp is None else timestamp) * 1_000_000)
+
+        with self._lock:
+            kid = self._name_id(self._keyword_ids, "keywords.jsonl", normalize_keyword(keyword))
+            if conditions is None:
+                codes = np.zeros(n, dtype=np.uint8)
+            else:
+                codes = np.array([self._condition_code(c or "") for c in conditions], dtype=np.uint8)
+
+            columns = {
+                "keyword": np.full(n, kid, dtype=np.int32),
+                "item": np.array([item_hash(str(i)) for i in item_ids], dtype=np.uint64),
+                "price": prices,
+                "condition": codes,
+                "time": np.full(n, observed, dtype=np.int64),
+            }
+            for name, (filename, dtype) in COLUMNS.items():
+                with open(self._path(filename), "ab") as f:
+                    columns[name].astype(dtype, copy=False).tofile(f)
+
+            start = self._rows
+            segment = np.array([kid, start, start + n, observed, observed], dtype=np.int64)
+            # The segment goes last: rows without one are dropped on open
+            with open(self._path("segments.i8"), "ab") as f:
+                segment.tofile(f)
+
+            runs = self._by_keyword.get(kid)
+            if runs is None:
+                runs = self._by_keyword[kid] = _Segments()
+            runs.append(segment)
+            self._segment_count += 1
+            self._rows += n
+        return n
+
+    def record_fetch(self, keyword: str, debug_info: dict, timestamp: Optional[float] = None) -> int:
+        """
+        Store the kept listings of a fetch_ebay_prices(..., collect_debug=True) call.
+        """
+        kept = debug_info.get("kept", [])
+        return self.append(
+            keyword,
+            [item.get("item_id") or item.get("item_url") or "" for item in kept],
+            [item["price"] for item in kept],
+            [item.get("condition", "") for item in kept],
+            timestamp,
+        )
+
+    # ----- reading -----
+
+    def prices(self, keyword: str, start: Optional[float] = None, end: Optional[float] = None):
+        """
+        (prices, timestamps in epoch seconds) observed for a keyword with
+        start <= time < end. Either bound may be None.
+        """
+        price, observed = self._select(keyword, start, end)
+        return price, observed / 1_000_000
+
+    def summary(
+        self,
+        keyword: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        half_life: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> dict:
+        """
+        summarize_prices-shaped summary of a keyword's prices in a window.
+
+        With `half_life` (seconds), every price is weighted by
+        0.5 ** (age / half_life) relative to `now` (default: the current
+        time), so recent observations count more. The weighted summary also
+        has "effective_count", the sample size the weights amount to.
+        Raises EbayPricingError when the window holds no prices.
+        """
+        price, observed = self._select(keyword, start, end)
+        if len(price) == 0:
+            raise EbayPricingError(f"No price history for '{keyword}' in that window.")
+
+        if half_life is None:
+            return summarize_array(price)
+
+        now_us = (time.time() if now is None else now) * 1_000_000
+        age = np.maximum(now_us - observed, 0) / 1_000_000
+        return weighted_summary(price, 0.5 ** (age / half_life))
+
+    # ----- internals -----
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _name_id(self, names: Dict[str, int], filename: str, name: str) -> int:
+        code = names.get(name)
+        if code is None:
+            code = len(names)
+            with open(self._path(filename), "a", encoding="utf-8") as f:
+                f.write(json.dumps(name) + "\n")
+            names[name] = code
+        return code
+
+    def _condition_code(self, condition: str) -> int:
+        names = self._condition_codes
+        code = names.get(condition)
+        if code is not None:
+            return code
+        if len(names) >= _OTHER_CODE:
+            condition = OTHER_CONDITION
+        return self._name_id(names, "conditions.jsonl", condition)
+
+    def _repair(self):
+        """
+        Cut every column back to the rows covered by a complete segment,
+        undoing a write that was interrupted half way. Only the writer may
+        do this: to anyone else, a write in progress looks the same.
+        """
+        segments = self._read_segments(trim=True)
+        rows = int(segments[:, 2].max()) if len(segments) else 0
+        for filename, dtype in COLUMNS.values():
+            path = self._path(filename)
+            size = rows * np.dtype(dtype).itemsize
+            if not os.path.exists(path):
+                open(path, "wb").close()
+            if os.path.getsize(path) > size:
+                os.truncate(path, size)
+            elif os.path.getsize(path) < size:
+                raise ValueError(f"{path} is shorter than its segment index")
+
+    def _read_segments(self, trim: bool = False, skip: int = 0):
+        """
+        The complete segment records after the first `skip`. A partly
+        written last record is ignored, or cut off with `trim`.
+        """
+        path = self._path("segments.i8")
+        if not os.path.exists(path):
+            return np.empty((0, _SEGMENT_FIELDS), dtype=np.int64)
+
+        record = _SEGMENT_FIELDS * 8
+        size = os.path.getsize(path)
+        if trim and size % record:
+            os.truncate(path, size - size % record)
+        count = max(size // record - skip, 0)
+        segments = np.fromfile(path, dtype=np.int64, count=count * _SEGMENT_FIELDS, offset=skip * record)
+        return segments.reshape(-1, _SEGMENT_FIELDS)
+
+    def _refresh(self):
+        """
+        Load segments added to the file since the last call. Rows only
+        count once their segment is complete, so a reader never looks past
+        what the writer has finished. The writer only calls this on open;
+        its own appends update the tables directly. Call with the lock held.
+        """
+        segments = self._read_segments(skip=self._segment_count)
+        if len(segments) == 0:
+            return
+
+        for kid, runs in _group_segments(segments).items():
+            known = self._by_keyword.get(kid)
+            if known is None:
+                self._by_keyword[kid] = runs
+            else:
+                known.extend(runs.view())
+        self._segment_count += len(segments)
+        self._rows = max(self._rows, int(segments[:, 2].max()))
+        if self.read_only:
+            # Keyword lines are written before the segments that use them
+            self._keyword_ids = _load_names(self._path("keywords.jsonl"))
+
+    def _columns(self):
+        # Re-map after appends; np.memmap cannot map an empty file
+        if self._mapped_rows != self._rows:
+            if self._rows == 0:
+                self._maps = {name: np.empty(0, dtype=dtype) for name, (_, dtype) in COLUMNS.items()}
+            else:
+                self._maps = {
+                    name: np.memmap(self._path(filename), dtype=dtype, mode="r", shape=(self._rows,))
+                    for name, (filename, dtype) in COLUMNS.items()
+                }
+            self._mapped_rows = self._rows
+        return self._maps
+
+    def _select(self, keyword: str, start: Optional[float], end: Optional[float]):
+        with self._lock:
+            if self.read_only:
+                self._refresh()
+            kid = self._keyword_ids.get(normalize_keyword(keyword))
+            columns = self._columns()
+            runs = self._by_keyword.get(kid) if kid is not None else None
+            # A view: appends only write past it, or into a new array
+            segments = runs.view() if runs is not None else np.empty((0, _SEGMENT_FIELDS), dtype=np.int64)
+
+        lo = None if start is None else int(start * 1_000_000)
+        hi = None if end is None else int(end * 1_000_000)
+        if lo is not None:
+            segments = segments[segments[:, 4] >= lo]
+        if hi is not None:
+            segments = segments[segments[:, 3] < hi]
+
+        price_col, time_col = columns["price"], columns["time"]
+        if len(segments) == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        rows = _segment_rows(segments[:, 1], segments[:, 2])
+        price, observed = price_col[rows], time_col[rows]
+        if isinstance(rows, slice):
+            # Copy out of the map, as the gather does
+            price, observed = np.array(price), np.array(observed)
+
+        # Only segments straddling a bound need their rows checked
+        if lo is not None or hi is not None:
+            mask = np.ones(len(price), dtype=bool)
+            if lo is not None:
+                mask &= observed >= lo
+            if hi is not None:
+                mask &= observed < hi
+            if not mask.all():
+                price, observed = price[mask], observed[mask]
+        return np.asarray(price), np.asarray(observed)
+
+
+class _Segments:
+    """
+    One keyword's rows of the segment table, grown by doubling so appends
+    do not copy the whole table.
+    """
+
+    __slots__ = ("_table", "_count")
+
+    def __init__(self, segments=None):
+        segments = np.empty((0, _SEGMENT_FIELDS), dtype=np.int64) if segments is None else segments
+        self._table = np.empty((max(8, 2 * len(segments)), _SEGMENT_FIELDS), dtype=np.int64)
+        self._table[: len(segments)] = segments
+        self._count = len(segments)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, segment):
+        if self._count == len(self._table):
+            grown = np.empty((2 * len(self._table), _SEGMENT_FIELDS), dtype=np.int64)
+            grown[: self._count] = self._table[: self._count]
+            self._table = grown
+        self._table[self._count] = segment
+        self._count += 1
+
+    def extend(self, segments):
+        needed = self._count + len(segments)
+        if needed > len(self._table):
+            grown = np.empty((max(needed, 2 * len(self._table)), _SEGMENT_FIELDS), dtype=np.int64)
+            grown[: self._count] = self._table[: self._count]
+            self._table = grown
+        self._table[self._count : needed] = segments
+        self._count = needed
+
+    def view(self):
+        return self._table[: self._count]
+
+
+def _group_segments(segments) -> Dict[int, _Segments]:
+    # Stable sort keeps each keyword's appends in file order
+    order = np.argsort(segments[:, 0], kind="stable")
+    grouped = segments[order]
+    kids, firsts = np.unique(grouped[:, 0], return_index=True)
+    bounds = np.append(firsts, len(grouped))
+    return {
+        kid: _Segments(grouped[a:b])
+        for kid, a, b in zip(kids.tolist(), bounds[:-1].tolist(), bounds[1:].tolist())
+    }
+
+
+def _segment_rows(starts, ends):
+    """
+    Row numbers of every [start, end) span, in order, without a Python
+    loop. Touching spans (the usual case for a single append) collapse
+    into one slice.
+    """
+    if len(starts) == 1 or np.array_equal(starts[1:], ends[:-1]):
+        return slice(int(starts[0]), int(ends[-1]))
+    lengths = ends - starts
+    # Start with 1 everywhere, then jump to each span's start where it begins
+    steps = np.ones(int(lengths.sum()), dtype=np.int64)
+    firsts = np.cumsum(lengths)[:-1]
+    steps[0] = starts[0]
+    steps[firsts] = starts[1:] - ends[:-1] + 1
+    return np.cumsum(steps)
+
+
+def _load_names(path: str) -> Dict[str, int]:
+    names = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    names.setdefault(json.loads(line), len(names))
+                except ValueError:
+                    break  # torn last line
+    return names
+
+
+def summarize_array(prices) -> dict:
+    """
+    summarize_prices for a NumPy array, in O(n) with np.partition.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n = len(prices)
+    if n == 0:
+        raise EbayPricingError("No prices to summarize.")
+
+    k = trim_count(n)
+    kth = sorted({0, n - 1, n // 4, (n - 1) // 2, n // 2, (3 * n) // 4, k, n - k - 1})
+    part = np.partition(prices, kth)
+
+    return {
+        "count": n,
+        "mean": float(prices.mean()),
+        # After the partition, positions k .. n-k-1 hold exactly the kept values
+        "trimmed_mean": float(part[k:n - k].mean()),
+        "median": float((part[(n - 1) // 2] + part[n // 2]) / 2),
+        "q1": float(part[n // 4]),
+        "q3": float(part[(3 * n) // 4]),
+        "min": float(part[0]),
+        "max": float(part[n - 1]),
+    }
+
+
+def weighted_summary(prices, weights) -> dict:
+    """
+    Weighted counterpart of summarize_prices: quantiles by cumulative
+    weight, a weighted mean, and a trimmed mean that drops 20% of the
+    total weight from each end.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    n = len(prices)
+    if n == 0 or not weights.sum() > 0:
+        raise EbayPricingError("No prices to summarize.")
+
+    order = np.argsort(prices, kind="stable")
+    p, w = prices[order], weights[order]
+    cum = np.cumsum(w)
+    total = cum[-1]
+
+    def quantile(q, side="right"):
+        return float(p[min(int(np.searchsorted(cum, q * total, side=side)), n - 1)])
+
+    mean = float(np.dot(p, w) / total)
+    if n >= MIN_TRIM_COUNT:
+        trim = TRIM_FRACTION * total
+        kept = np.clip(np.minimum(cum, total - trim) - np.maximum(cum - w, trim), 0, None)
+        trimmed = float(np.dot(p, kept) / kept.sum())
+    else:
+        trimmed = mean
+
+    return {
+        "count": n,
+        "effective_count": float(total ** 2 / np.dot(w, w)),
+        "mean": mean,
+        "trimmed_mean": trimmed,
+        "median": (quantile(0.5, "left") + quantile(0.5)) / 2,
+        "q1": quantile(0.25),
+        "q3": quantile(0.75),
+        "min": float(p[0]),
+        "max": float(p[-1]),
+    }
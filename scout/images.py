@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+
+from scout.pricing import get_session
+
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+@dataclass
+class ImageResult:
+    url: str
+    path: Optional[str] = None
+    status: str = "downloaded"  # downloaded, cached, duplicate or error
+    error: Optional[str] = None
+
+
+class ImageDownloader:
+    """
+    Download listing images on a bounded worker pool.
+
+    - Connections are shared with the pricing session (keep-alive).
+    - Bodies are streamed to disk in chunks, never held in memory whole.
+    - Files are named by the SHA-256 of their content, so the same picture
+      found under several keywords or URLs is stored once.
+    - A small index (url -> file) lets known URLs skip the network entirely.
+    - The same URL requested twice while in flight is only downloaded once.
+    """
+
+    def __init__(
+        self,
+        directory: str = "images",
+        workers: int = 8,
+        chunk_size: int = 64 * 1024,
+        timeout: float = 15,
+    ):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+
+        os.makedirs(directory, exist_ok=True)
+        self._session = get_session(pool_size=workers)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.RLock()
+        self._inflight = {}
+        self._index_path = os.path.join(directory, "index.json")
+        self._index = self._load_index()
+        self._index_dirty = False
+
+    # ----- public API -----
+
+    def submit(self, url: str):
+        """
+        Schedule one download and return a Future for its ImageResult.
+        """
+        with self._lock:
+            future = self._inflight.get(url)
+            if future is None:
+                future = self._executor.submit(self._download, url)
+                self._inflight[url] = future
+                future.add_done_callback(lambda _f, u=url: self._forget(u))
+            return future
+
+    def download_many(self, urls):
+        """
+        Download every URL and yield ImageResults as they finish.
+        """
+        futures = [self.submit(url) for url in dict.fromkeys(urls)]
+        for future in as_completed(futures):
+            yield future.result()
+        self.save_index()
+
+    def save_index(self):
+        with self._lock:
+            if not self._index_dirty:
+                return
+            data = json.dumps(self._index, indent=0)
+            self._index_dirty = False
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self._index_path)
+
+    def close(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+        self.save_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ----- internals -----
+
+    def _forget(self, url: str):
+        with self._lock:
+            self._inflight.pop(url, None)
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _download(self, url: str) -> ImageResult:
+        with self._lock:
+            known = self._index.get(url)
+        if known and os.path.exists(os.path.join(self.directory, known)):
+            return ImageResult(url, os.path.join(self.directory, known), "cached")
+
+        try:
+            resp = self._session.get(url, stream=True, timeout=self.timeout)
+        except requests.RequestException as e:
+            return ImageResult(url, status="error", error=f"download error: {e}")
+
+        with resp:
+            if resp.status_code != 200:
+                return ImageResult(url, status="error", error=f"HTTP {resp.status_code}")
+
+            digest = hashlib.sha256()
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in resp.iter_content(chunk_size=self.chunk_size):
+                        digest.update(chunk)
+                        f.write(chunk)
+            except (requests.RequestException, OSError) as e:
+                os.remove(tmp_path)
+                return ImageResult(url, status="error", error=f"download error: {e}")
+
+            content_type = resp.headers.get("Content-Type", "")
+
+        filename = digest.hexdigest() + _guess_extension(url, content_type)
+        path = os.path.join(self.directory, filename)
+
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            status = "duplicate"
+        else:
+            os.replace(tmp_path, path)
+            status = "downloaded"
+
+        with self._lock:
+            self._index[url] = filename
+            self._index_dirty = True
+
+        return ImageResult(url, path, status)
+
+
+def _guess_extension(url: str, content_type: str) -> str:
+    ext = CONTENT_TYPE_EXTENSIONS.get(content_type.split(";")[0].strip().lower())
+    if ext:
+        return ext
+
+    ext = os.path.splitext(urlparse(url).path)[1].lower()
+    if ext in CONTENT_TYPE_EXTENSIONS.values() or ext == ".jpeg":
+        return ".jpg" if ext == ".jpeg" else ext
+    return ".jpg"
@@ -0,0 +1,219 @@
+import json
+import os
+import re
+import threading
+
+from collections import Counter
+from typing import Optional, Tuple
+
+DEFAULT_INDEX_PATH = os.getenv("SCOUT_KEYWORD_INDEX", "scout_keywords.jsonl")
+
+# Two keywords are the same search when their token sets overlap this much
+# (Jaccard), e.g. "nintendo ds lite console" vs "nintendo ds lite" = 0.75.
+# Overlap alone cannot tell a filler word from a different product
+# ("iphone 12 pro" vs "iphone 12 pro max" is 0.75 too), so keywords with
+# different model or variant tokens never match, see product_tokens.
+DEFAULT_THRESHOLD = 0.75
+
+STOPWORDS = frozenset({"a", "an", "and", "the", "for", "with", "of", "in", "on", "&"})
+
+# Words that name a different model of the same product line
+VARIANT_TOKENS = frozenset(
+    {"pro", "max", "plus", "mini", "ultra", "lite", "slim", "xl", "air", "se"}
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def keyword_tokens(text: str) -> frozenset:
+    """
+    Lowercase word tokens of a keyword, without stopwords or word order.
+    """
+    return frozenset(t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS)
+
+
+def model_tokens(tokens: frozenset) -> frozenset:
+    """
+    The tokens with a digit in them: model numbers, generations, storage
+    sizes ("ps4", "12", "1tb"). Keywords that differ in these never match.
+    """
+    return frozenset(t for t in tokens if any(c.isdigit() for c in t))
+
+
+def product_tokens(tokens: frozenset) -> frozenset:
+    """
+    The tokens that tell products apart: model tokens plus variant words
+    ("pro", "max", "lite", ...). Keywords that differ in these never match.
+    """
+    return model_tokens(tokens) | (tokens & VARIANT_TOKENS)
+
+
+class KeywordIndex:
+    """
+    Maps free-text keywords onto keywords that were already priced.
+
+    - Every canonical keyword's tokens go into an inverted index
+      (token -> keyword ids), so a lookup only scores keywords sharing at
+      least one token with the query, and skips those whose size rules
+      out reaching the threshold.
+    - Exact token-set matches and previously resolved spellings are
+      answered from dicts without scoring.
+    - Keywords whose product tokens differ ("ps4 pro 1tb" vs "ps4 pro 2tb",
+      "iphone 12 pro" vs "iphone 12 pro max") are never merged, however
+      similar.
+    - The index is an append-only JSON-lines file: new canonical keywords
+      and resolved aliases are appended as they appear and replayed on
+      load.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX_PATH, threshold: float = DEFAULT_THRESHOLD):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.path = path
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self._keywords = []  # id -> canonical keyword
+        self._tokens = []  # id -> token set
+        self._products = []  # id -> product tokens
+        self._postings = {}  # token -> set of ids
+        self._by_tokens = {}  # token set -> id
+        self._aliases = {}  # normalized spelling -> id
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    # ----- lookups -----
+
+    def resolve(self, keyword: str) -> Optional[Tuple[str, float]]:
+        """
+        Return (canonical keyword, similarity) for the closest known keyword
+        at or above the threshold, or None.
+        """
+        alias = _normalize(keyword)
+        with self._lock:
+            kid = self._aliases.get(alias)
+            if kid is not None:
+                return self._keywords[kid], 1.0
+
+            tokens = keyword_tokens(keyword)
+            kid = self._by_tokens.get(tokens)
+            if kid is not None:
+                return self._keywords[kid], 1.0
+
+            best = self._best_match(tokens)
+        if best is None:
+            return None
+        return self._keywords[best[0]], best[1]
+
+    def canonical(self, keyword: str) -> str:
+        """
+        The keyword to price with: the matching known keyword, or `keyword`
+        itself when nothing is similar enough.
+        """
+        match = self.resolve(keyword)
+        return match[0] if match is not None else keyword
+
+    # ----- updates -----
+
+    def add(self, keyword: str) -> str:
+        """
+        Record that `keyword` was priced. If it resolves to an existing
+        keyword the spelling is stored as an alias of it; otherwise it
+        becomes a new canonical keyword. Returns the canonical keyword.
+        """
+        alias = _normalize(keyword)
+        tokens = keyword_tokens(keyword)
+        if not tokens:
+            return keyword
+
+        with self._lock:
+            kid = self._aliases.get(alias)
+            if kid is not None:
+                return self._keywords[kid]
+
+            kid = self._by_tokens.get(tokens)
+            if kid is None:
+                best = self._best_match(tokens)
+                kid = best[0] if best is not None else None
+
+            if kid is None:
+                kid = self._insert(keyword, tokens)
+                self._append({"keyword": keyword})
+            else:
+                self._append({"alias": alias, "keyword": self._keywords[kid]})
+
+            self._aliases[alias] = kid
+            return self._keywords[kid]
+
+    # ----- internals -----
+
+    def _best_match(self, tokens: frozenset):
+        if not tokens:
+            return None
+
+        products = product_tokens(tokens)
+        size = len(tokens)
+        # |A & B| / |A | B| >= t needs t*|A| <= |B| <= |A|/t
+        min_size = self.threshold * size
+        max_size = size / self.threshold
+
+        overlap = Counter()
+        for token in tokens:
+            overlap.update(self._postings.get(token, ()))
+
+        best = None
+        for kid, shared in overlap.items():
+            other = len(self._tokens[kid])
+            if other < min_size or other > max_size or self._products[kid] != products:
+                continue
+            score = shared / (size + other - shared)
+            # Ties go to the keyword that was priced first
+            if score >= self.threshold and (best is None or (score, -kid) > (best[1], -best[0])):
+                best = (kid, score)
+        return best
+
+    def _insert(self, keyword: str, tokens: frozenset) -> int:
+        kid = len(self._keywords)
+        self._keywords.append(keyword)
+        self._tokens.append(tokens)
+        self._products.append(product_tokens(tokens))
+        self._by_tokens.setdefault(tokens, kid)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(kid)
+        return kid
+
+    def _append(self, entry: dict):
+        if not self.path:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _load(self):
+        by_keyword = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write
+                    continue
+
+                keyword = entry.get("keyword")
+                if not keyword:
+                    continue
+                if "alias" in entry:
+                    kid = by_keyword.get(keyword)
+                    if kid is not None:
+                        self._aliases[entry["alias"]] = kid
+                elif keyword not in by_keyword:
+                    kid = self._insert(keyword, keyword_tokens(keyword))
+                    by_keyword[keyword] = kid
+                    self._aliases[_normalize(keyword)] = kid
+
+
+def _normalize(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
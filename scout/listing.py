@@ -1,6 +1,8 @@
+import sys
+
 from dataclasses import dataclass, field
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
 @dataclass
 class Listing:
@@ -16,3 +18,140 @@ class Listing:
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Shared by every CompactListing without images
+EMPTY_IMAGES = ()
+
+
+def _to_epoch_us(value: datetime) -> int:
+    if value.tzinfo is not None:
+        # Normalize aware datetimes to naive UTC, like datetime.utcnow()
+        value = (value - value.utcoffset()).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+@dataclass(init=False, eq=False)
+class CompactListing:
+    """
+    Memory-lean Listing for when millions of rows are kept around.
+
+    A dataclass with the same fields and constructor as Listing, so
+    dataclasses.asdict / replace / fields work the same way, and it
+    compares equal to a Listing holding the same values. Underneath:
+    - __slots__ instead of a per-instance __dict__
+    - `source` is interned, so every "ebay" row shares one string
+    - the timestamp is stored as integer microseconds since the epoch
+      (`timestamp` still returns a naive UTC datetime)
+    - image URLs are stored as a tuple, and rows without images share
+      EMPTY_IMAGES; `image_urls` returns a new list, so assign to it
+      rather than appending
+    """
+
+    __slots__ = (
+        "title",
+        "price",
+        "url",
+        "_source",
+        "_image_urls",
+        "current_bid",
+        "shipping_cost",
+        "timestamp_us",
+    )
+
+    # Listing's fields; the defaults live in __init__, since a class
+    # attribute cannot share a name with a slot
+    title: str
+    price: float
+    url: str
+    source: str
+    image_urls: List[str]
+    current_bid: Optional[float]
+    shipping_cost: Optional[float]
+    timestamp: datetime
+
+    def __init__(
+        self,
+        title: str,
+        price: float,
+        url: str,
+        source: str = "Unknown",
+        image_urls=None,
+        current_bid: Optional[float] = None,
+        shipping_cost: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+    ):
+        self.title = title
+        self.price = price
+        self.url = url
+        self.source = source
+        self.image_urls = image_urls
+        self.current_bid = current_bid
+        self.shipping_cost = shipping_cost
+        self.timestamp = timestamp if timestamp is not None else datetime.utcnow()
+
+    @classmethod
+    def from_listing(cls, listing: Listing) -> "CompactListing":
+        return cls(*_values(listing))
+
+    def to_listing(self) -> Listing:
+        return Listing(*_values(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, (Listing, CompactListing)):
+            return NotImplemented
+        return _values(self, tuple) == _values(other, tuple)
+
+
+def _source(self) -> str:
+    return self._source
+
+
+def _set_source(self, value: str):
+    self._source = sys.intern(value)
+
+
+def _image_urls(self) -> List[str]:
+    return list(self._image_urls)
+
+
+def _set_image_urls(self, value):
+    self._image_urls = tuple(value) if value else EMPTY_IMAGES
+
+
+def _timestamp(self) -> datetime:
+    return _EPOCH + self.timestamp_us * _MICROSECOND
+
+
+def _set_timestamp(self, value: datetime):
+    self.timestamp_us = _to_epoch_us(value)
+
+
+# Set after @dataclass has collected the fields from the annotations
+CompactListing.source = property(_source, _set_source)
+CompactListing.image_urls = property(_image_urls, _set_image_urls)
+CompactListing.timestamp = property(_timestamp, _set_timestamp)
+
+
+def _values(listing, images=None) -> tuple:
+    # Both classes' constructors take image_urls as-is (CompactListing
+    # keeps its own tuple), so nothing is copied unless `images` asks
+    if isinstance(listing, CompactListing):
+        image_urls = listing._image_urls
+        if images is not tuple:
+            image_urls = list(image_urls)
+    else:
+        image_urls = listing.image_urls
+        if images is tuple:
+            image_urls = tuple(image_urls)
+    return (
+        listing.title,
+        listing.price,
+        listing.url,
+        listing.source,
+        image_urls,
+        listing.current_bid,
+        listing.shipping_cost,
+        listing.timestamp,
+    )
@@ -0,0 +1,273 @@
+"""
+Lightweight instrumentation: span timers, histograms and counters.
+
+Everything is off by default. While disabled, span() hands back a shared
+no-op context manager and inc() / observe() return straight away, so the
+instrumented code paths pay one flag check per call. Turn it on with
+enable(), SCOUT_PROFILE=1 or `python -m scout --profile`.
+
+Results are available as a readable report (report()) or in the
+Prometheus text exposition format (to_prometheus()).
+"""
+
+import bisect
+import functools
+import os
+import threading
+import time
+
+# Seconds; suits both sub-millisecond CPU work and slow API calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+METRIC_HELP = {
+    "scout_span_seconds": "Time spent in instrumented code sections.",
+    "scout_http_request_seconds": "Browse API latency per attempt, by HTTP status.",
+    "scout_http_requests_total": "Browse API attempts by HTTP status.",
+    "scout_http_queue_wait_seconds": "Time Browse API calls waited for the scheduler, by reason.",
+    "scout_http_retries_total": "Browse API attempts retried by the scheduler, by cause.",
+    "scout_items_total": "Browse API listings kept or filtered out.",
+    "scout_pipeline_items_total": "Listings handled by each pipeline stage.",
+}
+
+_enabled = os.getenv("SCOUT_PROFILE", "") not in ("", "0")
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram (Prometheus style) that also keeps the max.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+
+class Registry:
+    """
+    Thread-safe store of counters and histograms, keyed by metric name
+    plus a sorted tuple of (label, value) pairs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name: str, value: float = 1, labels=()):
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels=()):
+        key = (name, labels)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+REGISTRY = Registry()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    REGISTRY.reset()
+
+
+def inc(name: str, value: float = 1, **labels):
+    if not _enabled:
+        return
+    REGISTRY.inc(name, value, tuple(sorted(labels.items())))
+
+
+def observe(name: str, value: float, **labels):
+    if not _enabled:
+        return
+    REGISTRY.observe(name, value, tuple(sorted(labels.items())))
+
+
+class _Span:
+    __slots__ = ("labels", "start")
+
+    def __init__(self, name: str):
+        self.labels = (("span", name),)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe("scout_span_seconds", time.perf_counter() - self.start, self.labels)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """
+    Time a block: `with metrics.span("pricing.summarize_prices"): ...`
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name)
+
+
+def timed(name: str):
+    """
+    Decorator form of span(); checks the switch on every call.
+    """
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+# ----- export -----
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels, extra=()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def to_prometheus(registry: Registry = REGISTRY) -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+    """
+    with registry._lock:
+        counters = sorted(registry.counters.items())
+        histograms = sorted(
+            (key, (hist.buckets, list(hist.counts), hist.count, hist.sum))
+            for key, hist in registry.histograms.items()
+        )
+
+    lines = []
+    declared = set()
+
+    def declare(name, kind):
+        if name not in declared:
+            declared.add(name)
+            if name in METRIC_HELP:
+                lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in counters:
+        declare(name, "counter")
+        lines.append(f"{name}{_label_text(labels)} {_format_value(value)}")
+
+    for (name, labels), (buckets, counts, count, total) in histograms:
+        declare(name, "histogram")
+        cumulative = 0
+        for bound, bucket_count in zip(buckets, counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_label_text(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_bucket{_label_text(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_label_text(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_label_text(labels)} {count}")
+
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def report(stream=None, registry: Registry = REGISTRY):
+    """
+    Print a human-readable summary: one table of timings, one of counters.
+    """
+    import sys
+
+    from scout.formatter import print_table
+
+    stream = stream if stream is not None else sys.stderr
+
+    with registry._lock:
+        histograms = sorted(
+            (key, (hist.count, hist.sum, hist.max)) for key, hist in registry.histograms.items()
+        )
+        counters = sorted(registry.counters.items())
+
+    if not histograms and not counters:
+        stream.write("No metrics recorded.\n")
+        return
+
+    if histograms:
+        rows = []
+        # Slowest sections first, so the culprit is on top
+        for (name, labels), (count, total, peak) in sorted(histograms, key=lambda h: -h[1][1]):
+            label = ", ".join(f"{k}={v}" for k, v in labels)
+            rows.append([
+                f"{name} {label}".strip(),
+                count,
+                f"{total * 1000:.1f}",
+                f"{total / count * 1000:.3f}" if count else "-",
+                f"{peak * 1000:.3f}",
+            ])
+        print_table(rows, ["Timer", "Count", "Total ms", "Mean ms", "Max ms"], stream=stream)
+
+    if counters:
+        rows = [
+            [f"{name} {', '.join(f'{k}={v}' for k, v in labels)}".strip(), _format_value(value)]
+            for (name, labels), value in counters
+        ]
+        print_table(rows, ["Counter", "Value"], stream=stream)
@@ -0,0 +1,196 @@
+"""
+Parallel summarize_prices / compute_confidence for many keywords at once.
+
+All prices are packed into one float64 array (plus an offsets array that
+marks where each keyword's prices start) in shared memory. Each worker
+task attaches to it by name, copies out its shard of keywords, closes
+the handles and summarizes the shard with vectorized NumPy, so nothing
+but shard bounds and the small result arrays is pickled between
+processes. Each keyword lives in exactly one shard, which keeps every
+summary exact; merging the shard results is a plain dict update.
+"""
+
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+from scout.stats import segment_trim_counts, segment_trimmed_means, sort_segments
+
+# Below this many prices the pool costs more than it saves
+PARALLEL_THRESHOLD = 200_000
+
+# Shards per worker: enough to even out uneven keyword sizes
+SHARDS_PER_WORKER = 4
+
+CONFIDENCE_LABELS = ("Low", "Medium", "High")
+
+_COLUMNS = ("count", "mean", "trimmed_mean", "median", "q1", "q3", "min", "max")
+
+
+def summarize_keywords(
+    price_data,
+    workers: Optional[int] = None,
+    min_parallel: int = PARALLEL_THRESHOLD,
+) -> Dict[str, dict]:
+    """
+    Summarize many keywords' prices across a process pool.
+
+    price_data is a mapping keyword -> prices, or an iterable of
+    (keyword, prices) pairs; prices for a keyword that appears more than
+    once are combined. Returns keyword -> summary, with the keys of
+    summarize_prices plus "confidence" (compute_confidence's label).
+    Keywords without prices are left out.
+
+    `workers` defaults to the CPU count. Small inputs (fewer than
+    `min_parallel` prices) or workers=1 are summarized in this process.
+    """
+    keywords, values, offsets = _pack(price_data)
+    if not keywords:
+        return {}
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(values) < min_parallel:
+        stats = _summarize_segments(values, offsets)
+    else:
+        stats = _summarize_in_pool(values, offsets, workers)
+
+    return _to_summaries(keywords, stats)
+
+
+def _pack(price_data):
+    """
+    Flatten the input into keywords, one value array and segment offsets.
+    """
+    items = price_data.items() if hasattr(price_data, "items") else price_data
+
+    chunks = {}
+    for keyword, prices in items:
+        arr = np.asarray(prices, dtype=np.float64).ravel()
+        if arr.size:
+            chunks.setdefault(keyword, []).append(arr)
+
+    keywords = list(chunks)
+    arrays = [parts[0] if len(parts) == 1 else np.concatenate(parts) for parts in chunks.values()]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    if arrays:
+        np.cumsum([len(a) for a in arrays], out=offsets[1:])
+        values = np.concatenate(arrays)
+    else:
+        values = np.empty(0, dtype=np.float64)
+    return keywords, values, offsets
+
+
+def _summarize_segments(values, offsets):
+    """
+    Vectorized summarize_prices + compute_confidence for every segment
+    values[offsets[i]:offsets[i + 1]] (all non-empty).
+    Returns an array with one row per segment: the _COLUMNS, then a
+    confidence code (index into CONFIDENCE_LABELS).
+    """
+    values = values[offsets[0]:offsets[-1]]
+    starts = offsets[:-1] - offsets[0]
+    n = np.diff(offsets)
+
+    s = sort_segments(values, n)
+
+    last = starts + n - 1
+    median = (s[starts + (n - 1) // 2] + s[starts + n // 2]) / 2
+    q1 = s[starts + n // 4]
+    q3 = s[starts + (3 * n) // 4]
+    mean = np.add.reduceat(s, starts) / n
+
+    trimmed = segment_trimmed_means(s, starts, n, segment_trim_counts(n))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread = (q3 - q1) / median
+    confidence = np.zeros(len(n))
+    confidence[(n >= 10) & (spread <= 0.7)] = 1
+    confidence[(n >= 30) & (spread <= 0.35)] = 2
+    confidence[median == 0] = 0
+
+    return np.column_stack([n, mean, trimmed, median, q1, q3, s[starts], s[last], confidence])
+
+
+def _to_summaries(keywords, stats) -> Dict[str, dict]:
+    summaries = {}
+    for keyword, row in zip(keywords, stats.tolist()):
+        summary = dict(zip(_COLUMNS, row))
+        summary["count"] = int(summary["count"])
+        summary["confidence"] = CONFIDENCE_LABELS[int(row[-1])]
+        summaries[keyword] = summary
+    return summaries
+
+
+def _shard_bounds(offsets, shards: int):
+    """
+    Split the segments into about `shards` runs holding similar numbers of
+    prices. Returns (first, last) segment index pairs.
+    """
+    total = offsets[-1]
+    targets = np.linspace(0, total, shards + 1)[1:-1]
+    cuts = np.searchsorted(offsets, targets, side="left")
+    edges = np.unique(np.concatenate([[0], cuts, [len(offsets) - 1]]))
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+
+# ----- process pool -----
+
+
+def _summarize_shard(values_name: str, offsets_name: str, first: int, last: int):
+    """
+    Worker task: summarize segments first..last-1 of the shared arrays.
+    The shard is copied out and both handles are closed before the
+    numbers are crunched, so a worker never keeps a mapping open.
+    """
+    values_shm = shared_memory.SharedMemory(name=values_name)
+    try:
+        offsets_shm = shared_memory.SharedMemory(name=offsets_name)
+        try:
+            offsets, values = _copy_shard(values_shm, offsets_shm, first, last)
+        finally:
+            offsets_shm.close()
+    finally:
+        values_shm.close()
+    return first, _summarize_segments(values, offsets)
+
+
+def _copy_shard(values_shm, offsets_shm, first: int, last: int):
+    # The views die with this frame, which lets the caller close the handles
+    offsets = np.frombuffer(offsets_shm.buf, dtype=np.int64, count=last - first + 1, offset=first * 8).copy()
+    start, stop = int(offsets[0]), int(offsets[-1])
+    values = np.frombuffer(values_shm.buf, dtype=np.float64, count=stop - start, offset=start * 8).copy()
+    return offsets - start, values
+
+
+def _to_shared(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm
+
+
+def _summarize_in_pool(values, offsets, workers: int):
+    values_shm = _to_shared(values)
+    offsets_shm = None
+    try:
+        offsets_shm = _to_shared(offsets)
+        stats = np.empty((len(offsets) - 1, len(_COLUMNS) + 1))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = _shard_bounds(offsets, workers * SHARDS_PER_WORKER)
+            futures = [
+                pool.submit(_summarize_shard, values_shm.name, offsets_shm.name, first, last)
+                for first, last in shards
+            ]
+            for future in futures:
+                first, part = future.result()
+                stats[first:first + len(part)] = part
+        return stats
+    finally:
+        for shm in (values_shm, offsets_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
@@ -1,23 +1,292 @@
-from scout.mock_fetcher import fetch_mock_listings
-from scout.analyzer import total_cost, naive_profit, sort_by_profit
+import heapq
+import inspect
+import threading
 
-def run_pipeline():
+from typing import Optional
+
+from scout import metrics
+from scout.analyzer import total_cost
+
+# End-of-stream marker passed between stages
+_DONE = object()
+
+
+class TopK:
+    """
+    Incremental ranking of scored results, best profit first.
+
+    With `k`, only the k best results are kept (a min-heap, so each push
+    is O(log k)); with k=None every result is kept. Ties keep arrival
+    order, like sort_by_profit. snapshot() can be called at any time,
+    including from another thread while a pipeline is still running.
+    """
+
+    def __init__(self, k: Optional[int] = None):
+        self.k = k
+        self._heap = []  # (profit, -seq, result); the worst entry is on top
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, seq: int, result: dict):
+        entry = (result["profit"], -seq, result)
+        with self._lock:
+            if self.k is None:
+                self._heap.append(entry)
+            elif len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+
+    def snapshot(self):
+        """
+        Return the current ranking as a new list of result dicts.
+        """
+        with self._lock:
+            entries = list(self._heap)
+        entries.sort(key=lambda e: (e[0], e[1]), reverse=True)
+        return [e[2] for e in entries]
+
+
+def score_listing(listing, market_value: float) -> dict:
+    """
+    Build the display dict for one listing, computing cost and profit once.
     """
-    Fetch -> Analyze -> Rank mock listings.
+    cost = total_cost(listing)
+    return {
+        "title": listing.title,
+        "market_value": market_value,
+        "total_cost": cost,
+        "profit": market_value - cost,
+    }
+
+
+@metrics.timed("pipeline.rank_listings")
+def rank_listings(listings, top_k: Optional[int] = None):
+    """
+    Analyze -> Rank a list of listings.
     Returns a list of dictionaries containing display-friendly information.
     """
-    listings = fetch_mock_listings()
-    ranked = sort_by_profit(listings)
+    ranking = TopK(top_k)
+    for seq, item in enumerate(listings):
+        ranking.push(seq, score_listing(item, item.price))
+    return ranking.snapshot()
+
+
+async def _call(fn, arg):
+    # Coroutine functions are awaited, plain (possibly blocking) functions
+    # such as PriceCache.estimate_market_value run on a worker thread
+    if inspect.iscoroutinefunction(fn):
+        return await fn(arg)
+    import asyncio
+
+    return await asyncio.to_thread(fn, arg)
+
+
+class StreamingPipeline:
+    """
+    source -> filter -> price -> score -> rank, connected by bounded queues.
+
+    - source: every ListingSource is read concurrently (scout.sources).
+    - filter: `keep(listing)` returns False to drop a listing.
+    - price: `pricer(listing)` returns the market value; default is the
+      listing's own price. Blocking pricers run on threads, so
+      `price_workers` lookups can be in flight at once.
+    - score: total cost and profit, computed once per listing.
+    - rank: an incremental TopK; snapshot() shows the best deals so far.
+
+    Listings move between stages in batches: whatever the sources had
+    buffered when the filter stage asked (scout.sources.stream_listing_batches).
+    A fast source therefore costs a few queue hand-offs per batch rather than
+    per listing, while a trickling source still moves one listing at a time.
+    Every queue holds at most `queue_size` batches of at most `queue_size`
+    listings, so a slow stage pauses the stages in front of it instead of
+    letting work pile up in memory.
+
+    The CPU-bound stages still share the event loop's thread; for a list
+    that is already in memory, run_pipeline ranks it directly.
+    """
+
+    def __init__(
+        self,
+        sources=None,
+        keep=None,
+        pricer=None,
+        top_k: Optional[int] = None,
+        source_timeout: float = 10.0,
+        queue_size: int = 100,
+        filter_workers: int = 1,
+        price_workers: int = 4,
+        score_workers: int = 1,
+    ):
+        if sources is None:
+            from scout.sources import MockListingSource
+
+            sources = [MockListingSource()]
+
+        self.sources = sources
+        self.keep = keep
+        self.pricer = pricer
+        self.source_timeout = source_timeout
+        self.queue_size = queue_size
+        self.filter_workers = filter_workers
+        self.price_workers = price_workers
+        self.score_workers = score_workers
+
+        self.ranking = TopK(top_k)
+        self.source_errors = {}
+        self.stats = {"sourced": 0, "filtered": 0, "priced": 0, "price_errors": 0, "ranked": 0}
+
+    def snapshot(self):
+        return self.ranking.snapshot()
+
+    async def run(self):
+        """
+        Run the stream to the end and return the final ranking.
+        """
+        import asyncio
+
+        to_filter = asyncio.Queue(self.queue_size)
+        to_price = asyncio.Queue(self.queue_size)
+        to_score = asyncio.Queue(self.queue_size)
+        to_rank = asyncio.Queue(self.queue_size)
+        # Caps lookups in flight across all price workers and batches
+        self._price_slots = asyncio.Semaphore(max(1, self.price_workers))
+
+        with metrics.span("pipeline.run"):
+            await asyncio.gather(
+                self._source(to_filter),
+                _stage(self._filter, to_filter, to_price, self.filter_workers),
+                _stage(self._price, to_price, to_score, self.price_workers),
+                _stage(self._score, to_score, to_rank, self.score_workers),
+                self._rank(to_rank),
+            )
+
+        if metrics.enabled():
+            for stage, count in self.stats.items():
+                metrics.inc("scout_pipeline_items_total", count, stage=stage)
+        return self.snapshot()
+
+    # ----- stages -----
+
+    async def _source(self, out):
+        from scout.sources import stream_listing_batches
+
+        async for listings in stream_listing_batches(
+            self.sources,
+            source_timeout=self.source_timeout,
+            max_buffer=self.queue_size,
+            errors=self.source_errors,
+        ):
+            start = self.stats["sourced"]
+            self.stats["sourced"] += len(listings)
+            await out.put(list(enumerate(listings, start)))
+        await out.put(_DONE)
+
+    async def _filter(self, batch):
+        if self.keep is None:
+            return batch
+        kept = []
+        for work in batch:
+            keep = self.keep(work[1])
+            if inspect.isawaitable(keep):
+                keep = await keep
+            if keep:
+                kept.append(work)
+        self.stats["filtered"] += len(batch) - len(kept)
+        return kept
+
+    async def _price(self, batch):
+        if self.pricer is None:
+            return [(seq, listing, listing.price) for seq, listing in batch]
+        import asyncio
+
+        priced = await asyncio.gather(*(self._price_one(work) for work in batch))
+        return [work for work in priced if work is not None]
+
+    async def _price_one(self, work):
+        seq, listing = work
+        async with self._price_slots:
+            try:
+                with metrics.span("pipeline.price"):
+                    market_value = await _call(self.pricer, listing)
+            except Exception:
+                self.stats["price_errors"] += 1
+                return None
+        self.stats["priced"] += 1
+        return seq, listing, market_value
+
+    async def _score(self, batch):
+        return [(seq, score_listing(listing, market_value)) for seq, listing, market_value in batch]
+
+    async def _rank(self, inbox):
+        while True:
+            batch = await inbox.get()
+            if batch is _DONE:
+                return
+            for work in batch:
+                self.ranking.push(*work)
+            self.stats["ranked"] += len(batch)
+
+
+async def _stage(fn, inbox, out, workers: int):
+    """
+    Run `workers` copies of fn over the batches in the inbox queue;
+    non-empty result batches go to `out`. _DONE is forwarded once every
+    worker has stopped.
+    """
+    import asyncio
+
+    async def worker():
+        while True:
+            work = await inbox.get()
+            if work is _DONE:
+                # Put the marker back so the sibling workers stop too
+                await inbox.put(_DONE)
+                return
+            result = await fn(work)
+            if result:
+                await out.put(result)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+    await out.put(_DONE)
 
-    results = []
-    for item in ranked:
-        cost = total_cost(item)
-        profit = naive_profit(item)
-        results.append({
-            "title": item.title,
-            "market_value": item.price,
-            "total_cost": cost,
-            "profit": profit
-        })
 
+async def run_pipeline_async(sources=None, source_timeout=10.0, max_buffer=100, source_errors=None, **stages):
+    """
+    Fetch from every source concurrently -> Filter -> Price -> Score -> Rank.
+    Extra keyword arguments (keep, pricer, top_k, *_workers) configure the
+    StreamingPipeline stages.
+    """
+    pipeline = StreamingPipeline(
+        sources, source_timeout=source_timeout, queue_size=max_buffer, **stages
+    )
+    results = await pipeline.run()
+    if source_errors is not None:
+        source_errors.update(pipeline.source_errors)
     return results
+
+
+def run_pipeline(listings=None, sources=None, source_timeout=10.0, max_buffer=100, source_errors=None, **stages):
+    """
+    Fetch -> Analyze -> Rank listings.
+    By default the mock source is used; pass `sources` (ListingSource
+    objects, fetched concurrently) or an already fetched `listings` list.
+    Returns a list of dictionaries containing display-friendly information.
+    """
+    if listings is not None and not stages.keys() - {"top_k"}:
+        # Nothing to look up: rank in place without starting an event loop
+        return rank_listings(listings, stages.get("top_k"))
+
+    if listings is not None:
+        from scout.sources import IterableSource
+
+        sources = [IterableSource(listings)]
+
+    # asyncio is only loaded once sources are actually fetched
+    import asyncio
+
+    return asyncio.run(
+        run_pipeline_async(sources, source_timeout, max_buffer, source_errors, **stages)
+    )
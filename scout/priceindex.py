@@ -0,0 +1,92 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Optional
+
+
+class PriceIndex:
+    """
+    One keyword's prices, sorted once, for position queries.
+
+    - nearest(price, k): the k listings closest to any price, in
+      O(log n + k) by walking outwards from the price's insertion point.
+    - range_count(low, high): listings priced within [low, high].
+    - percentile_rank(price): where a price falls among the listings.
+
+    Each price can carry its listing (the "kept" dicts of
+    fetch_ebay_prices' debug_info); nearest returns those.
+    """
+
+    def __init__(self, prices, items: Optional[list] = None):
+        self._items = None
+        if items is None:
+            self._prices = sorted(map(float, prices))
+            return
+
+        if len(items) != len(prices):
+            raise ValueError("prices and items must have the same length")
+        # Sort positions rather than (price, item) pairs: items are dicts
+        order = sorted(range(len(prices)), key=prices.__getitem__)
+        self._prices = [float(prices[i]) for i in order]
+        self._items = [items[i] for i in order]
+
+    @classmethod
+    def from_fetch(cls, prices, debug_info: Optional[dict] = None) -> "PriceIndex":
+        """
+        Build from fetch_ebay_prices output: the price list, or
+        (prices, debug_info) with collect_debug=True. With debug_info the
+        kept listings are indexed by their own prices.
+        """
+        if debug_info is None:
+            return cls(prices)
+        kept = debug_info.get("kept", [])
+        return cls([item["price"] for item in kept], kept)
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    @property
+    def prices(self) -> List[float]:
+        """
+        The indexed prices, ascending.
+        """
+        return self._prices
+
+    def nearest(self, price: float, k: int = 10) -> list:
+        """
+        The k entries closest to `price`, closest first (the listings when
+        the index has them, otherwise the prices). Equal distances go to
+        the cheaper entry.
+        """
+        prices = self._prices
+        right = bisect_left(prices, price)
+        left = right - 1
+        picked = []
+
+        while len(picked) < k and (left >= 0 or right < len(prices)):
+            if right >= len(prices) or (left >= 0 and price - prices[left] <= prices[right] - price):
+                picked.append(left)
+                left -= 1
+            else:
+                picked.append(right)
+                right += 1
+
+        source = self._items if self._items is not None else prices
+        return [source[i] for i in picked]
+
+    def range_count(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """
+        Number of prices within [low, high]; a missing bound is open.
+        """
+        start = 0 if low is None else bisect_left(self._prices, low)
+        end = len(self._prices) if high is None else bisect_right(self._prices, high)
+        return max(0, end - start)
+
+    def percentile_rank(self, price: float) -> float:
+        """
+        Percentage (0-100) of prices below `price`, counting prices equal
+        to it as half below.
+        """
+        if not self._prices:
+            raise ValueError("No prices in the index.")
+        below = bisect_left(self._prices, price)
+        equal = bisect_right(self._prices, price) - below
+        return 100.0 * (below + equal / 2) / len(self._prices)
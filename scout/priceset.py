@@ -0,0 +1,235 @@
+import bisect
+import math
+import threading
+
+from typing import Dict, Optional
+
+from scout.pricing import EbayPricingError
+from scout.stats import trim_count
+
+# Above this many sorted-list edits in one poll, apply() rebuilds the list
+# in one linear merge instead of inserting and deleting item by item
+BULK_UPDATE = 32
+
+
+class PriceSet:
+    """
+    The live listings of one keyword, keyed by Browse API itemId.
+
+    Prices are kept in a sorted list next to a running total and a running
+    sum of the trimmed-mean window (the middle 60%), so adding, removing or
+    re-pricing one listing is a binary search plus O(1) bookkeeping, and
+    summary() never re-sorts. Polls with many changes are merged in one
+    linear pass instead. The float sums are rebuilt exactly once the
+    number of updates since the last rebuild reaches the set size.
+
+    summary() returns the same keys as summarize_prices.
+    """
+
+    def __init__(self, prices: Optional[Dict[str, float]] = None):
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._sorted = []
+        self._total = 0.0
+        self._window = 0.0
+        self._updates = 0
+        self.last_changes = {"added": 0, "removed": 0, "changed": 0}
+        if prices:
+            self.apply(prices)
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def __contains__(self, item_id) -> bool:
+        return item_id in self._by_id
+
+    def prices(self):
+        """
+        Return the prices in ascending order (a copy).
+        """
+        with self._lock:
+            return list(self._sorted)
+
+    # ----- updates -----
+
+    def apply(self, current: Dict[str, float]) -> dict:
+        """
+        Make the set match a full poll result (item_id -> price).
+        Only listings that appeared, disappeared or changed price are
+        touched. Returns counts of added / removed / changed listings.
+        """
+        with self._lock:
+            by_id = self._by_id
+            added, changed, old_prices = [], [], []
+            for item_id, price in current.items():
+                old = by_id.get(item_id)
+                if old is None:
+                    added.append(item_id)
+                elif old != price:
+                    changed.append(item_id)
+                    old_prices.append(old)
+
+            removed = []
+            if len(by_id) > len(current) - len(added):
+                removed = list(by_id.keys() - current.keys())
+                old_prices.extend(by_id.pop(item_id) for item_id in removed)
+
+            new_prices = []
+            for item_id in added + changed:
+                by_id[item_id] = current[item_id]
+                new_prices.append(current[item_id])
+
+            if len(old_prices) + len(new_prices) > BULK_UPDATE:
+                self._merge(old_prices, new_prices)
+            else:
+                for price in old_prices:
+                    self._remove(price)
+                for price in new_prices:
+                    self._insert(price)
+                self._maybe_rebuild(len(old_prices) + len(new_prices))
+
+            changes = {"added": len(added), "removed": len(removed), "changed": len(changed)}
+            self.last_changes = changes
+        return changes
+
+    def update(self, item_id: str, price: float):
+        """
+        Add one listing or change its price.
+        """
+        with self._lock:
+            old = self._by_id.get(item_id)
+            if old == price:
+                return
+            if old is not None:
+                self._remove(old)
+            self._by_id[item_id] = price
+            self._insert(price)
+            self._maybe_rebuild()
+
+    def remove(self, item_id: str) -> bool:
+        with self._lock:
+            price = self._by_id.pop(item_id, None)
+            if price is None:
+                return False
+            self._remove(price)
+            self._maybe_rebuild()
+            return True
+
+    # ----- statistics -----
+
+    def summary(self) -> dict:
+        """
+        Same result as summarize_prices(self.prices()), without sorting.
+        """
+        with self._lock:
+            s = self._sorted
+            n = len(s)
+            if n == 0:
+                raise EbayPricingError("No prices to summarize.")
+
+            if n % 2:
+                median = s[n // 2]
+            else:
+                median = (s[n // 2 - 1] + s[n // 2]) / 2
+
+            lo, hi = _window_bounds(n)
+            return {
+                "count": n,
+                "mean": self._total / n,
+                "trimmed_mean": self._window / (hi - lo),
+                "median": median,
+                "q1": s[n // 4],
+                "q3": s[(3 * n) // 4],
+                "min": s[0],
+                "max": s[-1],
+            }
+
+    # ----- internals -----
+
+    def _insert(self, value: float):
+        s = self._sorted
+        lo, hi = _window_bounds(len(s))
+        i = bisect.bisect_left(s, value)
+        s.insert(i, value)
+        self._total += value
+
+        # Where the old window now sits in the new list
+        if i < lo:
+            a, b, window = lo + 1, hi + 1, self._window
+        elif i >= hi:
+            a, b, window = lo, hi, self._window
+        else:
+            a, b, window = lo, hi + 1, self._window + value
+        self._window = _shift_window(s, a, b, window)
+
+    def _remove(self, value: float):
+        s = self._sorted
+        lo, hi = _window_bounds(len(s))
+        i = bisect.bisect_left(s, value)
+        del s[i]
+        self._total -= value
+
+        if i < lo:
+            a, b, window = lo - 1, hi - 1, self._window
+        elif i >= hi:
+            a, b, window = lo, hi, self._window
+        else:
+            a, b, window = lo, hi - 1, self._window - value
+        self._window = _shift_window(s, a, b, window)
+
+    def _maybe_rebuild(self, count: int = 1):
+        self._updates += count
+        if self._updates >= max(len(self._sorted), 64):
+            # Running float sums drift; re-add them exactly now and then
+            self._rebuild(self._sorted)
+
+    def _merge(self, old_prices, new_prices):
+        # Cut the old values out with slices, then let the sort merge the
+        # two sorted runs: linear work, nearly all of it in C
+        s = self._sorted
+        kept = []
+        start = 0
+        last = -1
+        for value in sorted(old_prices):
+            i = bisect.bisect_left(s, value, last + 1)
+            kept.extend(s[start:i])
+            start = last = i
+            start += 1
+        kept.extend(s[start:])
+        new_prices.sort()
+        kept.extend(new_prices)
+        kept.sort()
+        self._rebuild(kept)
+
+    def _rebuild(self, sorted_prices):
+        lo, hi = _window_bounds(len(sorted_prices))
+        self._sorted = sorted_prices
+        self._total = math.fsum(sorted_prices)
+        self._window = math.fsum(sorted_prices[lo:hi])
+        self._updates = 0
+
+
+def _window_bounds(n: int):
+    """
+    [lo, hi) of the values trimmed_mean keeps (all of them below 10 values).
+    """
+    k = trim_count(n)
+    return k, n - k
+
+
+def _shift_window(s, a: int, b: int, window: float) -> float:
+    # Move [a, b) to the bounds for the new size; at most a step or two
+    lo, hi = _window_bounds(len(s))
+    while a < lo:
+        window -= s[a]
+        a += 1
+    while a > lo:
+        a -= 1
+        window += s[a]
+    while b < hi:
+        window += s[b]
+        b += 1
+    while b > hi:
+        b -= 1
+        window -= s[b]
+    return window
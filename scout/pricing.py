@@ -1,8 +1,19 @@
+import bisect
+import contextvars
 import os
+import re
 import statistics
+import threading
 import requests
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Optional
+
+from scout import metrics
+from scout.browse import BrowseItem, BrowsePage, parse_browse_page
+from scout.scheduler import BATCH, ScheduledTransport, scheduler_from_env, use_priority
+from scout.stats import TRIM_FRACTION, trim_count
+from scout.transport import get_session, transport_from_env
 
 BAD_PHRASES = [
     "for parts",
@@ -17,17 +28,164 @@ BAD_PHRASES = [
 ]
 
 
+class PhraseMatcher:
+    """
+    Finds the first of many phrases inside a title in a single pass.
+
+    The phrases are folded into a trie and compiled to one regular
+    expression ("for part(?:s)?|..."), so every position in the text only
+    walks the trie instead of trying each phrase separately. Scan cost per
+    character stays roughly flat as the phrase list grows to hundreds of
+    entries. Matching is case-insensitive (casefold), so it also handles
+    non-English phrases.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = tuple(dict.fromkeys(p.casefold() for p in phrases if p))
+        self._regex = re.compile(_trie_pattern(self.phrases)) if self.phrases else None
+
+    def search(self, title: str) -> Optional[str]:
+        """
+        Return the phrase found in the title, or None.
+        """
+        if self._regex is None:
+            return None
+        match = self._regex.search(title.casefold())
+        return match.group(0) if match else None
+
+    def classify(self, titles) -> List[Optional[str]]:
+        """
+        Batch version of search() for a whole page of titles.
+        The titles are scanned as one newline-joined string.
+        """
+        titles = [title.casefold() for title in titles]
+        results: List[Optional[str]] = [None] * len(titles)
+        if self._regex is None or not titles:
+            return results
+
+        # Offset where each title starts inside the joined text
+        starts = []
+        offset = 0
+        for title in titles:
+            starts.append(offset)
+            offset += len(title) + 1
+
+        for match in self._regex.finditer("\n".join(titles)):
+            index = bisect.bisect_right(starts, match.start()) - 1
+            if results[index] is None:
+                results[index] = match.group(0)
+        return results
+
+
+def _trie_pattern(phrases) -> str:
+    """
+    Build a regex whose alternations follow a trie of the phrases.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end-of-phrase marker
+
+    def to_pattern(node) -> str:
+        ends_here = "" in node
+        branches = [
+            re.escape(char) + to_pattern(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+
+        if len(branches) == 1:
+            body = branches[0]
+            if ends_here:
+                # Optional tail: prefer the longer phrase
+                return f"(?:{body})?" if len(body) > 1 else f"{body}?"
+            return body
+
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if ends_here else body
+
+    return to_pattern(trie)
+
+
+_matcher: Optional[PhraseMatcher] = None
+_matcher_phrases: tuple = ()
+
+
+def get_title_matcher() -> PhraseMatcher:
+    """
+    Return the matcher for the current BAD_PHRASES.
+    It is only recompiled when the phrase list has changed.
+    """
+    global _matcher, _matcher_phrases
+
+    phrases = tuple(BAD_PHRASES)
+    if _matcher is None or phrases != _matcher_phrases:
+        _matcher = PhraseMatcher(phrases)
+        _matcher_phrases = phrases
+    return _matcher
+
+
+def match_suspicious_phrase(title: str) -> Optional[str]:
+    """
+    Return the BAD_PHRASES entry found in the title, or None.
+    """
+    return get_title_matcher().search(title)
+
+
+def classify_titles(titles) -> List[Optional[str]]:
+    """
+    Batch version of match_suspicious_phrase for a page of titles.
+    """
+    return get_title_matcher().classify(titles)
+
+
 def is_suspicious_title(title: str) -> bool:
     """
     Returns True if the title suggests the item is not a normal working unit.
-    Simple case-insensitive substring checks.
+    Case-insensitive match against BAD_PHRASES.
     """
-    t = title.lower()
-    return any(phrase in t for phrase in BAD_PHRASES)
+    return match_suspicious_phrase(title) is not None
 
 
 class EbayPricingError(Exception):
-    pass
+    """
+    Raised when eBay prices cannot be fetched or summarized.
+    `status_code` is set when the Browse API answered with an HTTP error.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+EBAY_BROWSE_URL = "https://api.ebay.com/buy/browse/v1/item_summary/search"
+
+_transport = None
+
+
+def get_transport():
+    """
+    Return the transport used for Browse API calls (see scout.transport).
+    Chosen from SCOUT_EBAY_TRANSPORT on first use; defaults to live HTTP.
+    Calls are rate-limited, retried and coalesced by a RequestScheduler.
+    """
+    global _transport
+    if _transport is None:
+        _transport = ScheduledTransport(transport_from_env(), scheduler_from_env())
+    return _transport
+
+
+def set_transport(transport):
+    """
+    Swap the Browse API transport, e.g. for a ReplayTransport in load tests.
+    Passing None goes back to the SCOUT_EBAY_TRANSPORT default.
+    """
+    global _transport
+    _transport = transport
 
 
 def _get_ebay_token() -> str:
@@ -41,129 +199,225 @@ def _get_ebay_token() -> str:
     return token
 
 
-def fetch_ebay_prices(keyword: str, limit: int = 200, collect_debug: bool = False):
-    """
-    Query eBay Browse API for active listings matching the keyword.
-    Returns either:
-    - list of prices (if collect_debug is False), or
-    - (prices, debug_info) if collect_debug is True.
-    """
-
-    token = _get_ebay_token()
-    url = "https://api.ebay.com/buy/browse/v1/item_summary/search"
+# The Browse API caps a single page at 200 items
+EBAY_MAX_PAGE_SIZE = 200
 
-    params = {
-        "q": keyword,
-        "limit": str(limit),
-        # You can add filters here later (condition, category, etc.)
-    }
+# Listings read per market-value lookup. One page is whatever eBay ranks
+# first (best match), which skews the median; three pages cost three calls.
+DEFAULT_MAX_ITEMS = 3 * EBAY_MAX_PAGE_SIZE
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-    }
 
-    resp = requests.get(url, headers=headers, params=params, timeout=15)
+def _fetch_page(url: str, headers: dict, params: Optional[dict] = None) -> BrowsePage:
+    """
+    GET one page of Browse API results and parse it (see scout.browse).
+    """
+    # Latency and status are recorded per attempt by the RequestScheduler
+    try:
+        resp = get_transport().get(url, headers=headers, params=params, timeout=15)
+    except requests.RequestException as e:
+        raise EbayPricingError(f"eBay request failed: {e}") from e
 
     if resp.status_code != 200:
         raise EbayPricingError(
-            f"eBay API error: {resp.status_code} - {resp.text[:200]}"
+            f"eBay API error: {resp.status_code} - {resp.text[:200]}",
+            status_code=resp.status_code,
         )
 
-    data = resp.json()
-    prices: List[float] = []
-    kept = []
-    filtered = []
+    with metrics.span("pricing.parse_page"):
+        try:
+            return parse_browse_page(resp.content)
+        except ValueError as e:
+            raise EbayPricingError(f"eBay returned invalid JSON: {e}") from e
 
 
-    for item in data.get("itemSummaries", []):
-        price_info = item.get("price")
-        title = item.get("title", "")
-        condition = item.get("condition", "")
-
-        reason = None
+def _check_title(record: BrowseItem, suspicious_phrase: Optional[str] = None) -> BrowseItem:
+    """
+    Apply the title filter to a parsed listing.
+    `suspicious_phrase` is the BAD_PHRASES match for the title, if any
+    (see classify_titles).
+    `reason` is None for usable listings, otherwise why it was filtered.
+    """
+    # A missing price is reported before a suspicious title
+    if suspicious_phrase is not None and record.reason != "no price":
+        return record._replace(price=None, reason=f"suspicious title ('{suspicious_phrase}')")
+
+    # Optional: light condition filter
+    # You can choose to only keep "NEW" and "USED" if you want.
+    # For now, we just read it in case you want to inspect it later.
+    # if condition and condition not in {"NEW", "USED"}:
+    #     reason = "condition"
+
+    return record
+
+
+def iter_ebay_items(
+    keyword: str,
+    max_items: int = 1000,
+    page_size: int = EBAY_MAX_PAGE_SIZE,
+    filters: Optional[str] = None,
+    include_filtered: bool = False,
+):
+    """
+    Stream listings for a keyword across as many Browse API pages as needed.
 
-        if not price_info:
-            reason = "no price"
+    Follows the `next` link (or offset/total when `next` is missing) until
+    `max_items` raw listings have been read. The next page is requested in the
+    background while the current one is being filtered, and records are
+    yielded one at a time so callers can start summarizing early.
 
-        elif is_suspicious_title(title):
-            reason = "suspicious / parts/broken title"
+    Yields BrowseItem records (scout.browse). Filtered records (reason set)
+    are only yielded when include_filtered is True.
+    """
+    headers = {"Accept": "application/json"}
+    if get_transport().needs_auth:
+        headers["Authorization"] = f"Bearer {_get_ebay_token()}"
 
-        if reason is None:
-            try:
-                value = float(price_info["value"])
-            except (KeyError, ValueError, TypeError):
-                reason = "invalid price format"
+    page_size = max(1, min(page_size, EBAY_MAX_PAGE_SIZE, max_items))
+    params = {
+        "q": keyword,
+        "limit": str(page_size),
+        "offset": "0",
+    }
+    if filters:
+        params["filter"] = filters
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        # copy_context keeps the caller's request priority on the prefetch thread
+        future = executor.submit(
+            contextvars.copy_context().run, _fetch_page, EBAY_BROWSE_URL, headers, params
+        )
+        offset = 0
+        seen = 0
+
+        while future is not None:
+            # Time the caller actually waits for a page (prefetch hides the rest)
+            with metrics.span("pricing.wait_page"):
+                page = future.result()
+            summaries = page.items[: max_items - seen]
+            seen += len(summaries)
+            offset += len(summaries)
+
+            # Prefetch the next page before filtering this one
+            future = None
+            if summaries and seen < max_items:
+                next_url = page.next
+                if next_url:
+                    future = executor.submit(
+                        contextvars.copy_context().run, _fetch_page, next_url, headers
+                    )
+                elif offset < page.total:
+                    next_params = dict(params, offset=str(offset))
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        _fetch_page,
+                        EBAY_BROWSE_URL,
+                        headers,
+                        next_params,
+                    )
+
+            with metrics.span("pricing.filter_titles"):
+                phrases = classify_titles([record.title for record in summaries])
+                records = [_check_title(record, phrase) for record, phrase in zip(summaries, phrases)]
+
+            if metrics.enabled():
+                kept = sum(1 for record in records if record.reason is None)
+                metrics.inc("scout_items_total", kept, outcome="kept")
+                metrics.inc("scout_items_total", len(records) - kept, outcome="filtered")
+
+            for record in records:
+                if record.reason is None or include_filtered:
+                    yield record
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_ebay_prices(
+    keyword: str,
+    limit: int = 200,
+    collect_debug: bool = False,
+    filters: Optional[str] = None,
+    max_items: Optional[int] = None,
+):
+    """
+    Query eBay Browse API for active listings matching the keyword.
+    `filters` is passed through as the Browse API `filter` parameter,
+    e.g. "conditions:{USED}".
+    By default a single page of `limit` listings is read; pass a larger
+    `max_items` to follow pagination (see iter_ebay_items).
+    Returns either:
+    - list of prices (if collect_debug is False), or
+    - (prices, debug_info) if collect_debug is True.
+    """
+    prices: List[float] = []
+    kept = []
+    filtered = []
 
-        if reason is not None:
-            if collect_debug:
-                filtered.append(
-                    {
-                        "title": title,
-                        "condition": condition,
-                        "reason": reason,
-                    }
-                )
+    records = iter_ebay_items(
+        keyword,
+        max_items=max_items or limit,
+        page_size=limit,
+        filters=filters,
+        include_filtered=collect_debug,
+    )
+
+    for record in records:
+        if record.reason is not None:
+            filtered.append(
+                {
+                    "title": record.title,
+                    "condition": record.condition,
+                    "reason": record.reason,
+                }
+            )
             continue
 
         # valid item
-        prices.append(value)
+        prices.append(record.price)
         if collect_debug:
-            image = item.get("image") or {}
-            image_url = image.get("imageUrl")
-            item_url = item.get("itemWebUrl")
-
             kept.append(
                 {
-                    "title": title,
-                    "condition": condition,
-                    "price": value,
-                    "image_url": image_url,
-                    "item_url": item_url,
+                    "item_id": record.item_id,
+                    "title": record.title,
+                    "condition": record.condition,
+                    "price": record.price,
+                    "image_url": record.image_url,
+                    "item_url": record.item_url,
                 }
             )
 
+    if collect_debug:
+        debug_info = {
+            "kept": kept,
+            "filtered": filtered,
+        }
+        return prices, debug_info
 
-        # Optional: light condition filter
-        # You can choose to only keep "NEW" and "USED" if you want.
-        # For now, we just read it in case you want to inspect it later.
-        # if condition and condition not in {"NEW", "USED"}:
-        #     continue
-
-        if collect_debug:
-            debug_info = {
-                "kept": kept,
-                "filtered": filtered,
-            }
-            
-    return prices, debug_info
-
-    
+    return prices
 
 
-def trimmed_mean(prices: List[float], trim_fraction: float = 0.20) -> float:
+def trimmed_mean(prices: List[float], trim_fraction: float = TRIM_FRACTION) -> float:
     """
     Compute a trimmed mean by removing the lowest and highest
     trim_fraction of values. For example, trim_fraction=0.20
     drops the lowest 20% and highest 20% of prices.
 
-    If too few values exist to trim correctly, fallback to simple mean.
+    If too few values exist to trim correctly, fallback to simple mean
+    (see scout.stats.trim_count).
     """
-    n = len(prices)
-    if n < 10:
+    k = trim_count(len(prices), trim_fraction)
+    if k == 0:
         # Not enough data for trimming; fallback to mean
         return statistics.mean(prices)
 
     prices_sorted = sorted(prices)
-
-    k = int(n * trim_fraction)
-    if k == 0:
-        return statistics.mean(prices_sorted)
+    n = len(prices_sorted)
 
     trimmed = prices_sorted[k: n - k]
     return statistics.mean(trimmed)
 
 
+@metrics.timed("pricing.summarize_prices")
 def summarize_prices(prices: List[float]) -> dict:
     """
     Given a list of prices, compute basic statistics:
@@ -180,7 +434,7 @@ def summarize_prices(prices: List[float]) -> dict:
     q1 = prices_sorted[n // 4]
     q3 = prices_sorted[(3 * n) // 4]
 
-    tmean = trimmed_mean(prices_sorted, trim_fraction=0.2)
+    tmean = trimmed_mean(prices_sorted)
 
     return {
         "count": n,
@@ -194,18 +448,123 @@ def summarize_prices(prices: List[float]) -> dict:
     }
 
 
-def estimate_market_value(keyword: str, limit: int = 200) -> dict:
+def estimate_market_value(
+    keyword: str,
+    limit: int = 200,
+    filters: Optional[str] = None,
+    max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+) -> dict:
     """
     Convenience helper:
-    - fetches prices from eBay for a keyword
+    - fetches prices from eBay for a keyword, up to `max_items` listings
+      over pages of `limit` (None reads a single page)
     - summarizes them
     Returns the full summary dict (min, q1, median, mean, q3, max, count).
     """
-    prices = fetch_ebay_prices(keyword, limit=limit)
+    prices = fetch_ebay_prices(keyword, limit=limit, filters=filters, max_items=max_items)
     summary = summarize_prices(prices)
     return summary
 
 
+# Live price sets per (keyword, limit, filters, max_items), see refresh_price_set
+_price_sets = {}
+_price_sets_lock = threading.Lock()
+
+
+def refresh_price_set(
+    keyword: str,
+    limit: int = 200,
+    filters: Optional[str] = None,
+    max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+):
+    """
+    Re-poll a keyword and fold the result into its PriceSet.
+
+    The first call builds the set; later calls only apply the listings
+    that were added, removed or re-priced since the previous poll (keyed
+    by itemId), so the summary is updated instead of recomputed.
+    Listings with neither an itemId nor a URL cannot be matched between
+    polls and are left out.
+    Returns the PriceSet; use .summary() and .last_changes.
+    """
+    from scout.cache import normalize_keyword
+    from scout.priceset import PriceSet
+
+    key = (normalize_keyword(keyword), limit, filters or "", max_items)
+    with _price_sets_lock:
+        price_set = _price_sets.get(key)
+        if price_set is None:
+            price_set = _price_sets[key] = PriceSet()
+
+    current = {}
+    for record in iter_ebay_items(keyword, max_items=max_items or limit, page_size=limit, filters=filters):
+        # Listings without an itemId fall back to their URL
+        item_key = record.item_id or record.item_url
+        if item_key:
+            current[item_key] = record.price
+
+    price_set.apply(current)
+    return price_set
+
+
+def _estimate_in_batch(keyword: str, limit: int, max_items: Optional[int]) -> dict:
+    # Bulk lookups queue behind interactive ones in the scheduler
+    with use_priority(BATCH):
+        return estimate_market_value(keyword, limit, max_items=max_items)
+
+
+def estimate_market_values(
+    keywords,
+    limit: int = 200,
+    concurrency: int = 8,
+    max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+):
+    """
+    Batch version of estimate_market_value for a whole sourcing list.
+
+    Keywords are priced on a bounded thread pool that shares one keep-alive
+    session, so total time is limited by concurrency instead of by the sum
+    of every round-trip. At most `concurrency` lookups are in flight, which
+    also lets `keywords` be a lazy iterable.
+
+    `limit` and `max_items` are passed to estimate_market_value.
+
+    Yields (keyword, summary, error) tuples in completion order.
+    Exactly one of summary / error is None for each keyword.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    # Make sure the pool can hold one connection per worker
+    get_session(pool_size=concurrency)
+
+    keyword_iter = iter(keywords)
+    pending = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            # Top up the in-flight window
+            for keyword in keyword_iter:
+                future = executor.submit(_estimate_in_batch, keyword, limit, max_items)
+                pending[future] = keyword
+                if len(pending) >= concurrency:
+                    break
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                keyword = pending.pop(future)
+                # Any failure (e.g. a malformed response) belongs to this
+                # keyword only; the other lookups keep going
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    yield keyword, None, e
+                else:
+                    yield keyword, summary, None
+
 
 def compute_confidence(summary: dict) -> str:
     """
@@ -0,0 +1,278 @@
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+from concurrent.futures import Future
+from typing import Optional
+
+import requests
+
+from scout import metrics
+from scout.transport import request_key
+
+# Lower number = served first
+INTERACTIVE = 0
+BATCH = 10
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_priority = contextvars.ContextVar("scout_request_priority", default=INTERACTIVE)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def use_priority(priority: int):
+    """
+    Run the enclosed eBay calls at the given priority (INTERACTIVE or BATCH).
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, at most `capacity` saved up.
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _Job:
+    __slots__ = ("key", "fn", "future", "started", "submitted")
+
+    def __init__(self, key, fn):
+        self.key = key
+        self.fn = fn
+        self.future = Future()
+        self.started = False
+        self.submitted = time.perf_counter()
+
+
+class RequestScheduler:
+    """
+    Runs Browse API calls on a few worker threads with:
+
+    - a token bucket sized to the API quota (`rate` calls/second, `burst`)
+    - a priority queue, so INTERACTIVE lookups overtake queued BATCH work
+    - coalescing: a call whose key is already queued or running shares
+      that call's Future instead of hitting the API again
+    - retries with jittered exponential backoff for 429 / 5xx responses
+      and network errors, honouring Retry-After when eBay sends one
+
+    With metrics on, every attempt is recorded on its own (latency and
+    status), and the time spent waiting for a worker, a token or a shared
+    call goes to a separate queue-wait histogram.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 10,
+        workers: int = 8,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        seed: Optional[int] = None,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._bucket = TokenBucket(rate, burst)
+        self._rng = random.Random(seed)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._inflight = {}
+        self._closed = False
+        self.stats = {"calls": 0, "coalesced": 0, "retries": 0, "failures": 0}
+
+        self._workers = [
+            threading.Thread(target=self._worker, daemon=True) for _ in range(workers)
+        ]
+        for thread in self._workers:
+            thread.start()
+
+    def submit(self, key, fn, priority: Optional[int] = None) -> Future:
+        """
+        Queue fn() under `key` and return a Future for its result.
+        """
+        if priority is None:
+            priority = current_priority()
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler is closed")
+
+            job = self._inflight.get(key)
+            if job is not None:
+                self.stats["coalesced"] += 1
+                if metrics.enabled():
+                    _observe_wait(job.future, "coalesced")
+                if not job.started:
+                    # Re-queue at the better priority; the stale entry is skipped
+                    heapq.heappush(self._queue, (priority, next(self._seq), job))
+                    self._cond.notify()
+                return job.future
+
+            job = _Job(key, fn)
+            self._inflight[key] = job
+            heapq.heappush(self._queue, (priority, next(self._seq), job))
+            self._cond.notify()
+            return job.future
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ----- internals -----
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                _, _, job = heapq.heappop(self._queue)
+                if job.started:
+                    continue
+                job.started = True
+
+            try:
+                job.future.set_result(self._run(job))
+            except BaseException as e:
+                with self._cond:
+                    self.stats["failures"] += 1
+                job.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._inflight.pop(job.key, None)
+
+    def _run(self, job: _Job):
+        attempt = 0
+        ready = job.submitted
+        while True:
+            self._bucket.acquire()
+            start = time.perf_counter()
+            metrics.observe(
+                "scout_http_queue_wait_seconds", start - ready, wait="retry" if attempt else "queued"
+            )
+            with self._cond:
+                self.stats["calls"] += 1
+
+            try:
+                resp = job.fn()
+            except requests.RequestException:
+                _record_attempt("error", start)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                metrics.inc("scout_http_retries_total", cause="error")
+            else:
+                status = getattr(resp, "status_code", 200)
+                _record_attempt(status, start)
+                if status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return resp
+                delay = max(self._backoff(attempt), _retry_after(resp))
+                metrics.inc("scout_http_retries_total", cause=str(status))
+
+            with self._cond:
+                self.stats["retries"] += 1
+            time.sleep(delay)
+            ready = time.perf_counter()
+            attempt += 1
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": uniform between 0 and the exponential cap
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return self._rng.uniform(0, cap)
+
+
+def _record_attempt(status, start: float):
+    if metrics.enabled():
+        status = str(status)
+        metrics.observe("scout_http_request_seconds", time.perf_counter() - start, status=status)
+        metrics.inc("scout_http_requests_total", status=status)
+
+
+def _observe_wait(future: Future, wait: str):
+    # A coalesced caller waits for the whole shared call, retries included
+    start = time.perf_counter()
+    future.add_done_callback(
+        lambda _: metrics.observe("scout_http_queue_wait_seconds", time.perf_counter() - start, wait=wait)
+    )
+
+
+def _retry_after(resp) -> float:
+    value = getattr(resp, "headers", {}).get("Retry-After")
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+class ScheduledTransport:
+    """
+    Transport wrapper that sends every request through a RequestScheduler.
+    Identical requests in flight at the same time share one response.
+    """
+
+    def __init__(self, inner, scheduler: Optional[RequestScheduler] = None):
+        self.inner = inner
+        self.scheduler = scheduler or RequestScheduler()
+
+    @property
+    def needs_auth(self) -> bool:
+        return self.inner.needs_auth
+
+    def get(self, url: str, headers: dict, params: Optional[dict] = None, timeout: float = 15):
+        key = request_key(url, params)
+        future = self.scheduler.submit(
+            key,
+            lambda: self.inner.get(url, headers=headers, params=params, timeout=timeout),
+        )
+        return future.result()
+
+
+def scheduler_from_env() -> RequestScheduler:
+    """
+    Build a scheduler sized from SCOUT_EBAY_RATE (calls/second, 0 = unlimited)
+    and SCOUT_EBAY_BURST.
+    """
+    return RequestScheduler(
+        rate=float(os.getenv("SCOUT_EBAY_RATE", "5")),
+        burst=int(os.getenv("SCOUT_EBAY_BURST", "10")),
+    )
@@ -0,0 +1,272 @@
+import math
+
+from typing import Iterable, List
+
+from scout.pricing import EbayPricingError, summarize_prices
+from scout.stats import TRIM_FRACTION, trim_count
+
+
+class PriceSketch:
+    """
+    Streaming, mergeable price summary (a merging t-digest plus running
+    count / sum / min / max).
+
+    Prices can be added one at a time or in batches, memory stays bounded
+    by `compression`, and sketches built on different shards or time windows
+    can be merged. summary() returns the same dict shape as
+    scout.pricing.summarize_prices, so it plugs straight into
+    compute_confidence.
+
+    Error bounds relative to summarize_prices:
+    - count, min, max and mean are exact (up to float rounding).
+    - While at most `compression` prices have been seen every price is kept
+      and summary() is identical to summarize_prices.
+    - Beyond that, quantiles carry a rank error of roughly 1 / compression
+      around the median and much less towards the tails. With the default
+      compression of 200 the reported median / Q1 / Q3 sit within half a
+      percentile of the exact ones.
+    - The trimmed mean is only inexact inside the two centroids that
+      straddle the 20% / 80% cut points; on typical price data the relative
+      error is well under 0.5%.
+    """
+
+    def __init__(self, compression: int = 200):
+        if compression < 20:
+            raise ValueError("compression must be at least 20")
+
+        self.compression = compression
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+        # Merged centroids, sorted by mean
+        self._means: List[float] = []
+        self._weights: List[float] = []
+
+        # Unmerged single prices and weighted centroids from merge()
+        self._buffer: List[float] = []
+        self._pending: List[tuple] = []
+        self._buffer_limit = 5 * compression
+
+    # ----- feeding data -----
+
+    def add(self, price: float):
+        price = float(price)
+        self.count += 1
+        self.total += price
+        if price < self.min:
+            self.min = price
+        if price > self.max:
+            self.max = price
+
+        self._buffer.append(price)
+        if len(self._buffer) >= self._buffer_limit:
+            self._compress()
+
+    def update(self, prices: Iterable[float]):
+        for price in prices:
+            self.add(price)
+
+    def merge(self, other: "PriceSketch") -> "PriceSketch":
+        """
+        Fold another sketch into this one (in place) and return self.
+        """
+        if other.count == 0:
+            return self
+
+        other._compress()
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._pending.extend(zip(other._means, other._weights))
+        self._compress()
+        return self
+
+    # ----- serialization (for shipping sketches between processes) -----
+
+    def to_dict(self) -> dict:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "means": list(self._means),
+            "weights": list(self._weights),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PriceSketch":
+        sketch = cls(compression=data["compression"])
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch._means = list(data["means"])
+        sketch._weights = list(data["weights"])
+        return sketch
+
+    # ----- queries -----
+
+    @property
+    def is_exact(self) -> bool:
+        """
+        True while every price is still stored as its own centroid.
+        """
+        self._compress()
+        return len(self._means) == self.count
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-th quantile (0 <= q <= 1).
+        """
+        if self.count == 0:
+            raise EbayPricingError("No prices to summarize.")
+        self._compress()
+
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        means = self._means
+        weights = self._weights
+        rank = q * self.count
+
+        # Each centroid is centred on the middle of the ranks it covers
+        cumulative = 0.0
+        prev_center = 0.0
+        prev_mean = self.min
+        for mean, weight in zip(means, weights):
+            center = cumulative + weight / 2
+            if rank < center:
+                if center == prev_center:
+                    return mean
+                fraction = (rank - prev_center) / (center - prev_center)
+                return prev_mean + fraction * (mean - prev_mean)
+            cumulative += weight
+            prev_center = center
+            prev_mean = mean
+
+        # Between the last centroid's centre and the maximum
+        span = self.count - prev_center
+        if span <= 0:
+            return self.max
+        fraction = (rank - prev_center) / span
+        return prev_mean + fraction * (self.max - prev_mean)
+
+    def trimmed_mean(self, trim_fraction: float = TRIM_FRACTION) -> float:
+        """
+        Same rules as scout.pricing.trimmed_mean: fall back to the plain mean
+        under 10 prices, otherwise drop int(n * trim_fraction) from each end.
+        """
+        n = self.count
+        if n == 0:
+            raise EbayPricingError("No prices to summarize.")
+
+        k = trim_count(n, trim_fraction)
+        if k == 0:
+            return self.total / n
+
+        self._compress()
+        low, high = k, n - k
+        acc = 0.0
+        start = 0.0
+        for mean, weight in zip(self._means, self._weights):
+            end = start + weight
+            overlap = min(end, high) - max(start, low)
+            if overlap > 0:
+                acc += mean * overlap
+            if end >= high:
+                break
+            start = end
+
+        return acc / (high - low)
+
+    def summary(self) -> dict:
+        """
+        Return the summarize_prices-shaped dict for everything seen so far.
+        """
+        if self.count == 0:
+            raise EbayPricingError("No prices to summarize.")
+
+        if self.is_exact:
+            return summarize_prices(self._means)
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "trimmed_mean": self.trimmed_mean(),
+            "median": self.quantile(0.5),
+            "q1": self.quantile(0.25),
+            "q3": self.quantile(0.75),
+            "min": self.min,
+            "max": self.max,
+        }
+
+    # ----- internals -----
+
+    def _scale(self, q: float) -> float:
+        # k1 scale function: small centroids at the tails, large in the middle
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _scale_inverse(self, k: float) -> float:
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self):
+        if not self._buffer and not self._pending:
+            return
+
+        points = list(zip(self._means, self._weights))
+        points.extend((price, 1.0) for price in self._buffer)
+        points.extend(self._pending)
+        points.sort()
+        self._buffer = []
+        self._pending = []
+
+        # Small inputs are kept verbatim so the summary stays exact
+        if len(points) <= self.compression:
+            self._means = [m for m, _ in points]
+            self._weights = [w for _, w in points]
+            return
+
+        total = sum(w for _, w in points)
+        means = []
+        weights = []
+
+        cur_mean, cur_weight = points[0]
+        weight_so_far = 0.0
+        limit = self._scale_inverse(self._scale(0.0) + 1) * total
+
+        for mean, weight in points[1:]:
+            if weight_so_far + cur_weight + weight <= limit:
+                # Weighted running mean of the centroid
+                cur_weight += weight
+                cur_mean += (mean - cur_mean) * weight / cur_weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                weight_so_far += cur_weight
+                k = self._scale(min(weight_so_far / total, 1.0))
+                limit = self._scale_inverse(k + 1) * total
+                cur_mean, cur_weight = mean, weight
+
+        means.append(cur_mean)
+        weights.append(cur_weight)
+        self._means = means
+        self._weights = weights
+
+
+def summarize_price_stream(prices: Iterable[float], compression: int = 200) -> dict:
+    """
+    Convenience helper: feed any iterable of prices through a PriceSketch
+    and return its summary dict.
+    """
+    sketch = PriceSketch(compression=compression)
+    sketch.update(prices)
+    return sketch.summary()
@@ -0,0 +1,176 @@
+import asyncio
+
+from typing import AsyncIterator, Iterable, List, Protocol, runtime_checkable
+
+from scout.listing import Listing
+from scout.mock_fetcher import fetch_mock_listings
+
+
+@runtime_checkable
+class ListingSource(Protocol):
+    """
+    A marketplace that streams listings.
+
+    `stream()` is an async generator, so a source can yield listings as
+    each page or API response arrives instead of returning one big list.
+    """
+
+    name: str
+
+    def stream(self) -> AsyncIterator[Listing]:
+        ...
+
+
+class MockListingSource:
+    """
+    The mock fetcher as a ListingSource.
+    `delay` (seconds per listing) simulates a slow marketplace.
+    """
+
+    def __init__(self, name: str = "mock", delay: float = 0.0, fetch=fetch_mock_listings):
+        self.name = name
+        self.delay = delay
+        self.fetch = fetch
+
+    async def stream(self) -> AsyncIterator[Listing]:
+        for listing in self.fetch():
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield listing
+
+
+class IterableSource:
+    """
+    Wrap an in-memory list (or any iterable) of listings as a ListingSource.
+    """
+
+    def __init__(self, listings: Iterable[Listing], name: str = "iterable"):
+        self.name = name
+        self.listings = listings
+
+    async def stream(self) -> AsyncIterator[Listing]:
+        for listing in self.listings:
+            yield listing
+
+
+if hasattr(asyncio, "timeout"):
+    async def _next_within(agen, seconds: float):
+        # Awaited in the pump's own task: a source that has its next listing
+        # ready hands it over without a trip through the event loop
+        async with asyncio.timeout(seconds):
+            return await agen.__anext__()
+else:  # Python 3.10
+    async def _next_within(agen, seconds: float):
+        return await asyncio.wait_for(agen.__anext__(), seconds)
+
+
+async def stream_listings(
+    sources,
+    source_timeout: float = 10.0,
+    max_buffer: int = 100,
+    errors=None,
+) -> AsyncIterator[Listing]:
+    """
+    Fan in several sources concurrently and yield listings as they arrive.
+    See stream_listing_batches for the options.
+    """
+    batches = stream_listing_batches(sources, source_timeout, max_buffer, errors)
+    try:
+        async for batch in batches:
+            for listing in batch:
+                yield listing
+    finally:
+        await batches.aclose()
+
+
+async def stream_listing_batches(
+    sources,
+    source_timeout: float = 10.0,
+    max_buffer: int = 100,
+    errors=None,
+) -> AsyncIterator[List[Listing]]:
+    """
+    Fan in several sources concurrently and yield lists of listings: each
+    list is everything that had arrived when the consumer asked, so a
+    consumer that keeps up gets single listings and one that falls behind
+    takes up to `max_buffer` at a time.
+
+    - Each source runs in its own task and feeds a shared bounded queue,
+      so a fast source waits (back-pressure) instead of buffering without
+      limit when the consumer falls behind.
+    - `source_timeout` caps the time spent waiting on each source; a slow
+      source is cancelled, keeping whatever it already produced.
+    - Failures and timeouts are recorded in `errors` (name -> reason) if a
+      dict is given, and never stop the other sources.
+    """
+    queue = asyncio.Queue(maxsize=max_buffer)
+    finished = object()
+    errors = errors if errors is not None else {}
+    stopping = False
+
+    async def pump(source):
+        agen = source.stream()
+        waited = 0.0
+        loop = asyncio.get_running_loop()
+        cancelled = False
+        try:
+            while not stopping:
+                remaining = source_timeout - waited
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                start = loop.time()
+                try:
+                    listing = await _next_within(agen, remaining)
+                except StopAsyncIteration:
+                    break
+                # Time blocked on a full queue is not the source's fault
+                waited += loop.time() - start
+                await queue.put(listing)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except asyncio.TimeoutError:
+            errors[source.name] = f"timed out after {source_timeout:g}s"
+        except Exception as e:
+            errors[source.name] = f"{type(e).__name__}: {e}"
+        finally:
+            # A failing cleanup must not replace a cancellation or timeout
+            try:
+                await agen.aclose()
+            except Exception as e:
+                errors.setdefault(source.name, f"{type(e).__name__}: {e}")
+            # Cancelled or stopping means the consumer is gone: nobody reads
+            # the queue any more, so waiting for room for the sentinel would hang
+            if not cancelled and not stopping:
+                await queue.put(finished)
+
+    tasks = [asyncio.create_task(pump(source)) for source in sources]
+    remaining_sources = len(tasks)
+    try:
+        while remaining_sources:
+            batch = []
+            item = await queue.get()
+            while True:
+                if item is finished:
+                    remaining_sources -= 1
+                else:
+                    batch.append(item)
+                if queue.empty():
+                    break
+                item = queue.get_nowait()
+            if batch:
+                yield batch
+    finally:
+        stopping = True
+        for task in tasks:
+            task.cancel()
+
+        # A pump can miss its cancellation (before Python 3.12, wait_for
+        # drops it when the source answers at the same moment) and block on
+        # the full queue. Keep emptying the queue until every pump is done.
+        pending = set(tasks)
+        while pending:
+            while not queue.empty():
+                queue.get_nowait()
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        await asyncio.gather(*tasks, return_exceptions=True)
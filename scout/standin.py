@@ -0,0 +1,276 @@
+"""
+scout/standin.py
+
+Local stand-in for the eBay Browse item_summary/search endpoint, for
+offline throughput, caching and pagination tests.
+
+Usage:
+    python -m scout.standin --port 8765 --latency-ms 80 --error-rate 0.02 --rate-limit 20
+    SCOUT_EBAY_TRANSPORT=standin python main.py
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import zlib
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from scout.transport import request_key
+
+SEARCH_PATH = "/buy/browse/v1/item_summary/search"
+
+TITLE_WORDS = ["tested", "working", "boxed", "bundle", "mint", "used", "with charger"]
+BAD_WORDS = ["for parts", "broken", "as is"]
+CONDITIONS = ["New", "Used", "Open box"]
+
+
+def synthetic_page(keyword: str, offset: int, limit: int, total: int) -> dict:
+    """
+    Deterministic Browse API page for a keyword: the same keyword, offset
+    and limit always give the same listings.
+    """
+    seed = zlib.crc32(keyword.lower().encode("utf-8"))
+    base_price = 15 + seed % 200
+    items = []
+    for i in range(offset, min(offset + limit, total)):
+        rng = random.Random(seed * 100_003 + i)
+        words = [keyword] + rng.sample(TITLE_WORDS, 2)
+        if rng.random() < 0.08:
+            words.append(rng.choice(BAD_WORDS))
+        item_id = f"v1|{seed % 1_000_000:06d}{i:06d}|0"
+        items.append(
+            {
+                "itemId": item_id,
+                "title": " ".join(words).title(),
+                "condition": rng.choice(CONDITIONS),
+                "price": {
+                    "value": f"{base_price * rng.lognormvariate(0, 0.35):.2f}",
+                    "currency": "USD",
+                },
+                "image": {"imageUrl": f"https://i.example.com/{seed}/{i}.jpg"},
+                "itemWebUrl": f"https://www.example.com/itm/{item_id}",
+            }
+        )
+
+    return {"total": total, "limit": limit, "offset": offset, "itemSummaries": items}
+
+
+class BrowseStandIn:
+    """
+    Threaded local HTTP server that answers like the Browse search endpoint.
+
+    - latency_ms / jitter_ms: delay added to every response
+    - error_rate: fraction of requests answered with a 500 or 503
+    - rate_limit / burst: token bucket; requests over it get 429 + Retry-After
+    - fixtures_dir: serve RecordingTransport files when one matches,
+      otherwise generate a synthetic page
+    - seed: makes the injected errors reproducible
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        burst: int = 10,
+        total_items: int = 1000,
+        fixtures_dir=None,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.total_items = total_items
+        self.fixtures_dir = fixtures_dir
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "fixtures": 0}
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """
+        Serve in a background thread and return the base URL.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # ----- request handling -----
+
+    def _take_token(self) -> bool:
+        if self.rate_limit <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last_refill) * self.rate_limit
+            )
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def _decide(self):
+        """
+        Return (status, delay_seconds) for the next request.
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-1, 1) * self.jitter_ms) / 1000
+            fail = self._rng.random() < self.error_rate
+            status = self._rng.choice([500, 503]) if fail else 200
+
+        if not self._take_token():
+            status = 429
+        with self._lock:
+            if status == 429:
+                self.stats["throttled"] += 1
+            elif status != 200:
+                self.stats["errors"] += 1
+        return status, delay
+
+    def _fixture(self, path: str, query: str):
+        if not self.fixtures_dir:
+            return None
+        file = os.path.join(self.fixtures_dir, request_key(f"{path}?{query}") + ".json")
+        try:
+            with open(file, encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.stats["fixtures"] += 1
+        return record["status_code"], record["text"]
+
+    def _search(self, query: dict, host: str):
+        keyword = query.get("q", [""])[0]
+        limit = max(1, min(int(query.get("limit", ["50"])[0]), 200))
+        offset = max(0, int(query.get("offset", ["0"])[0]))
+
+        page = synthetic_page(keyword, offset, limit, self.total_items)
+        if offset + limit < self.total_items:
+            next_query = urlencode({"q": keyword, "limit": limit, "offset": offset + limit})
+            page["next"] = f"http://{host}{SEARCH_PATH}?{next_query}"
+        return 200, json.dumps(page)
+
+    def _make_handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                status, delay = standin._decide()
+                if delay:
+                    time.sleep(delay)
+
+                if status == 429:
+                    self._send(429, json.dumps({"errors": [{"message": "Too many requests"}]}),
+                               {"Retry-After": "1"})
+                    return
+                if status != 200:
+                    self._send(status, json.dumps({"errors": [{"message": "Injected error"}]}))
+                    return
+                if parts.path != SEARCH_PATH:
+                    self._send(404, json.dumps({"errors": [{"message": "Not found"}]}))
+                    return
+
+                fixture = standin._fixture(parts.path, parts.query)
+                if fixture is not None:
+                    self._send(*fixture)
+                    return
+
+                host = self.headers.get("Host") or standin.base_url.split("//", 1)[1]
+                self._send(*standin._search(parse_qs(parts.query), host))
+
+            def _send(self, status: int, body: str, extra_headers=None):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (extra_headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local eBay Browse API stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="requests per second before answering 429 (0 = unlimited)")
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--total-items", type=int, default=1000)
+    parser.add_argument("--fixtures", help="directory of recorded responses to serve")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    standin = BrowseStandIn(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        total_items=args.total_items,
+        fixtures_dir=args.fixtures,
+        seed=args.seed,
+    )
+    print(f"Browse API stand-in listening on {standin.base_url}")
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
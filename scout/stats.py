@@ -0,0 +1,60 @@
+"""
+The trimming rule shared by every price summary, and the vectorized
+per-segment kernels built on it.
+
+summarize_prices, PriceSketch, PriceSet, the price history and the bulk
+summaries in scout.parallel / scout.confidence all report a
+"trimmed_mean" that drops TRIM_FRACTION of the prices from each end once
+there are MIN_TRIM_COUNT of them. NumPy is only imported by the segment
+kernels, so scout.pricing can use this module without loading it.
+
+The kernels work on "segments": many keywords' prices packed into one
+array, keyword i holding `lengths[i]` values starting at `starts[i]`.
+"""
+
+TRIM_FRACTION = 0.20
+
+# Below this many prices nothing is trimmed
+MIN_TRIM_COUNT = 10
+
+
+def trim_count(n: int, trim_fraction: float = TRIM_FRACTION) -> int:
+    """
+    How many of n sorted prices the trimmed mean drops from each end.
+    """
+    return int(n * trim_fraction) if n >= MIN_TRIM_COUNT else 0
+
+
+def segment_trim_counts(lengths):
+    """
+    trim_count for every segment length at once.
+    """
+    import numpy as np
+
+    return np.where(lengths >= MIN_TRIM_COUNT, (lengths * TRIM_FRACTION).astype(np.int64), 0)
+
+
+def sort_segments(values, lengths):
+    """
+    Return `values` with each consecutive segment sorted on its own
+    (segment id first, then price, in one lexsort).
+    """
+    import numpy as np
+
+    segment = np.repeat(np.arange(len(lengths)), lengths)
+    return values[np.lexsort((values, segment))]
+
+
+def segment_trimmed_means(s, starts, lengths, k):
+    """
+    Mean of each sorted segment without its k lowest and k highest values.
+    """
+    import numpy as np
+
+    bounds = np.empty(2 * len(lengths), dtype=np.int64)
+    bounds[0::2] = starts + k
+    bounds[1::2] = starts + lengths - k
+    # reduceat sums [bounds[0]:bounds[1]], [bounds[1]:bounds[2]], ...; keep
+    # the even ones. The padding keeps the last bound a valid index.
+    window = np.add.reduceat(np.append(s, 0.0), bounds)[0::2]
+    return window / (lengths - 2 * k)
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import threading
+
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+# Where record/replay keep their responses unless told otherwise
+DEFAULT_FIXTURES_DIR = "ebay_fixtures"
+DEFAULT_STANDIN_URL = "http://127.0.0.1:8765"
+
+_session = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """
+    Return the shared keep-alive session used for eBay calls.
+    Reusing one session means repeated lookups skip the TCP/TLS handshake.
+    The connection pool is grown if a caller needs more parallel connections.
+    """
+    global _session, _session_pool_size
+
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        if pool_size > _session_pool_size:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session_pool_size = pool_size
+        return _session
+
+
+class TransportResponse:
+    """
+    Minimal stand-in for requests.Response (status_code, text, headers, json()).
+    """
+
+    def __init__(self, status_code: int, text: str, headers: Optional[dict] = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode("utf-8")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def request_key(url: str, params: Optional[dict] = None) -> str:
+    """
+    Stable name for a request: path plus sorted query, ignoring the host,
+    so a recording made against api.ebay.com replays for any base URL.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((k, str(v)) for k, v in params.items())
+    canonical = parts.path + "?" + urlencode(sorted(query))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class HttpTransport:
+    """
+    Real HTTP over the shared session.
+    With `base_url` set, requests go to that origin instead (e.g. the local
+    stand-in from scout.standin), and no OAuth token is needed.
+    """
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.needs_auth = base_url is None
+
+    def get(self, url: str, headers: dict, params: Optional[dict] = None, timeout: float = 15):
+        if self.base_url:
+            parts = urlsplit(url)
+            base = urlsplit(self.base_url)
+            url = urlunsplit((base.scheme, base.netloc, parts.path, parts.query, ""))
+        return get_session().get(url, headers=headers, params=params, timeout=timeout)
+
+
+class RecordingTransport:
+    """
+    Pass requests through to another transport and save each response
+    to `directory` so it can be replayed later.
+    """
+
+    def __init__(self, inner=None, directory: str = DEFAULT_FIXTURES_DIR):
+        self.inner = inner or HttpTransport()
+        self.directory = directory
+        self.needs_auth = self.inner.needs_auth
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, url: str, headers: dict, params: Optional[dict] = None, timeout: float = 15):
+        resp = self.inner.get(url, headers=headers, params=params, timeout=timeout)
+
+        record = {
+            "url": url,
+            "params": params or {},
+            "status_code": resp.status_code,
+            "headers": {"Content-Type": resp.headers.get("Content-Type", "")},
+            "text": resp.text,
+        }
+        path = os.path.join(self.directory, request_key(url, params) + ".json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        return resp
+
+
+class ReplayTransport:
+    """
+    Serve responses saved by RecordingTransport; never touches the network.
+    Unknown requests get a 404 response.
+    """
+
+    needs_auth = False
+
+    def __init__(self, directory: str = DEFAULT_FIXTURES_DIR):
+        self.directory = directory
+        self._cache = {}
+
+    def get(self, url: str, headers: dict, params: Optional[dict] = None, timeout: float = 15):
+        key = request_key(url, params)
+        record = self._cache.get(key)
+        if record is None:
+            path = os.path.join(self.directory, key + ".json")
+            try:
+                with open(path, encoding="utf-8") as f:
+                    record = json.load(f)
+            except FileNotFoundError:
+                return TransportResponse(404, f"No recorded response for {url}")
+            self._cache[key] = record
+
+        return TransportResponse(record["status_code"], record["text"], record["headers"])
+
+
+def transport_from_env():
+    """
+    Pick a transport from the SCOUT_EBAY_TRANSPORT environment variable:
+
+    - live (default): real eBay API
+    - record: real eBay API, saving responses to SCOUT_EBAY_FIXTURES
+    - replay: saved responses from SCOUT_EBAY_FIXTURES, no network
+    - standin: local stand-in server at SCOUT_EBAY_BASE_URL
+    """
+    mode = os.getenv("SCOUT_EBAY_TRANSPORT", "live").strip().lower()
+    fixtures = os.getenv("SCOUT_EBAY_FIXTURES", DEFAULT_FIXTURES_DIR)
+
+    if mode == "live":
+        return HttpTransport()
+    if mode == "record":
+        return RecordingTransport(HttpTransport(), fixtures)
+    if mode == "replay":
+        return ReplayTransport(fixtures)
+    if mode == "standin":
+        return HttpTransport(os.getenv("SCOUT_EBAY_BASE_URL", DEFAULT_STANDIN_URL))
+
+    raise ValueError(f"Unknown SCOUT_EBAY_TRANSPORT: {mode!r}")
@@ -0,0 +1,287 @@
+import heapq
+import itertools
+import threading
+import time
+
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import requests
+
+from scout.analyzer import naive_profit, total_cost
+from scout.listing import Listing
+from scout.pricing import EbayPricingError
+
+
+@dataclass
+class WatchItem:
+    item_id: str
+    keyword: str
+    current_bid: float
+    shipping_cost: float
+    end_time: float  # epoch seconds
+    title: str = ""
+    url: str = ""
+
+
+@dataclass
+class ProfitAlert:
+    item: WatchItem
+    market_value: float
+    total_cost: float
+    profit: float
+    summary: dict = field(repr=False, default_factory=dict)
+
+
+class Watchlist:
+    """
+    Keeps live auctions and re-evaluates them against eBay market values.
+
+    - Auctions sit in a heap ordered by end time; ended ones are dropped
+      as soon as their end time passes.
+    - Only auctions whose bid or shipping changed (or whose keyword's
+      market summary was refreshed) are re-priced on a tick.
+    - One market summary per keyword is shared by every auction with that
+      keyword and refreshed every `summary_ttl` seconds.
+    - An alert is emitted when an auction's naive_profit crosses
+      `profit_threshold` (once per crossing, not on every tick).
+    - A failed lookup is looked up at most once per tick for its keyword,
+      then retried after `retry_delay` seconds, doubling on each further
+      failure up to `max_retry_delay`. Its auctions wait until then.
+
+    Work per tick is proportional to what changed, so thousands of watched
+    items cost little CPU while nothing is happening.
+    """
+
+    def __init__(
+        self,
+        price_lookup: Optional[Callable[[str], dict]] = None,
+        profit_threshold: float = 10.0,
+        on_alert: Optional[Callable[[ProfitAlert], None]] = None,
+        summary_ttl: float = 15 * 60,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 5 * 60,
+    ):
+        if price_lookup is None:
+            from scout.cache import PriceCache
+
+            price_lookup = PriceCache().estimate_market_value
+
+        self.price_lookup = price_lookup
+        self.profit_threshold = profit_threshold
+        self.on_alert = on_alert
+        self.summary_ttl = summary_ttl
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self._lock = threading.Lock()
+        self._items = {}
+        self._by_keyword = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._dirty = set()
+        self._summaries = {}  # keyword -> (summary, fetched_at)
+        self._failures = {}  # keyword -> (retry_at, consecutive failures)
+        self._waiting = {}  # keyword -> item ids waiting for its retry
+        self._above = set()  # item ids currently over the threshold
+        self.stats = {"evaluated": 0, "alerts": 0, "ended": 0, "lookups": 0, "lookup_errors": 0}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # ----- feeding the watchlist -----
+
+    def add(self, item: WatchItem):
+        with self._lock:
+            old = self._items.get(item.item_id)
+            if old is not None and old.keyword != item.keyword:
+                self._by_keyword[old.keyword].discard(item.item_id)
+
+            self._items[item.item_id] = item
+            self._by_keyword.setdefault(item.keyword, set()).add(item.item_id)
+            heapq.heappush(self._heap, (item.end_time, next(self._seq), item.item_id))
+            self._dirty.add(item.item_id)
+
+    def update(
+        self,
+        item_id: str,
+        current_bid: Optional[float] = None,
+        shipping_cost: Optional[float] = None,
+        end_time: Optional[float] = None,
+    ) -> bool:
+        """
+        Record a new bid / shipping / end time. Returns False for unknown items.
+        The item is only re-priced if something actually changed.
+        """
+        with self._lock:
+            item = self._items.get(item_id)
+            if item is None:
+                return False
+
+            changed = False
+            if current_bid is not None and current_bid != item.current_bid:
+                item.current_bid = current_bid
+                changed = True
+            if shipping_cost is not None and shipping_cost != item.shipping_cost:
+                item.shipping_cost = shipping_cost
+                changed = True
+            if end_time is not None and end_time != item.end_time:
+                # Auction extended: push a new heap entry, the old one goes stale
+                item.end_time = end_time
+                heapq.heappush(self._heap, (end_time, next(self._seq), item_id))
+
+            if changed:
+                self._dirty.add(item_id)
+            return True
+
+    def remove(self, item_id: str):
+        with self._lock:
+            self._drop(item_id)
+
+    # ----- scanning -----
+
+    def run_once(self, now: Optional[float] = None) -> List[ProfitAlert]:
+        """
+        One scan: drop ended auctions, refresh stale keyword summaries and
+        re-price changed auctions (soonest-ending first).
+        Returns the alerts raised during this scan.
+        """
+        now = time.time() if now is None else now
+
+        with self._lock:
+            self._expire(now)
+            self._mark_stale_keywords(now)
+            self._release_due_retries(now)
+            dirty = sorted(
+                (self._items[i] for i in self._dirty if i in self._items),
+                key=lambda item: item.end_time,
+            )
+            self._dirty = set()
+
+        alerts = []
+        for item in dirty:
+            summary = self._summary_for(item.keyword, now)
+            if summary is None:
+                with self._lock:
+                    if item.item_id in self._items:
+                        self._waiting.setdefault(item.keyword, set()).add(item.item_id)
+                continue
+
+            alert = self._evaluate(item, summary)
+            if alert is not None:
+                alerts.append(alert)
+
+        for alert in alerts:
+            if self.on_alert is not None:
+                self.on_alert(alert)
+        return alerts
+
+    def run(self, poll_interval: float = 1.0, stop_event: Optional[threading.Event] = None):
+        """
+        Scan every `poll_interval` seconds until stop_event is set.
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            self.run_once()
+            stop_event.wait(poll_interval)
+
+    # ----- internals -----
+
+    def _drop(self, item_id: str):
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return
+        ids = self._by_keyword.get(item.keyword)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del self._by_keyword[item.keyword]
+                self._summaries.pop(item.keyword, None)
+                self._failures.pop(item.keyword, None)
+        waiting = self._waiting.get(item.keyword)
+        if waiting is not None:
+            waiting.discard(item_id)
+            if not waiting:
+                del self._waiting[item.keyword]
+        self._dirty.discard(item_id)
+        self._above.discard(item_id)
+
+    def _expire(self, now: float):
+        while self._heap and self._heap[0][0] <= now:
+            end_time, _, item_id = heapq.heappop(self._heap)
+            item = self._items.get(item_id)
+            # Skip entries left behind by updates or removals
+            if item is not None and item.end_time == end_time:
+                self._drop(item_id)
+                self.stats["ended"] += 1
+
+    def _mark_stale_keywords(self, now: float):
+        for keyword, (_, fetched_at) in list(self._summaries.items()):
+            if now - fetched_at >= self.summary_ttl:
+                del self._summaries[keyword]
+                self._dirty.update(self._by_keyword.get(keyword, ()))
+
+    def _release_due_retries(self, now: float):
+        for keyword, (retry_at, _) in self._failures.items():
+            if retry_at <= now and keyword in self._waiting:
+                self._dirty.update(self._waiting.pop(keyword))
+
+    def _summary_for(self, keyword: str, now: float) -> Optional[dict]:
+        cached = self._summaries.get(keyword)
+        if cached is not None:
+            return cached[0]
+
+        with self._lock:
+            failure = self._failures.get(keyword)
+        if failure is not None and now < failure[0]:
+            # Failed earlier (possibly this same tick); wait for the retry
+            return None
+
+        self.stats["lookups"] += 1
+        try:
+            summary = self.price_lookup(keyword)
+        except (EbayPricingError, requests.RequestException):
+            self.stats["lookup_errors"] += 1
+            failures = failure[1] + 1 if failure is not None else 1
+            delay = min(self.max_retry_delay, self.retry_delay * 2 ** (failures - 1))
+            with self._lock:
+                if keyword in self._by_keyword:
+                    self._failures[keyword] = (now + delay, failures)
+            return None
+
+        with self._lock:
+            self._failures.pop(keyword, None)
+            if keyword in self._by_keyword:
+                self._summaries[keyword] = (summary, now)
+        return summary
+
+    def _evaluate(self, item: WatchItem, summary: dict) -> Optional[ProfitAlert]:
+        self.stats["evaluated"] += 1
+        candidate = Listing(
+            title=item.title or item.keyword,
+            price=summary["median"],
+            url=item.url,
+            source="watchlist",
+            current_bid=item.current_bid,
+            shipping_cost=item.shipping_cost,
+        )
+        profit = naive_profit(candidate)
+
+        with self._lock:
+            if item.item_id not in self._items:
+                return None
+            if profit < self.profit_threshold:
+                self._above.discard(item.item_id)
+                return None
+            if item.item_id in self._above:
+                return None
+            self._above.add(item.item_id)
+
+        self.stats["alerts"] += 1
+        return ProfitAlert(
+            item=item,
+            market_value=summary["median"],
+            total_cost=total_cost(candidate),
+            profit=profit,
+            summary=summary,
+        )
@@ -0,0 +1,63 @@
+import json
+
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from scout import pricing
+from scout.listing import Listing
+from scout.standin import synthetic_page
+from scout.transport import TransportResponse
+
+
+class FailingSource:
+    """
+    A listing source that yields one listing and then fails.
+    """
+
+    name = "failing"
+
+    async def stream(self):
+        yield Listing(title="before failure", price=50.0, url="u", current_bid=10.0)
+        raise RuntimeError("marketplace down")
+
+
+class FakeBrowse:
+    """
+    In-process Browse API: synthetic pages (scout.standin) per keyword, with
+    per-keyword overrides for error statuses, raw bodies or exceptions.
+    """
+
+    needs_auth = False
+
+    def __init__(self, total: int = 50):
+        self.total = total
+        self.overrides = {}
+        self.calls = []
+
+    def get(self, url: str, headers: dict, params=None, timeout: float = 15):
+        query = {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+        query.update(params or {})
+        keyword = query.get("q", "")
+        self.calls.append(keyword)
+
+        override = self.overrides.get(keyword)
+        if isinstance(override, BaseException):
+            raise override
+        if isinstance(override, tuple):
+            return TransportResponse(*override)
+
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 200))
+        page = synthetic_page(keyword, offset, limit, self.total)
+        return TransportResponse(200, json.dumps(page))
+
+
+@pytest.fixture
+def browse():
+    fake = FakeBrowse()
+    pricing.set_transport(fake)
+    try:
+        yield fake
+    finally:
+        pricing.set_transport(None)
@@ -0,0 +1,52 @@
+import numpy as np
+
+from scout.analyzer import naive_profit, sort_by_profit, total_cost
+from scout.batch import ListingBatch
+from scout.listing import Listing
+
+
+def make_listings():
+    return [
+        Listing(title="a", price=50.0, url="u1", current_bid=20.0, shipping_cost=5.0),
+        Listing(title="b", price=80.0, url="u2", current_bid=None, shipping_cost=10.0),
+        Listing(title="c", price=30.0, url="u3", current_bid=40.0, shipping_cost=None),
+        Listing(title="d", price=70.0, url="u4", image_urls=["x.jpg"], current_bid=10.0, shipping_cost=0.0),
+    ]
+
+
+def test_round_trip_keeps_missing_values():
+    listings = make_listings()
+    assert ListingBatch.from_listings(listings).to_listings() == listings
+
+
+def test_vectorized_costs_match_analyzer():
+    listings = make_listings()
+    batch = ListingBatch.from_listings(listings)
+
+    assert batch.total_cost().tolist() == [total_cost(item) for item in listings]
+    assert batch.naive_profit().tolist() == [naive_profit(item) for item in listings]
+
+
+def test_sort_by_profit_matches_analyzer_and_top_k():
+    listings = make_listings()
+    batch = ListingBatch.from_listings(listings)
+
+    assert batch.sort_by_profit() == sort_by_profit(listings)
+    assert [item.title for item in batch.sort_by_profit(2)] == ["b", "d"]
+    assert batch.top_k_by_profit(0).size == 0
+
+
+def test_market_value_override_and_take():
+    batch = ListingBatch.from_listings(make_listings())
+    profit = batch.naive_profit(market_value=100.0)
+    assert profit.tolist() == [75.0, 90.0, 60.0, 90.0]
+
+    picked = batch.take([3, 0])
+    assert [item.title for item in picked.to_listings()] == ["d", "a"]
+
+
+def test_empty_batch():
+    batch = ListingBatch.from_listings([])
+    assert len(batch) == 0
+    assert batch.sort_by_profit() == []
+    assert isinstance(batch.total_cost(), np.ndarray)
@@ -0,0 +1,57 @@
+import json
+
+from benchmarks.generators import make_browse_payload, make_listings, make_prices, make_titles
+from benchmarks.run import BENCHMARKS, compare, main
+
+
+def test_generators_are_deterministic():
+    assert make_prices(100) == make_prices(100)
+    assert make_prices(100) != make_prices(100, seed=1)
+    assert make_titles(50) == make_titles(50)
+    assert make_listings(20) == make_listings(20)
+    assert make_browse_payload(10) == make_browse_payload(10)
+
+
+def test_compare_flags_slowdowns_and_memory_growth():
+    baseline = {
+        "a@100": {"seconds": 0.010, "peak_bytes": 1000},
+        "b@100": {"seconds": 0.010, "peak_bytes": 1000},
+        "tiny@100": {"seconds": 0.0001, "peak_bytes": 1000},
+    }
+    results = {
+        "a@100": {"seconds": 0.020, "peak_bytes": 1000},
+        "b@100": {"seconds": 0.011, "peak_bytes": 2000},
+        "tiny@100": {"seconds": 0.0005, "peak_bytes": 1000},
+        "new@100": {"seconds": 1.0, "peak_bytes": 1},
+    }
+    regressions = compare(results, baseline, threshold=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("a@100 seconds")
+    assert regressions[1].startswith("b@100 peak_bytes")
+
+
+def test_save_then_compare_round_trip(tmp_path, capsys):
+    path = str(tmp_path / "baseline.json")
+    assert main(["--sizes", "50", "--only", "summarize_prices", "--repeat", "1", "--save", path]) == 0
+
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert list(saved["results"]) == ["summarize_prices@50"]
+
+    # A baseline that is much slower than anything real cannot regress
+    saved["results"]["summarize_prices@50"] = {"seconds": 10.0, "peak_bytes": 10**9}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(saved, f)
+    assert main(["--sizes", "50", "--only", "summarize_prices", "--repeat", "1", "--compare", path]) == 0
+
+    saved["results"]["summarize_prices@50"] = {"seconds": 1e-9, "peak_bytes": 1}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(saved, f)
+    assert main(["--sizes", "50", "--only", "summarize_prices", "--repeat", "1",
+                 "--compare", path, "--noise-floor", "0"]) == 1
+
+
+def test_every_benchmark_runs_at_a_small_size():
+    for name, (setup, func) in BENCHMARKS.items():
+        func(*setup(20))
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from scout import browse
+from scout.browse import BrowseItem, parse_browse_page
+from scout.standin import synthetic_page
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(browse, "orjson", None)
+    assert browse.json_backend() == request.param
+    return request.param
+
+
+def page_body(items, **extra):
+    return json.dumps(dict({"total": len(items), "itemSummaries": items}, **extra))
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_paths_and_backends_agree(backend, incremental):
+    page = synthetic_page("nintendo ds lite", 0, 50, 120)
+    page["next"] = "https://api.ebay.com/next?offset=50"
+    body = json.dumps(page, indent=2)
+
+    parsed = parse_browse_page(body.encode("utf-8"), incremental=incremental)
+    assert parsed == parse_browse_page(body, incremental=incremental)
+    assert parsed.total == 120
+    assert parsed.next == "https://api.ebay.com/next?offset=50"
+    assert len(parsed.items) == 50
+
+    first = page["itemSummaries"][0]
+    assert parsed.items[0] == BrowseItem(
+        first["itemId"],
+        first["title"],
+        first["condition"],
+        float(first["price"]["value"]),
+        first["image"]["imageUrl"],
+        first["itemWebUrl"],
+        None,
+    )
+
+
+def test_large_bodies_switch_to_incremental(monkeypatch):
+    body = page_body(synthetic_page("ps4", 0, 5, 5)["itemSummaries"])
+    monkeypatch.setattr(browse, "INCREMENTAL_THRESHOLD", 10)
+    monkeypatch.setattr(browse, "loads", lambda data: pytest.fail("decoded in one go"))
+    assert len(parse_browse_page(body).items) == 5
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_filter_reasons(incremental):
+    items = [
+        {"itemId": "a", "title": "No price"},
+        {"itemId": "b", "title": "Empty price", "price": {}},
+        {"itemId": "c", "title": "Bad value", "price": {"value": "n/a"}},
+        {"itemId": "d", "title": "Missing value", "price": {"currency": "USD"}},
+        {"itemId": "e", "title": "Good", "price": {"value": "12.50"}},
+    ]
+    parsed = parse_browse_page(page_body(items), incremental=incremental)
+    assert [(r.item_id, r.price, r.reason) for r in parsed.items] == [
+        ("a", None, "no price"),
+        ("b", None, "no price"),
+        ("c", None, "invalid price format"),
+        ("d", None, "invalid price format"),
+        ("e", 12.5, None),
+    ]
+    assert parsed.items[-1].image_url is None
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+@pytest.mark.parametrize("body", ["{}", '{"total": 0}', '{"itemSummaries": null}', '{"itemSummaries": []}'])
+def test_empty_pages(body, incremental):
+    assert parse_browse_page(body, incremental=incremental) == ([], None, 0)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+@pytest.mark.parametrize(
+    "body",
+    [
+        "",
+        "not json",
+        "[]",
+        '{"itemSummaries": [',
+        '{"itemSummaries": [{"title": "x"}',
+        '{"itemSummaries": [{"title": "x"},]}',
+        '{"total": 1,}',
+        '{"total" 1}',
+        '{"total": 1} trailing',
+        '{"itemSummaries": {"title": "x"}}',
+        '{"itemSummaries": [1]}',
+        b'{"total": "\xff"}',
+    ],
+)
+def test_malformed_bodies_raise_value_error(backend, body, incremental):
+    with pytest.raises(ValueError):
+        parse_browse_page(body, incremental=incremental)
@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+
+import requests
+
+from scout.bulk import evaluate_candidate, evaluate_candidates, read_candidates, run_evaluate
+from scout.pricing import EbayPricingError
+
+
+def lookup(keyword):
+    if keyword == "offline":
+        raise EbayPricingError("No prices to summarize.")
+    if keyword == "network":
+        raise requests.ConnectionError("connection reset")
+    if keyword == "malformed":
+        return {"count": 3}
+    return {"median": 50.0, "q1": 45.0, "q3": 55.0, "count": 40}
+
+
+def test_read_candidates_reports_bad_lines_and_keeps_going():
+    text = '{"keyword": "ds"}\n\nnot json\n[1, 2]\n{"keyword": "gameboy"}\n'
+    rows = list(read_candidates(io.StringIO(text), "jsonl"))
+
+    assert rows[0] == {"keyword": "ds"}
+    assert rows[1]["line"] == 3 and rows[1]["error"].startswith("invalid JSON")
+    assert rows[2] == {"line": 4, "error": "row is not a JSON object"}
+    assert rows[3] == {"keyword": "gameboy"}
+
+
+def test_evaluate_candidate_prices_a_row():
+    result = evaluate_candidate({"keyword": "ds", "current_bid": "30", "shipping_cost": "5"}, lookup)
+    assert result["profit"] == 15.0
+    assert result["total_cost"] == 35.0
+    assert result["confidence"] == "High"
+    assert result["error"] == ""
+
+
+def test_evaluate_candidate_reports_errors_in_the_row():
+    cases = {
+        "missing": {"current_bid": "1"},
+        "numeric keyword": {"keyword": 12, "current_bid": "abc"},
+        "bad bid": {"keyword": "ds", "current_bid": "abc"},
+        "list bid": {"keyword": "ds", "current_bid": [1]},
+        "pricing": {"keyword": "offline"},
+        "network": {"keyword": "network"},
+    }
+    for name, row in cases.items():
+        result = evaluate_candidate(row, lookup)
+        assert result["error"], name
+        assert "profit" not in result, name
+
+
+def test_numeric_keyword_is_looked_up_as_text():
+    seen = []
+    evaluate_candidate({"keyword": 12}, lambda keyword: seen.append(keyword) or lookup("ds"))
+    assert seen == ["12"]
+
+
+def test_one_failing_row_does_not_stop_the_batch():
+    rows = [{"keyword": "ds"}, {"keyword": "malformed"}, {"keyword": "network"}, {"keyword": "ds"}]
+    results = list(evaluate_candidates(rows, lookup, concurrency=2))
+
+    assert len(results) == 4
+    errors = sorted(r["keyword"] for r in results if r["error"])
+    assert errors == ["malformed", "network"]
+    malformed = next(r for r in results if r["keyword"] == "malformed")
+    assert malformed["error"].startswith("KeyError")
+
+
+def test_run_evaluate_jsonl_with_bad_lines(tmp_path):
+    src = tmp_path / "in.jsonl"
+    src.write_text('{"keyword": "ds", "current_bid": 30}\n{oops\n{"keyword": 12}\n', encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+
+    counts = run_evaluate(str(src), str(out), lookup=lookup, concurrency=2)
+    results = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+
+    assert counts == {"rows": 3, "errors": 1}
+    assert len(results) == 3
+    bad = [r for r in results if r.get("error")]
+    assert bad[0]["line"] == 2
+
+
+def test_run_evaluate_csv_keeps_input_columns(tmp_path):
+    src = tmp_path / "in.csv"
+    src.write_text("keyword,current_bid,shipping_cost,note\nds,30,5,x\n,1,1,y\n", encoding="utf-8")
+    out = tmp_path / "out.csv"
+
+    counts = run_evaluate(str(src), str(out), lookup=lookup)
+    lines = out.read_text(encoding="utf-8").splitlines()
+
+    assert counts == {"rows": 2, "errors": 1}
+    assert lines[0] == "keyword,current_bid,shipping_cost,note,market_value,total_cost,profit,confidence,sample_size,error"
+
+
+def test_run_evaluate_jsonl_to_csv_keeps_every_column(tmp_path):
+    src = tmp_path / "in.jsonl"
+    src.write_text('{oops\n{"keyword": "ds", "current_bid": 30, "title": "DS", "note": "x"}\n', encoding="utf-8")
+    out = tmp_path / "out.csv"
+
+    # One worker, so the unreadable line is the first row written
+    counts = run_evaluate(str(src), str(out), lookup=lookup, concurrency=1)
+    with open(out, newline="", encoding="utf-8") as f:
+        bad, good = list(csv.DictReader(f))
+
+    assert counts == {"rows": 2, "errors": 1}
+    assert bad["line"] == "1"
+    assert bad["error"].startswith("invalid JSON")
+    assert good["keyword"] == "ds" and good["title"] == "DS" and good["current_bid"] == "30"
+    assert good["market_value"] == "50.0" and good["error"] == ""
+    assert json.loads(good["extra"]) == {"note": "x"}
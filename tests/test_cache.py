@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from scout.cache import PriceCache, make_cache_key
+from scout.pricing import EbayPricingError
+
+
+class CountingFetcher:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, keyword, limit=200, collect_debug=True, filters=None, max_items=None):
+        self.calls.append(keyword)
+        if self.fail:
+            raise EbayPricingError("offline")
+        prices = [10.0 + len(self.calls), 20.0, 30.0]
+        kept = [{"item_id": str(i), "title": keyword, "condition": "Used", "price": p,
+                 "image_url": None, "item_url": None} for i, p in enumerate(prices)]
+        return prices, {"kept": kept, "filtered": []}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_cache_key_normalizes_keyword():
+    assert make_cache_key("  Nintendo   DS ") == make_cache_key("nintendo ds")
+    assert make_cache_key("ds", filters="x") != make_cache_key("ds")
+    assert make_cache_key("ds", max_items=200) != make_cache_key("ds")
+    assert make_cache_key("ds", max_items=None) == make_cache_key("ds", max_items=200)
+
+
+def test_lookup_reads_several_pages(browse):
+    browse.total = 450
+    cache = PriceCache(path=None)
+    prices = cache.fetch_ebay_prices("gameboy")
+    assert len(browse.calls) == 3
+    assert len(prices) > 200
+
+    # A single-page lookup is a different entry
+    assert len(cache.fetch_ebay_prices("gameboy", max_items=200)) <= 200
+    assert len(browse.calls) == 4
+    cache.close()
+
+
+def test_memory_then_disk_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    fetcher = CountingFetcher()
+
+    cache = PriceCache(path=path, fetcher=fetcher)
+    first = cache.get("ds lite")
+    assert cache.get("DS  Lite") is first
+    cache.close()
+
+    reopened = PriceCache(path=path, fetcher=fetcher)
+    assert reopened.get("ds lite")["summary"] == first["summary"]
+    assert fetcher.calls == ["ds lite"]
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+
+def test_fetch_ebay_prices_returns_copies():
+    cache = PriceCache(path=None, fetcher=CountingFetcher())
+    prices, debug_info = cache.fetch_ebay_prices("ds", collect_debug=True)
+    prices.append(999.0)
+    debug_info["kept"][0]["image_file"] = "x"
+
+    prices_again, debug_again = cache.fetch_ebay_prices("ds", collect_debug=True)
+    assert 999.0 not in prices_again
+    assert "image_file" not in debug_again["kept"][0]
+
+
+def test_stale_entry_is_served_and_refreshed_in_background():
+    fetcher = CountingFetcher()
+    cache = PriceCache(path=None, ttl=0, stale_ttl=60, fetcher=fetcher)
+    first = cache.get("ds")
+
+    assert cache.get("ds") is first
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert len(fetcher.calls) == 2
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_expired_entry_is_fetched_again():
+    fetcher = CountingFetcher()
+    cache = PriceCache(path=None, ttl=0, stale_ttl=0, fetcher=fetcher)
+    cache.get("ds")
+    cache.get("ds")
+    assert len(fetcher.calls) == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_failed_fetch_raises_and_is_not_cached():
+    fetcher = CountingFetcher(fail=True)
+    cache = PriceCache(path=None, fetcher=fetcher)
+    with pytest.raises(EbayPricingError):
+        cache.get("ds")
+    with pytest.raises(EbayPricingError):
+        cache.get("ds")
+    assert len(fetcher.calls) == 2
+
+
+def test_memory_tier_is_bounded():
+    cache = PriceCache(path=None, max_memory_items=2, fetcher=CountingFetcher())
+    for keyword in ("a", "b", "c"):
+        cache.get(keyword)
+    assert cache.stats()["memory_items"] == 2
@@ -0,0 +1,62 @@
+import io
+import json
+
+import pytest
+
+from scout.formatter import format_currency, format_interval, print_table, write_rows
+
+HEADERS = ["Title", "Price"]
+ROWS = [["Nintendo DS Lite", "$65.00"], ["Camera", "$49.99"]]
+
+
+def render(rows, fmt="table", **options):
+    stream = io.StringIO()
+    write_rows(iter(rows), HEADERS, fmt, stream=stream, **options)
+    return stream.getvalue()
+
+
+def test_print_table_matches_streaming_table():
+    stream = io.StringIO()
+    print_table(ROWS, HEADERS, stream=stream)
+    assert stream.getvalue() == render(ROWS)
+    assert stream.getvalue().splitlines()[1] == "| Title            | Price  |"
+
+
+def test_sampled_widths_cut_later_long_cells():
+    rows = [["a", "1"]] * 3 + [["a much longer title", "2"]]
+    lines = render(rows, sample_size=2).splitlines()
+    assert lines[-2] == "| a ... | 2     |"
+    assert len({len(line) for line in lines}) == 1
+
+
+def test_paging_repeats_header_and_can_stop():
+    rows = [[f"row {i}", "$1.00"] for i in range(5)]
+    pages = []
+
+    def pager():
+        pages.append(1)
+        return len(pages) < 2
+
+    text = render(rows, page_size=2, pager=pager)
+    assert text.count("| Title ") == 2
+    assert "row 3" in text and "row 4" not in text
+
+
+def test_csv_jsonl_tsv():
+    rows = [["tab\there", "new\nline"]]
+    assert render(rows, "csv") == 'Title,Price\ntab\there,"new\nline"\n'
+    assert json.loads(render(rows, "jsonl")) == {"Title": "tab\there", "Price": "new\nline"}
+    assert render(rows, "tsv") == "Title\tPrice\ntab here\tnew line\n"
+
+
+def test_small_chunks_write_every_row():
+    rows = [[str(i), "x"] for i in range(7)]
+    assert render(rows, "csv", chunk_rows=2).count("\n") == 8
+    assert render(rows, "tsv", chunk_rows=3).count("\n") == 8
+
+
+def test_unknown_format_and_currency_helpers():
+    with pytest.raises(ValueError):
+        render(ROWS, "xml")
+    assert format_currency(1234.5) == "$1,234.50"
+    assert format_interval((1, 2.5)) == "$1.00 - $2.50"
@@ -0,0 +1,174 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from scout import history as history_module
+from scout.cache import PriceCache
+from scout.history import OTHER_CONDITION, PriceHistory, _segment_rows, summarize_array, weighted_summary
+from scout.pricing import EbayPricingError, summarize_prices
+
+
+@pytest.fixture
+def history(tmp_path):
+    return PriceHistory(str(tmp_path / "history"))
+
+
+def fill(history, polls=200, seed=1):
+    """Interleaved polls of three keywords; returns what was written."""
+    rng = random.Random(seed)
+    written = {"a": [], "b": [], "c": []}
+    for poll in range(polls):
+        keyword = rng.choice("abc")
+        prices = [round(rng.uniform(1, 100), 2) for _ in range(rng.randint(1, 5))]
+        history.append(keyword, [f"{keyword}{poll}-{i}" for i in range(len(prices))], prices, timestamp=1000 + poll)
+        written[keyword].extend((1000 + poll, price) for price in prices)
+    return written
+
+
+def test_select_returns_each_keywords_rows_in_order(history):
+    written = fill(history)
+    for keyword, rows in written.items():
+        prices, times = history.prices(keyword)
+        assert prices.tolist() == [price for _, price in rows]
+        assert times.tolist() == [float(t) for t, _ in rows]
+
+
+@pytest.mark.parametrize("start, end", [(1050, 1100), (None, 1003), (1199, None), (5000, None), (1100, 1100)])
+def test_time_windows(history, start, end):
+    written = fill(history)
+    for keyword, rows in written.items():
+        expected = [p for t, p in rows if (start is None or t >= start) and (end is None or t < end)]
+        assert history.prices(keyword, start, end)[0].tolist() == expected
+
+
+def test_results_are_writable_copies(history):
+    history.append("solo", ["x", "y"], [1.0, 2.0], timestamp=1)
+    prices, _ = history.prices("solo")
+    prices[0] = 99.0
+    assert history.prices("solo")[0].tolist() == [1.0, 2.0]
+
+
+def test_segment_rows_matches_a_python_loop():
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(1, 6, size=50)
+    gaps = rng.integers(0, 4, size=50)
+    starts = np.cumsum(gaps + np.concatenate([[0], lengths[:-1]]))
+    ends = starts + lengths
+    rows = _segment_rows(starts, ends)
+    assert rows.tolist() == [r for a, b in zip(starts, ends) for r in range(a, b)]
+    assert _segment_rows(np.array([3, 5]), np.array([5, 9])) == slice(3, 9)
+
+
+def test_reopen_keeps_rows_and_drops_a_torn_append(history):
+    written = fill(history, polls=30)
+    with open(history._path("price.f8"), "ab") as f:
+        np.array([1.0, 2.0]).tofile(f)
+
+    reopened = PriceHistory(history.directory)
+    assert len(reopened) == len(history)
+    for keyword, rows in written.items():
+        assert reopened.prices(keyword)[0].tolist() == [price for _, price in rows]
+
+    reopened.append("a", ["new"], [5.0], timestamp=5000)
+    assert reopened.prices("A", start=5000)[0].tolist() == [5.0]
+
+
+def test_reader_opened_mid_append_leaves_the_rows_alone(history, monkeypatch):
+    written = fill(history, polls=30)
+    readers = []
+
+    def open_between_columns_and_segment(path, mode="r", *args, **kwargs):
+        # The columns of this append are on disk, its segment is not yet
+        if path.endswith("segments.i8") and "a" in mode and not readers:
+            readers.append(PriceHistory(history.directory, read_only=True))
+        return open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(history_module, "open", open_between_columns_and_segment, raising=False)
+    history.append("a", ["late-1", "late-2"], [7.0, 8.0], timestamp=5000)
+    monkeypatch.undo()
+
+    reader = readers[0]
+    rows = len(history)
+    assert os.path.getsize(history._path("price.f8")) == rows * 8
+    assert history.prices("a", start=5000)[0].tolist() == [7.0, 8.0]
+
+    # The reader picks the append up once its segment is there
+    assert len(reader) == rows
+    assert reader.prices("a")[0].tolist() == [price for _, price in written["a"]] + [7.0, 8.0]
+
+    history.append("new keyword", ["x"], [3.0], timestamp=6000)
+    assert reader.prices("New Keyword")[0].tolist() == [3.0]
+    assert "new keyword" in reader.keywords()
+
+
+def test_reader_never_truncates(history):
+    fill(history, polls=10)
+    path = history._path("price.f8")
+    with open(path, "ab") as f:
+        np.array([1.0, 2.0]).tofile(f)
+    size = os.path.getsize(path)
+
+    reader = PriceHistory(history.directory, read_only=True)
+    assert len(reader) == len(history)
+    assert os.path.getsize(path) == size
+    with pytest.raises(ValueError):
+        reader.append("a", ["x"], [1.0])
+    assert len(PriceHistory(str(history.directory) + "-missing", read_only=True)) == 0
+
+
+def test_summaries(history):
+    fill(history)
+    prices, _ = history.prices("b")
+    expected = summarize_prices(prices.tolist())
+    assert history.summary("b") == pytest.approx(expected)
+    assert summarize_array(prices) == pytest.approx(expected)
+
+    unweighted = weighted_summary(prices, np.ones(len(prices)))
+    for name in ("mean", "min", "max"):
+        assert unweighted[name] == pytest.approx(expected[name])
+    assert unweighted["effective_count"] == pytest.approx(len(prices))
+
+    decayed = history.summary("b", half_life=10, now=1200)
+    assert decayed["effective_count"] < len(prices)
+
+    with pytest.raises(EbayPricingError):
+        history.summary("b", start=9999)
+    with pytest.raises(EbayPricingError):
+        history.summary("never seen")
+
+
+def test_more_than_255_conditions_share_the_other_code(history):
+    conditions = [f"condition {i}" for i in range(300)]
+    history.append("kw", [str(i) for i in range(300)], [1.0] * 300, conditions, timestamp=1)
+    history.append("kw", ["late"], [2.0], ["condition 299"], timestamp=2)
+
+    codes = np.fromfile(history._path("condition.u1"), dtype=np.uint8)
+    assert codes[:255].tolist() == list(range(255))
+    assert set(codes[255:].tolist()) == {255}
+    assert history._condition_codes[OTHER_CONDITION] == 255
+
+    reopened = PriceHistory(history.directory)
+    assert reopened._condition_codes == history._condition_codes
+    assert len(reopened._condition_codes) == 256
+
+
+class BrokenHistory:
+    def record_fetch(self, keyword, debug_info, timestamp=None):
+        raise OSError("disk full")
+
+
+def test_history_failures_do_not_fail_the_fetch(browse, caplog):
+    cache = PriceCache(path=None, history=BrokenHistory())
+    with caplog.at_level("WARNING", logger="scout.cache"):
+        entry = cache.get("nintendo ds lite")
+    assert entry["prices"]
+    assert cache.stats()["history_errors"] == 1
+    assert "disk full" in caplog.text
+
+
+def test_cache_records_fetches(browse, history):
+    cache = PriceCache(path=None, history=history)
+    entry = cache.get("Nintendo DS Lite")
+    assert sorted(history.prices("nintendo ds lite")[0].tolist()) == sorted(entry["prices"])
@@ -0,0 +1,83 @@
+import os
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scout.images import ImageDownloader
+
+BODIES = {
+    "/a.jpg": b"picture one" * 1000,
+    "/b.png": b"picture two",
+    "/same-as-a": b"picture one" * 1000,
+}
+
+
+@pytest.fixture
+def image_server():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            body = BODIES.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png" if self.path.endswith(".png") else "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_downloads_dedupe_by_content(tmp_path, image_server):
+    base, _ = image_server
+    with ImageDownloader(directory=str(tmp_path), workers=4) as downloader:
+        results = {r.url: r for r in downloader.download_many(
+            [f"{base}/a.jpg", f"{base}/b.png", f"{base}/same-as-a", f"{base}/a.jpg"]
+        )}
+
+    assert len(results) == 3
+    assert results[f"{base}/a.jpg"].path == results[f"{base}/same-as-a"].path
+    assert results[f"{base}/b.png"].path.endswith(".png")
+    assert sorted(r.status for r in results.values()) == ["downloaded", "downloaded", "duplicate"]
+    stored = [name for name in os.listdir(tmp_path) if name != "index.json"]
+    assert len(stored) == 2
+
+
+def test_index_skips_network_on_next_run(tmp_path, image_server):
+    base, hits = image_server
+    with ImageDownloader(directory=str(tmp_path)) as downloader:
+        list(downloader.download_many([f"{base}/a.jpg"]))
+
+    with ImageDownloader(directory=str(tmp_path)) as downloader:
+        result = downloader.submit(f"{base}/a.jpg").result()
+
+    assert result.status == "cached"
+    assert hits == ["/a.jpg"]
+
+
+def test_http_errors_are_reported_not_raised(tmp_path, image_server):
+    base, _ = image_server
+    with ImageDownloader(directory=str(tmp_path)) as downloader:
+        missing = downloader.submit(f"{base}/missing.jpg").result()
+        unreachable = downloader.submit("http://127.0.0.1:1/x.jpg").result()
+
+    assert missing.status == "error" and missing.error == "HTTP 404"
+    assert unreachable.status == "error" and unreachable.error.startswith("download error")
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
@@ -0,0 +1,125 @@
+import pytest
+
+from scout import app
+from scout.cache import PriceCache
+from scout.keywords import KeywordIndex, keyword_tokens, model_tokens, product_tokens
+
+
+@pytest.fixture
+def index(tmp_path):
+    return KeywordIndex(str(tmp_path / "keywords.jsonl"))
+
+
+def test_tokens_ignore_case_order_and_stopwords():
+    assert keyword_tokens("The Nintendo DS-Lite, for parts") == keyword_tokens("parts nintendo lite ds")
+    assert model_tokens(keyword_tokens("PS4 Pro 1TB console")) == {"ps4", "1tb"}
+    assert product_tokens(keyword_tokens("PS4 Pro 1TB console")) == {"ps4", "pro", "1tb"}
+
+
+def test_same_words_reuse_the_first_keyword(index):
+    assert index.add("Nintendo DS Lite") == "Nintendo DS Lite"
+    assert index.canonical("DS Lite Nintendo") == "Nintendo DS Lite"
+    assert index.canonical("the nintendo  ds lite") == "Nintendo DS Lite"
+    assert index.resolve("NINTENDO DS LITE") == ("Nintendo DS Lite", 1.0)
+
+
+@pytest.mark.parametrize(
+    "known, query",
+    [
+        ("iphone 12 pro", "iphone 12 pro max"),
+        ("iphone 13", "iphone 13 pro max"),
+        ("ps4 pro 1tb", "ps4 pro 2tb"),
+        ("ps4 pro 1tb console", "ps4 slim 1tb console"),
+        ("nintendo ds lite", "nintendo ds"),
+    ],
+)
+def test_different_products_stay_separate_by_default(index, known, query):
+    index.add(known)
+    assert index.resolve(query) is None
+    assert index.add(query) == query
+    assert len(index) == 2
+
+
+def test_near_duplicates_merge_by_default(index):
+    index.add("Nintendo DS Lite")
+    index.add("ps4 pro 1tb console")
+
+    assert index.resolve("nintendo ds lite console") == ("Nintendo DS Lite", 0.75)
+    assert index.add("nintendo ds lite console") == "Nintendo DS Lite"
+    assert index.resolve("ps4 pro 1tb console bundle") == ("ps4 pro 1tb console", 0.8)
+    assert len(index) == 2
+
+
+def test_lower_threshold_never_merges_different_products():
+    index = KeywordIndex(None, threshold=0.5)
+    index.add("ps4 pro 1tb console")
+    index.add("iphone 13")
+
+    assert index.resolve("ps4 pro 2tb console") is None
+    assert index.resolve("ps5 pro 1tb console") is None
+    assert index.resolve("ps4 1tb console") is None
+    assert index.resolve("iphone 13 pro max") is None
+    assert index.resolve("iphone 13 unlocked") == ("iphone 13", 2 / 3)
+
+
+@pytest.mark.parametrize("threshold", [0, -1, 1.5])
+def test_threshold_is_validated(threshold):
+    with pytest.raises(ValueError):
+        KeywordIndex(None, threshold=threshold)
+
+
+def test_aliases_and_keywords_survive_a_reload(tmp_path):
+    path = str(tmp_path / "keywords.jsonl")
+    index = KeywordIndex(path)
+    index.add("Nintendo DS Lite")
+    index.add("DS Lite Nintendo")
+    index.add("ps4 pro 1tb")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"keyword": "torn')
+
+    reloaded = KeywordIndex(path)
+    assert len(reloaded) == 2
+    assert reloaded.canonical("ds lite nintendo") == "Nintendo DS Lite"
+    assert reloaded.canonical("PS4 Pro 1TB") == "ps4 pro 1tb"
+    assert reloaded.canonical("ps4 pro 2tb") == "ps4 pro 2tb"
+
+
+def test_keywords_without_tokens_are_not_indexed(index):
+    assert index.add("the & of") == "the & of"
+    assert len(index) == 0
+    assert index.resolve("!!!") is None
+
+
+@pytest.fixture
+def cache(browse, monkeypatch):
+    cache = PriceCache(path=None, keyword_index=KeywordIndex(None))
+    monkeypatch.setattr(app, "_price_cache", cache)
+    yield cache
+    cache.close()
+
+
+def test_cache_shares_entries_only_for_the_same_product(cache, browse):
+    cache.get("Nintendo DS Lite")
+    cache.get("ds lite nintendo")
+    cache.get("nintendo ds lite console")
+    assert browse.calls == ["Nintendo DS Lite"]
+
+    cache.get("iphone 12 pro")
+    cache.get("iphone 12 pro max")
+    assert browse.calls == ["Nintendo DS Lite", "iphone 12 pro", "iphone 12 pro max"]
+
+
+def test_note_similar_keyword_ignores_case_only_differences(cache, capsys):
+    cache.get("Nintendo DS Lite")
+
+    app.note_similar_keyword("nintendo  ds LITE")
+    assert capsys.readouterr().out == ""
+
+    app.note_similar_keyword("DS Lite Nintendo")
+    assert "similar keyword 'Nintendo DS Lite'" in capsys.readouterr().out
+
+    app.note_similar_keyword("nintendo ds lite console")
+    assert "similar keyword 'Nintendo DS Lite'" in capsys.readouterr().out
+
+    app.note_similar_keyword("nintendo ds")
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,68 @@
+import dataclasses
+import sys
+
+from datetime import datetime
+
+from benchmarks.listing_memory import bytes_per_listing
+from scout.listing import EMPTY_IMAGES, CompactListing, Listing
+
+
+def make_listing(**overrides):
+    values = dict(
+        title="Nintendo DS Lite",
+        price=65.0,
+        url="https://example.com/item2",
+        source="".join(["e", "bay"]),
+        image_urls=["https://example.com/item2.jpg"],
+        current_bid=50.0,
+        shipping_cost=5.5,
+        timestamp=datetime(2025, 1, 2, 3, 4, 5, 678901),
+    )
+    values.update(overrides)
+    return Listing(**values)
+
+
+def test_compact_listing_is_a_drop_in_dataclass():
+    listing = make_listing()
+    compact = CompactListing.from_listing(listing)
+
+    assert dataclasses.is_dataclass(compact)
+    assert [f.name for f in dataclasses.fields(compact)] == [f.name for f in dataclasses.fields(listing)]
+    assert dataclasses.asdict(compact) == dataclasses.asdict(listing)
+    assert dataclasses.replace(compact, price=70.0).price == 70.0
+    assert isinstance(compact.image_urls, list)
+    assert not hasattr(compact, "__dict__")
+
+
+def test_compact_listing_compares_with_listing_both_ways():
+    listing = make_listing()
+    compact = CompactListing.from_listing(listing)
+
+    assert compact == listing and listing == compact
+    assert compact != make_listing(price=1.0)
+    assert compact.to_listing() == listing
+
+
+def test_compact_listing_defaults_and_interned_source():
+    compact = CompactListing(title="x", price=1.0, url="u", source="".join(["mo", "ck"]))
+    assert compact.image_urls == []
+    assert compact.current_bid is None
+    assert isinstance(compact.timestamp, datetime)
+    assert compact.source is sys.intern("mock")
+
+
+def test_compact_listing_stores_compact_values():
+    listing = make_listing()
+    compact = CompactListing.from_listing(listing)
+    assert compact.timestamp_us == 1735787045678901
+    assert compact.timestamp == listing.timestamp
+    assert compact._image_urls == ("https://example.com/item2.jpg",)
+
+    compact.image_urls = []
+    assert compact._image_urls is EMPTY_IMAGES
+    assert CompactListing(title="y", price=2.0, url="v")._image_urls is EMPTY_IMAGES
+
+
+def test_compact_listing_saves_a_quarter_of_the_memory():
+    saved = 1 - bytes_per_listing(CompactListing, 20_000) / bytes_per_listing(Listing, 20_000)
+    assert saved >= 0.22
@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from scout import metrics
+from scout.pricing import fetch_ebay_prices
+from scout.scheduler import RequestScheduler
+from scout.transport import TransportResponse
+
+
+@pytest.fixture
+def recording():
+    metrics.reset()
+    metrics.enable()
+    try:
+        yield metrics.REGISTRY
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+
+def counter(registry, name, **labels):
+    return registry.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+
+def histogram(registry, name, **labels):
+    return registry.histograms.get((name, tuple(sorted(labels.items()))))
+
+
+def test_disabled_metrics_record_nothing():
+    metrics.reset()
+    assert not metrics.enabled()
+    metrics.inc("scout_items_total", outcome="kept")
+    metrics.observe("scout_span_seconds", 1.0)
+    with metrics.span("test.block"):
+        pass
+    assert metrics.REGISTRY.counters == {}
+    assert metrics.REGISTRY.histograms == {}
+
+
+def test_span_and_counters(recording):
+    with metrics.span("test.block"):
+        pass
+
+    @metrics.timed("test.fn")
+    def double(x):
+        return 2 * x
+
+    assert double(2) == 4
+    metrics.inc("scout_items_total", 3, outcome="kept")
+    metrics.inc("scout_items_total", 2, outcome="kept")
+
+    assert histogram(recording, "scout_span_seconds", span="test.block").count == 1
+    assert histogram(recording, "scout_span_seconds", span="test.fn").count == 1
+    assert counter(recording, "scout_items_total", outcome="kept") == 5
+
+
+def test_prometheus_output(recording):
+    metrics.inc("scout_items_total", 2, outcome="kept")
+    metrics.observe("scout_http_request_seconds", 0.003, status="200")
+    text = metrics.to_prometheus()
+
+    assert "# HELP scout_items_total Browse API listings kept or filtered out.\n" in text
+    assert "# TYPE scout_items_total counter\n" in text
+    assert 'scout_items_total{outcome="kept"} 2\n' in text
+    assert "# TYPE scout_http_request_seconds histogram\n" in text
+    assert 'scout_http_request_seconds_bucket{status="200",le="0.0025"} 0\n' in text
+    assert 'scout_http_request_seconds_bucket{status="200",le="0.005"} 1\n' in text
+    assert 'scout_http_request_seconds_bucket{status="200",le="+Inf"} 1\n' in text
+    assert 'scout_http_request_seconds_count{status="200"} 1\n' in text
+
+
+def test_label_values_are_escaped(recording):
+    metrics.inc("scout_items_total", outcome='say "hi"\n')
+    assert 'scout_items_total{outcome="say \\"hi\\"\\n"} 1' in metrics.to_prometheus()
+
+
+def test_every_retry_attempt_is_recorded(recording):
+    answers = [
+        requests.ConnectionError("reset"),
+        TransportResponse(503, ""),
+        TransportResponse(200, "ok"),
+    ]
+
+    def call():
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    scheduler = RequestScheduler(rate=0, base_delay=0.001, max_delay=0.01, seed=0)
+    assert scheduler.submit("k", call).result(timeout=5).status_code == 200
+    scheduler.close()
+
+    for status in ("error", "503", "200"):
+        assert counter(recording, "scout_http_requests_total", status=status) == 1
+        assert histogram(recording, "scout_http_request_seconds", status=status).count == 1
+    assert counter(recording, "scout_http_retries_total", cause="error") == 1
+    assert counter(recording, "scout_http_retries_total", cause="503") == 1
+    assert histogram(recording, "scout_http_queue_wait_seconds", wait="queued").count == 1
+    assert histogram(recording, "scout_http_queue_wait_seconds", wait="retry").count == 2
+
+
+def test_queue_wait_is_separate_from_request_latency(recording):
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return TransportResponse(200, "ok")
+
+    scheduler = RequestScheduler(rate=0, workers=1)
+    first = scheduler.submit("a", slow)
+    started.wait(5)
+    second = scheduler.submit("b", lambda: TransportResponse(200, "ok"))
+    shared = scheduler.submit("a", slow)
+    threading.Timer(0.05, release.set).start()
+    assert second.result(timeout=5).status_code == 200
+    assert first.result() is shared.result()
+    scheduler.close()
+
+    queued = histogram(recording, "scout_http_queue_wait_seconds", wait="queued")
+    assert queued.count == 2
+    # "b" waited behind the slow call, but its own attempt was quick
+    assert queued.max >= 0.04
+    assert histogram(recording, "scout_http_request_seconds", status="200").count == 2
+
+    # Done callbacks run just after result() waiters are woken
+    deadline = time.monotonic() + 5
+    while histogram(recording, "scout_http_queue_wait_seconds", wait="coalesced") is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    assert histogram(recording, "scout_http_queue_wait_seconds", wait="coalesced").count == 1
+
+
+def test_fetch_counts_kept_and_filtered_items(recording, browse):
+    prices = fetch_ebay_prices("nintendo ds lite", limit=50)
+    kept = counter(recording, "scout_items_total", outcome="kept")
+    assert kept == len(prices)
+    assert kept + counter(recording, "scout_items_total", outcome="filtered") == 50
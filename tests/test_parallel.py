@@ -0,0 +1,93 @@
+import random
+
+import numpy as np
+import pytest
+
+from scout import parallel
+from scout.parallel import summarize_keywords
+from scout.pricing import compute_confidence, summarize_prices
+
+
+def sample_data(keywords=60, seed=3):
+    rng = random.Random(seed)
+    data = {}
+    for i in range(keywords):
+        size = rng.choice([1, 2, 3, 9, 10, 11, 29, 30, 31, 250])
+        base = rng.uniform(5, 300)
+        data[f"kw{i}"] = [round(base * rng.lognormvariate(0, rng.choice([0.05, 0.3, 0.8])), 2) for _ in range(size)]
+    data["zeros"] = [0.0] * 12
+    return data
+
+
+def assert_matches_loop(summaries, data):
+    for keyword, prices in data.items():
+        expected = summarize_prices(list(prices))
+        actual = summaries[keyword]
+        assert actual["count"] == expected["count"]
+        for name in ("mean", "trimmed_mean", "median", "q1", "q3", "min", "max"):
+            assert actual[name] == pytest.approx(expected[name]), (keyword, name)
+        assert actual["confidence"] == compute_confidence(expected), keyword
+
+
+def test_in_process_matches_the_loop():
+    data = sample_data()
+    summaries = summarize_keywords(data, workers=1)
+    assert list(summaries) == list(data)
+    assert_matches_loop(summaries, data)
+
+
+def test_pool_matches_the_loop():
+    data = sample_data()
+    summaries = summarize_keywords(data, workers=2, min_parallel=0)
+    assert list(summaries) == list(data)
+    assert_matches_loop(summaries, data)
+
+
+def test_repeated_keywords_are_combined_and_empty_ones_dropped():
+    pairs = [("a", [1.0, 2.0]), ("b", []), ("a", np.array([3.0])), ("c", [4.0])]
+    summaries = summarize_keywords(pairs, workers=1)
+    assert list(summaries) == ["a", "c"]
+    assert summaries["a"]["count"] == 3
+    assert summaries["a"]["median"] == 2.0
+    assert summarize_keywords({}) == {}
+    assert summarize_keywords({"x": []}, workers=2, min_parallel=0) == {}
+
+
+def test_shards_cover_every_segment_once():
+    _, _, offsets = parallel._pack(sample_data())
+    for shards in (1, 3, 8, 1000):
+        bounds = parallel._shard_bounds(offsets, shards)
+        assert bounds[0][0] == 0 and bounds[-1][1] == len(offsets) - 1
+        assert all(a < b for a, b in bounds)
+        assert all(prev[1] == cur[0] for prev, cur in zip(bounds, bounds[1:]))
+
+
+def test_worker_task_closes_its_shared_memory(monkeypatch):
+    opened = []
+    real = parallel.shared_memory.SharedMemory
+
+    class Tracked(real):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.closed = False
+            opened.append(self)
+
+        def close(self):
+            super().close()
+            self.closed = True
+
+    _, values, offsets = parallel._pack(sample_data(keywords=10))
+    values_shm = parallel._to_shared(values)
+    offsets_shm = parallel._to_shared(offsets)
+    try:
+        monkeypatch.setattr(parallel.shared_memory, "SharedMemory", Tracked)
+        first, part = parallel._summarize_shard(values_shm.name, offsets_shm.name, 2, 7)
+    finally:
+        monkeypatch.undo()
+        for shm in (values_shm, offsets_shm):
+            shm.close()
+            shm.unlink()
+
+    assert len(opened) == 2 and all(shm.closed for shm in opened)
+    assert first == 2
+    np.testing.assert_allclose(part, parallel._summarize_segments(values, offsets[2:8]))
@@ -0,0 +1,122 @@
+import asyncio
+
+from scout.analyzer import sort_by_profit
+from scout.listing import Listing
+from scout.mock_fetcher import fetch_mock_listings
+from scout.pipeline import StreamingPipeline, TopK, rank_listings, run_pipeline
+from scout.sources import IterableSource
+from tests.conftest import FailingSource
+
+
+def auctions(bids):
+    return [
+        Listing(title=f"item{i}", price=100.0, url=f"u/{i}", current_bid=bid, shipping_cost=5.0)
+        for i, bid in enumerate(bids)
+    ]
+
+
+def test_topk_keeps_the_best_in_profit_order():
+    ranking = TopK(3)
+    for seq, profit in enumerate([5, 1, 9, 7, 3, 9]):
+        ranking.push(seq, {"profit": profit, "seq": seq})
+    assert [(r["profit"], r["seq"]) for r in ranking.snapshot()] == [(9, 2), (9, 5), (7, 3)]
+
+
+def test_topk_without_k_keeps_everything_and_ties_keep_arrival_order():
+    ranking = TopK()
+    for seq in range(5):
+        ranking.push(seq, {"profit": 1.0, "seq": seq})
+    assert len(ranking) == 5
+    assert [r["seq"] for r in ranking.snapshot()] == [0, 1, 2, 3, 4]
+
+
+def test_rank_listings_matches_sort_by_profit():
+    listings = fetch_mock_listings()
+    expected = [item.title for item in sort_by_profit(listings)]
+    assert [r["title"] for r in rank_listings(listings)] == expected
+
+
+def test_sync_path_and_staged_path_agree():
+    listings = auctions([30, 10, 50, 10, 20])
+    sync = run_pipeline(listings)
+    staged = run_pipeline(listings, pricer=lambda listing: listing.price)
+    assert sync == staged
+    assert [r["title"] for r in sync] == ["item1", "item3", "item4", "item0", "item2"]
+
+
+def test_top_k_on_both_paths():
+    listings = auctions([30, 10, 50, 10, 20])
+    assert [r["title"] for r in run_pipeline(listings, top_k=2)] == ["item1", "item3"]
+    staged = run_pipeline(listings, top_k=2, keep=lambda listing: True)
+    assert [r["title"] for r in staged] == ["item1", "item3"]
+
+
+def test_filter_and_price_errors_are_counted():
+    def pricer(listing):
+        if listing.title == "item2":
+            raise ValueError("no market data")
+        return 200.0
+
+    pipeline = StreamingPipeline(
+        [IterableSource(auctions([10, 20, 30, 40]))],
+        keep=lambda listing: listing.current_bid < 40,
+        pricer=pricer,
+    )
+    results = asyncio.run(pipeline.run())
+
+    assert [r["title"] for r in results] == ["item0", "item1"]
+    assert results[0]["market_value"] == 200.0
+    assert pipeline.stats == {"sourced": 4, "filtered": 1, "priced": 2, "price_errors": 1, "ranked": 2}
+
+
+def test_async_pricer_is_awaited():
+    async def pricer(listing):
+        await asyncio.sleep(0)
+        return listing.price * 2
+
+    results = run_pipeline(auctions([10]), pricer=pricer)
+    assert results[0]["market_value"] == 200.0
+    assert results[0]["profit"] == 185.0
+
+
+def test_listings_move_in_batches_and_lookups_stay_bounded():
+    in_flight = []
+    peak = []
+
+    async def pricer(listing):
+        in_flight.append(listing)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.001)
+        in_flight.remove(listing)
+        return listing.price
+
+    pipeline = StreamingPipeline([IterableSource(auctions(range(200)))], pricer=pricer,
+                                 queue_size=50, price_workers=3)
+    batches = []
+    score = pipeline._score
+
+    async def counting_score(batch):
+        batches.append(len(batch))
+        return await score(batch)
+
+    pipeline._score = counting_score
+    results = asyncio.run(pipeline.run())
+
+    assert len(results) == 200
+    assert sum(batches) == 200 and max(batches) > 1 and len(batches) < 200
+    assert max(peak) == 3
+
+
+def test_source_errors_are_reported_without_stopping_the_run():
+    errors = {}
+    results = run_pipeline(
+        sources=[FailingSource(), IterableSource(auctions([10]), name="ok")],
+        source_errors=errors,
+    )
+    assert sorted(r["title"] for r in results) == ["before failure", "item0"]
+    assert errors == {"failing": "RuntimeError: marketplace down"}
+
+
+def test_empty_input():
+    assert run_pipeline([]) == []
+    assert run_pipeline([], pricer=lambda listing: 1.0) == []
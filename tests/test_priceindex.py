@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from scout.cache import PriceCache
+from scout.priceindex import PriceIndex
+
+
+def brute_nearest(prices, price, k):
+    # Closest first; equal distances go to the cheaper price
+    return sorted(prices, key=lambda p: (abs(p - price), p))[:k]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_nearest_matches_brute_force(seed):
+    rng = random.Random(seed)
+    prices = [float(rng.randint(1, 60)) for _ in range(rng.randint(1, 80))]
+    index = PriceIndex(prices)
+    for _ in range(50):
+        price = rng.uniform(-5, 70)
+        k = rng.randint(0, len(prices) + 3)
+        assert index.nearest(price, k) == brute_nearest(prices, price, k)
+
+
+def test_nearest_returns_items_when_indexed_with_them():
+    items = [{"title": t, "price": p} for t, p in [("c", 30.0), ("a", 10.0), ("b", 20.0), ("d", 20.0)]]
+    index = PriceIndex([item["price"] for item in items], items)
+    assert index.prices == [10.0, 20.0, 20.0, 30.0]
+    assert [item["title"] for item in index.nearest(19, 3)] == ["b", "d", "a"]
+
+    with pytest.raises(ValueError):
+        PriceIndex([1.0, 2.0], items)
+
+
+def test_range_count_and_percentile_rank():
+    index = PriceIndex([5, 1, 3, 3, 9])
+    assert index.range_count(3, 5) == 3
+    assert index.range_count(low=4) == 2
+    assert index.range_count(high=3) == 3
+    assert index.range_count() == 5
+    assert index.range_count(6, 2) == 0
+
+    assert index.percentile_rank(0) == 0.0
+    assert index.percentile_rank(3) == 40.0  # 1 below, 2 equal
+    assert index.percentile_rank(100) == 100.0
+
+
+def test_empty_index():
+    index = PriceIndex([])
+    assert len(index) == 0
+    assert index.nearest(10, 5) == []
+    assert index.range_count(0, 100) == 0
+    with pytest.raises(ValueError):
+        index.percentile_rank(10)
+
+
+def test_from_fetch():
+    assert PriceIndex.from_fetch([3.0, 1.0]).prices == [1.0, 3.0]
+
+    kept = [{"title": "x", "price": 8.0}, {"title": "y", "price": 2.0}]
+    index = PriceIndex.from_fetch([8.0, 2.0], {"kept": kept, "filtered": []})
+    assert index.nearest(0, 1) == [{"title": "y", "price": 2.0}]
+    assert len(PriceIndex.from_fetch([], {})) == 0
+
+
+def test_cache_builds_the_index_once_per_entry(browse):
+    cache = PriceCache(path=None, ttl=3600)
+    index = cache.price_index("nintendo ds lite")
+    assert cache.price_index("Nintendo DS Lite") is index
+    assert sorted(cache.fetch_ebay_prices("nintendo ds lite")) == index.prices
+    assert all(item["price"] == price for item, price in zip(index.nearest(0, len(index)), index.prices))
+
+    # A new fetch replaces the entry, and with it the index
+    cache.clear()
+    assert cache.price_index("nintendo ds lite") is not index
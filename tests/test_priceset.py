@@ -0,0 +1,119 @@
+import json
+import random
+
+import pytest
+
+from scout import pricing
+from scout.pricing import EbayPricingError, refresh_price_set, summarize_prices
+from scout.priceset import BULK_UPDATE, PriceSet
+
+
+@pytest.fixture(autouse=True)
+def fresh_price_sets():
+    pricing._price_sets.clear()
+    yield
+    pricing._price_sets.clear()
+
+
+def assert_matches(price_set, prices):
+    expected = summarize_prices(sorted(prices))
+    actual = price_set.summary()
+    assert actual.keys() == expected.keys()
+    for name, value in expected.items():
+        assert actual[name] == pytest.approx(value), name
+
+
+def test_apply_reports_the_diff():
+    price_set = PriceSet({"a": 10.0, "b": 20.0, "c": 30.0})
+    changes = price_set.apply({"a": 10.0, "b": 25.0, "d": 40.0})
+    assert changes == {"added": 1, "removed": 1, "changed": 1}
+    assert price_set.last_changes == changes
+    assert price_set.prices() == [10.0, 25.0, 40.0]
+    assert "c" not in price_set and "d" in price_set
+
+    assert price_set.apply({"a": 10.0, "b": 25.0, "d": 40.0}) == {"added": 0, "removed": 0, "changed": 0}
+
+
+@pytest.mark.parametrize("size", [1, 2, 9, 10, 11, 57])
+def test_summary_matches_summarize_prices_through_single_updates(size):
+    rng = random.Random(size)
+    price_set = PriceSet()
+    live = {}
+    for _ in range(400):
+        item_id = f"i{rng.randrange(size * 2)}"
+        if live and rng.random() < 0.3:
+            victim = rng.choice(list(live))
+            assert price_set.remove(victim)
+            del live[victim]
+        else:
+            live[item_id] = round(rng.uniform(1, 100), 2)
+            price_set.update(item_id, live[item_id])
+        if live:
+            assert_matches(price_set, live.values())
+    assert not price_set.remove("missing")
+
+
+def test_summary_matches_summarize_prices_through_bulk_polls():
+    rng = random.Random(7)
+    live = {f"i{i}": rng.uniform(1, 500) for i in range(300)}
+    price_set = PriceSet(live)
+    assert_matches(price_set, live.values())
+
+    for _ in range(20):
+        # Enough churn to take the merge path, sometimes a small poll
+        churn = rng.choice([BULK_UPDATE * 3, 5])
+        for item_id in rng.sample(list(live), churn):
+            del live[item_id]
+        for _ in range(churn):
+            live[f"n{rng.random()}"] = rng.uniform(1, 500)
+        for item_id in rng.sample(list(live), churn):
+            live[item_id] = rng.uniform(1, 500)
+        price_set.apply(dict(live))
+        assert len(price_set) == len(live)
+        assert_matches(price_set, live.values())
+
+
+def test_duplicate_prices_and_empty_set():
+    price_set = PriceSet({f"i{i}": 5.0 for i in range(12)})
+    assert_matches(price_set, [5.0] * 12)
+    price_set.apply({})
+    assert len(price_set) == 0
+    with pytest.raises(EbayPricingError):
+        price_set.summary()
+
+
+def test_refresh_price_set_applies_only_changes(browse):
+    first = refresh_price_set("nintendo ds lite", limit=50)
+    assert first.last_changes["added"] == len(first) > 0
+    assert first.last_changes["removed"] == first.last_changes["changed"] == 0
+
+    # Case differences share one set
+    again = refresh_price_set("Nintendo DS Lite", limit=50)
+    assert again is first
+    assert again.last_changes == {"added": 0, "removed": 0, "changed": 0}
+
+    expected = [
+        record.price for record in pricing.iter_ebay_items("nintendo ds lite", max_items=50, page_size=50)
+    ]
+    assert_matches(first, expected)
+
+
+def test_refresh_price_set_skips_listings_without_id_or_url(browse):
+    def item(price, **fields):
+        return dict({"title": "Nintendo DS Lite", "price": {"value": str(price), "currency": "USD"}}, **fields)
+
+    page = {
+        "total": 3,
+        "offset": 0,
+        "limit": 50,
+        "itemSummaries": [
+            item(10, itemId="v1|1|0"),
+            item(20, itemWebUrl="https://www.example.com/itm/2"),
+            item(30),
+        ],
+    }
+    browse.overrides["ds lite"] = (200, json.dumps(page))
+
+    price_set = refresh_price_set("ds lite", limit=50)
+    assert price_set.prices() == [10.0, 20.0]
+    assert "v1|1|0" in price_set and "https://www.example.com/itm/2" in price_set
@@ -0,0 +1,97 @@
+import pytest
+import requests
+
+from scout.pricing import (
+    DEFAULT_MAX_ITEMS,
+    EbayPricingError,
+    estimate_market_value,
+    estimate_market_values,
+    fetch_ebay_prices,
+    iter_ebay_items,
+)
+
+
+def test_estimate_market_values_one_result_per_keyword(browse):
+    keywords = [f"item {i}" for i in range(20)]
+    results = list(estimate_market_values(keywords, limit=20, concurrency=4))
+
+    assert sorted(k for k, _, _ in results) == sorted(keywords)
+    for _, summary, error in results:
+        assert error is None
+        assert summary["count"] > 0
+
+
+def test_estimate_market_values_reports_every_failure_kind(browse):
+    browse.overrides["http error"] = (404, "not found")
+    browse.overrides["network"] = requests.ConnectionError("down")
+    browse.overrides["malformed"] = (200, '{"itemSummaries": [{"price": {"value": "1"}}, 5]}')
+    browse.overrides["bug"] = KeyError("boom")
+
+    keywords = ["good one", "http error", "network", "malformed", "bug", "good two"]
+    results = {k: (summary, error) for k, summary, error in estimate_market_values(keywords, limit=10)}
+
+    assert set(results) == set(keywords)
+    for keyword, (summary, error) in results.items():
+        # Exactly one of summary / error
+        assert (summary is None) != (error is None)
+    assert results["good one"][0] is not None
+    assert results["good two"][0] is not None
+    assert isinstance(results["http error"][1], EbayPricingError)
+    assert isinstance(results["malformed"][1], EbayPricingError)
+    assert isinstance(results["bug"][1], KeyError)
+
+
+def test_estimate_market_values_rejects_zero_concurrency():
+    with pytest.raises(ValueError):
+        list(estimate_market_values(["x"], concurrency=0))
+
+
+def test_fetch_ebay_prices_debug_splits_kept_and_filtered(browse):
+    prices, debug_info = fetch_ebay_prices("nintendo ds lite", limit=50, collect_debug=True)
+
+    assert len(prices) == len(debug_info["kept"])
+    assert len(prices) + len(debug_info["filtered"]) == 50
+    assert all(item["reason"].startswith("suspicious title") for item in debug_info["filtered"])
+
+
+def test_estimate_market_value_reads_past_the_first_page(browse):
+    browse.total = 450
+    summary = estimate_market_value("gameboy")
+
+    assert DEFAULT_MAX_ITEMS > 200
+    assert browse.calls == ["gameboy"] * 3
+    assert summary["count"] > 200
+
+    browse.calls.clear()
+    assert estimate_market_value("gameboy", max_items=None)["count"] <= 200
+    assert browse.calls == ["gameboy"]
+
+
+def test_iter_ebay_items_follows_pages_until_total(browse):
+    browse.total = 450
+    records = list(iter_ebay_items("gameboy", max_items=1000, page_size=200, include_filtered=True))
+
+    assert len(records) == 450
+    assert len({record.item_id for record in records}) == 450
+    assert browse.calls == ["gameboy"] * 3
+
+
+def test_iter_ebay_items_stops_at_max_items(browse):
+    browse.total = 1000
+    records = list(iter_ebay_items("gameboy", max_items=250, page_size=200, include_filtered=True))
+
+    assert len(records) == 250
+    assert len(browse.calls) == 2
+
+
+def test_iter_ebay_items_only_yields_kept_by_default(browse):
+    records = list(iter_ebay_items("gameboy", max_items=50))
+    assert records
+    assert all(record.reason is None and record.price is not None for record in records)
+
+
+def test_iter_ebay_items_raises_page_errors(browse):
+    browse.overrides["gameboy"] = (503, "unavailable")
+    with pytest.raises(EbayPricingError) as info:
+        list(iter_ebay_items("gameboy", max_items=50))
+    assert info.value.status_code == 503
@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+import requests
+
+from scout.scheduler import (
+    BATCH,
+    INTERACTIVE,
+    RequestScheduler,
+    ScheduledTransport,
+    TokenBucket,
+    use_priority,
+)
+from scout.transport import TransportResponse
+
+
+def fast_scheduler(**kwargs):
+    kwargs.setdefault("rate", 0)
+    kwargs.setdefault("base_delay", 0.001)
+    kwargs.setdefault("max_delay", 0.01)
+    kwargs.setdefault("seed", 0)
+    return RequestScheduler(**kwargs)
+
+
+def test_retries_retryable_statuses_then_succeeds():
+    answers = [TransportResponse(503, ""), TransportResponse(429, ""), TransportResponse(200, "ok")]
+    scheduler = fast_scheduler()
+    resp = scheduler.submit("k", lambda: answers.pop(0)).result(timeout=5)
+
+    assert resp.status_code == 200
+    assert scheduler.stats["calls"] == 3
+    assert scheduler.stats["retries"] == 2
+    scheduler.close()
+
+
+def test_gives_up_after_max_retries():
+    scheduler = fast_scheduler(max_retries=2)
+    resp = scheduler.submit("k", lambda: TransportResponse(500, "")).result(timeout=5)
+    assert resp.status_code == 500
+    assert scheduler.stats["calls"] == 3
+
+    def down():
+        raise requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        scheduler.submit("k2", down).result(timeout=5)
+    assert scheduler.stats["failures"] == 1
+    scheduler.close()
+
+
+def test_non_retryable_status_is_returned_at_once():
+    scheduler = fast_scheduler()
+    resp = scheduler.submit("k", lambda: TransportResponse(404, "")).result(timeout=5)
+    assert resp.status_code == 404
+    assert scheduler.stats["calls"] == 1
+    scheduler.close()
+
+
+def test_identical_requests_in_flight_are_coalesced():
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return TransportResponse(200, "ok")
+
+    scheduler = fast_scheduler(workers=2)
+    first = scheduler.submit("same", slow)
+    second = scheduler.submit("same", slow)
+    release.set()
+
+    assert first is second
+    assert first.result(timeout=5).text == "ok"
+    assert calls == [1]
+    assert scheduler.stats["coalesced"] == 1
+    scheduler.close()
+
+
+def test_interactive_work_overtakes_queued_batch_work():
+    started = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    scheduler = fast_scheduler(workers=1)
+    scheduler.submit("blocker", blocker)
+    started.wait(5)
+    with use_priority(BATCH):
+        batch = [scheduler.submit(f"b{i}", lambda i=i: order.append(f"b{i}")) for i in range(3)]
+    urgent = scheduler.submit("i", lambda: order.append("i"), priority=INTERACTIVE)
+    release.set()
+
+    for future in batch + [urgent]:
+        future.result(timeout=5)
+    assert order[0] == "i"
+    scheduler.close()
+
+
+def test_closed_scheduler_rejects_work():
+    scheduler = fast_scheduler()
+    scheduler.close()
+    with pytest.raises(RuntimeError):
+        scheduler.submit("k", lambda: None)
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=1000, capacity=1)
+    for _ in range(5):
+        bucket.acquire()
+    assert bucket._tokens < 1
+
+
+def test_scheduled_transport_passes_through():
+    class Inner:
+        needs_auth = True
+
+        def get(self, url, headers, params=None, timeout=15):
+            return TransportResponse(200, url + str(sorted((params or {}).items())))
+
+    transport = ScheduledTransport(Inner(), fast_scheduler())
+    assert transport.needs_auth
+    assert transport.get("u", {}, {"q": "x"}).text == "u[('q', 'x')]"
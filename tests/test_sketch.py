@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from scout.pricing import EbayPricingError, summarize_prices
+from scout.sketch import PriceSketch, summarize_price_stream
+
+
+def lognormal_prices(n, seed=0):
+    rng = random.Random(seed)
+    return [50 * rng.lognormvariate(0, 0.4) for _ in range(n)]
+
+
+def test_small_input_is_exact():
+    prices = lognormal_prices(150)
+    sketch = PriceSketch()
+    sketch.update(prices)
+
+    assert sketch.is_exact
+    assert sketch.summary() == summarize_prices(prices)
+
+
+def test_large_input_stays_within_stated_bounds():
+    prices = lognormal_prices(50_000)
+    exact = summarize_prices(prices)
+    approx = summarize_price_stream(prices)
+    ranked = sorted(prices)
+
+    assert approx["count"] == exact["count"]
+    assert approx["min"] == exact["min"] and approx["max"] == exact["max"]
+    assert approx["mean"] == pytest.approx(exact["mean"], rel=1e-9)
+    assert approx["trimmed_mean"] == pytest.approx(exact["trimmed_mean"], rel=5e-3)
+    for key, q in (("q1", 0.25), ("median", 0.5), ("q3", 0.75)):
+        # Within half a percentile in rank
+        lo = ranked[int((q - 0.005) * len(ranked))]
+        hi = ranked[int((q + 0.005) * len(ranked))]
+        assert lo <= approx[key] <= hi
+
+
+def test_merge_matches_a_single_sketch():
+    prices = lognormal_prices(20_000, seed=1)
+    left, right = PriceSketch(), PriceSketch()
+    left.update(prices[:7_000])
+    right.update(prices[7_000:])
+    merged = left.merge(right).summary()
+    exact = summarize_prices(prices)
+
+    assert merged["count"] == len(prices)
+    assert merged["median"] == pytest.approx(exact["median"], rel=0.01)
+
+
+def test_round_trips_through_dict():
+    sketch = PriceSketch()
+    sketch.update(lognormal_prices(5_000, seed=2))
+    copy = PriceSketch.from_dict(sketch.to_dict())
+    assert copy.summary() == sketch.summary()
+
+
+def test_empty_sketch_and_bad_compression():
+    with pytest.raises(EbayPricingError):
+        PriceSketch().summary()
+    with pytest.raises(ValueError):
+        PriceSketch(compression=5)
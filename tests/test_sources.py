@@ -0,0 +1,154 @@
+import asyncio
+import random
+import threading
+
+from scout.listing import Listing
+from scout.sources import IterableSource, ListingSource, MockListingSource, stream_listings
+from tests.conftest import FailingSource
+
+
+def listings(prefix, n):
+    return [Listing(title=f"{prefix}{i}", price=float(i), url=f"u/{prefix}{i}") for i in range(n)]
+
+
+def run(coro, timeout=5):
+    # Run on a daemon thread so a hung event loop fails the test instead of
+    # blocking the suite (wait_for cannot interrupt a stuck cleanup)
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = asyncio.run(coro)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "event loop did not finish in time"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+async def collect(sources, **options):
+    return [listing.title async for listing in stream_listings(sources, **options)]
+
+
+class SlowSource:
+    def __init__(self, name, delay, count=3):
+        self.name = name
+        self.delay = delay
+        self.count = count
+
+    async def stream(self):
+        for i in range(self.count):
+            await asyncio.sleep(self.delay)
+            yield Listing(title=f"{self.name}{i}", price=1.0, url="u")
+
+
+class BadCleanupSource:
+    name = "bad cleanup"
+
+    async def stream(self):
+        try:
+            for listing in listings("c", 10):
+                yield listing
+        finally:
+            raise OSError("cleanup failed")
+
+
+def test_sources_are_protocol_instances():
+    assert isinstance(MockListingSource(), ListingSource)
+    assert isinstance(IterableSource([]), ListingSource)
+
+
+def test_fan_in_yields_everything_with_a_small_buffer():
+    sources = [IterableSource(listings(p, 50), name=p) for p in "abc"]
+    titles = run(collect(sources, max_buffer=2))
+
+    assert len(titles) == 150
+    assert set(titles) == {f"{p}{i}" for p in "abc" for i in range(50)}
+
+
+def test_slow_and_failing_sources_are_reported_not_raised():
+    errors = {}
+    sources = [SlowSource("slow", delay=1.0), FailingSource(), IterableSource(listings("ok", 3), name="ok")]
+    titles = run(collect(sources, source_timeout=0.2, errors=errors))
+
+    assert sorted(titles) == ["before failure", "ok0", "ok1", "ok2"]
+    assert errors == {"slow": "timed out after 0.2s", "failing": "RuntimeError: marketplace down"}
+
+
+def test_time_blocked_on_a_full_queue_is_not_charged_to_the_source():
+    async def slow_consumer():
+        errors = {}
+        titles = []
+        async for listing in stream_listings([IterableSource(listings("a", 5))], source_timeout=0.1,
+                                             max_buffer=1, errors=errors):
+            titles.append(listing.title)
+            await asyncio.sleep(0.05)
+        return titles, errors
+
+    titles, errors = run(slow_consumer())
+    assert len(titles) == 5 and errors == {}
+
+
+def test_breaking_out_early_does_not_hang():
+    async def first_only():
+        stream = stream_listings([IterableSource(listings(p, 50), name=p) for p in "abc"], max_buffer=2)
+        async for listing in stream:
+            break
+        await stream.aclose()
+        return listing.title
+
+    assert run(first_only(), timeout=3).endswith("0")
+
+
+def test_breaking_out_early_at_random_points_never_hangs():
+    # Many early exits in one event loop: a leaked producer task or a missed
+    # wake-up would hang one of them and trip run()'s timeout
+    rng = random.Random(16)
+
+    async def stress(iterations):
+        for _ in range(iterations):
+            sources = [IterableSource(listings(p, rng.randint(0, 20)), name=p) for p in "abc"[:rng.randint(1, 3)]]
+            if rng.random() < 0.3:
+                sources.append(FailingSource())
+            if rng.random() < 0.3:
+                sources.append(BadCleanupSource())
+            stop = rng.randint(0, 30)
+            errors = {}
+            stream = stream_listings(sources, max_buffer=rng.randint(1, 4), errors=errors)
+            seen = 0
+            async for _ in stream:
+                if seen == stop:
+                    break
+                seen += 1
+            await stream.aclose()
+            assert set(errors) <= {"failing", "bad cleanup"}
+        return len(asyncio.all_tasks())
+
+    # Only stress() itself is still running
+    assert run(stress(2000), timeout=60) == 1
+
+
+def test_breaking_out_early_with_failing_cleanup():
+    async def first_only():
+        errors = {}
+        stream = stream_listings([BadCleanupSource(), IterableSource(listings("a", 50))],
+                                 max_buffer=1, errors=errors)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        return errors
+
+    errors = run(first_only(), timeout=3)
+    assert set(errors) <= {"bad cleanup"}
+
+
+def test_failing_cleanup_is_recorded_after_normal_end():
+    errors = {}
+    titles = run(collect([BadCleanupSource()], errors=errors))
+    assert len(titles) == 10
+    assert errors == {"bad cleanup": "OSError: cleanup failed"}
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import scout
+from benchmarks.startup import HEAVY_MODULES, TARGETS
+
+# Loaded only by the menu options / commands that use them
+LAZY_MODULES = HEAVY_MODULES + [
+    "asyncio",
+    "scout.bulk",
+    "scout.confidence",
+    "scout.history",
+    "scout.keywords",
+    "scout.priceindex",
+    "scout.sources",
+]
+
+
+def test_cli_modules_do_not_import_heavy_subsystems():
+    probe = (
+        "import json, sys\n"
+        f"for name in {TARGETS!r}: __import__(name)\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True)
+    assert json.loads(out.stdout) == []
+
+
+def test_package_exports_load_on_first_access():
+    assert scout.Listing.__name__ == "Listing"
+    assert callable(scout.sort_by_profit)
+    assert "fetch_mock_listings" in dir(scout)
+    with pytest.raises(AttributeError):
+        scout.not_a_name
@@ -0,0 +1,146 @@
+import random
+
+import numpy as np
+import pytest
+
+from scout.confidence import (
+    approximate_intervals,
+    approximate_intervals_many,
+    assess_confidence,
+    bootstrap_intervals,
+)
+from scout.pricing import EbayPricingError, compute_confidence, summarize_prices, trimmed_mean
+from scout.stats import (
+    MIN_TRIM_COUNT,
+    TRIM_FRACTION,
+    segment_trim_counts,
+    segment_trimmed_means,
+    sort_segments,
+    trim_count,
+)
+
+
+@pytest.mark.parametrize("n, expected", [(0, 0), (1, 0), (9, 0), (10, 2), (14, 2), (15, 3), (200, 40)])
+def test_trim_count(n, expected):
+    assert trim_count(n) == expected
+    assert segment_trim_counts(np.array([n])).tolist() == [expected]
+
+
+def test_trimmed_mean_uses_the_shared_rule():
+    assert trimmed_mean([5.0, 1.0, 3.0]) == 3.0
+    prices = [float(i) for i in range(MIN_TRIM_COUNT)]
+    k = int(len(prices) * TRIM_FRACTION)
+    assert trimmed_mean(prices) == pytest.approx(sum(prices[k:-k]) / (len(prices) - 2 * k))
+    assert trimmed_mean(prices, trim_fraction=0) == pytest.approx(sum(prices) / len(prices))
+
+
+def test_segment_kernel_matches_trimmed_mean():
+    rng = random.Random(5)
+    segments = [[rng.uniform(1, 100) for _ in range(rng.randint(1, 40))] for _ in range(200)]
+    lengths = np.array([len(s) for s in segments])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    s = sort_segments(np.concatenate(segments), lengths)
+    for segment, start, length in zip(segments, starts, lengths):
+        assert s[start:start + length].tolist() == sorted(segment)
+
+    means = segment_trimmed_means(s, starts, lengths, segment_trim_counts(lengths))
+    assert means == pytest.approx([trimmed_mean(segment) for segment in segments])
+
+
+def naive_bootstrap(prices, resamples, level, seed):
+    # The same draws as bootstrap_intervals (one chunk), resample by resample
+    x = np.sort(np.asarray(prices, dtype=np.float64))
+    draws = np.random.default_rng(seed).integers(0, len(x), size=(resamples, len(x)))
+    medians = [summarize_prices(x[row].tolist())["median"] for row in draws]
+    trimmed = [trimmed_mean(x[row].tolist()) for row in draws]
+    tail = (1 - level) / 2
+    return {
+        "median": tuple(np.quantile(medians, [tail, 1 - tail])),
+        "trimmed_mean": tuple(np.quantile(trimmed, [tail, 1 - tail])),
+    }
+
+
+@pytest.mark.parametrize("n", [2, 9, 10, 31])
+def test_bootstrap_matches_resampling_one_by_one(n):
+    rng = random.Random(n)
+    prices = [round(rng.uniform(10, 90), 2) for _ in range(n)]
+    fast = bootstrap_intervals(prices, resamples=300, level=0.9, seed=42)
+    slow = naive_bootstrap(prices, 300, 0.9, 42)
+    for name in ("median", "trimmed_mean"):
+        assert fast[name] == pytest.approx(slow[name])
+
+
+def test_bootstrap_edge_cases():
+    with pytest.raises(ValueError):
+        bootstrap_intervals([])
+    assert bootstrap_intervals([7.5]) == {"median": (7.5, 7.5), "trimmed_mean": (7.5, 7.5)}
+    assert bootstrap_intervals([4.0] * 20, seed=1) == {"median": (4.0, 4.0), "trimmed_mean": (4.0, 4.0)}
+
+
+def test_bootstrap_chunks_do_not_change_the_result(monkeypatch):
+    from scout import confidence
+
+    prices = np.random.default_rng(0).lognormal(4, 0.3, size=50)
+    whole = bootstrap_intervals(prices, seed=3)
+    assert whole == bootstrap_intervals(prices, seed=3)
+
+    # Draw the resamples seven at a time instead of all at once
+    monkeypatch.setattr(confidence, "_MAX_CHUNK_ELEMENTS", 7 * len(prices))
+    chunked = bootstrap_intervals(prices, seed=3)
+    for name in ("median", "trimmed_mean"):
+        assert chunked[name] == pytest.approx(whole[name])
+    low, high = whole["median"]
+    assert low < float(np.median(prices)) < high
+
+
+def naive_approx(prices, level):
+    from statistics import NormalDist
+
+    s = np.sort(np.asarray(prices, dtype=np.float64))
+    n = len(s)
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    half = z * np.sqrt(n) / 2
+    low = min(max(int(np.floor(n / 2 - half)), 0), n - 1)
+    high = min(max(int(np.ceil(n / 2 + half)), 0), n - 1)
+
+    k = trim_count(n)
+    center = s[k:n - k].mean()
+    w = np.clip(s, s[k], s[n - 1 - k])
+    margin = z * w.std(ddof=1) / ((1 - 2 * k / n) * np.sqrt(n)) if n > 1 else 0.0
+    return {"median": (s[low], s[high]), "trimmed_mean": (center - margin, center + margin)}
+
+
+def test_approximate_intervals_many_matches_one_keyword_at_a_time():
+    rng = np.random.default_rng(9)
+    data = {f"kw{i}": rng.lognormal(3, 0.5, size=int(rng.integers(1, 60))) for i in range(100)}
+    data["empty"] = []
+    data["constant"] = [5.0] * 12
+
+    results = approximate_intervals_many(data, level=0.9)
+    assert "empty" not in results
+    assert results["constant"] == {"median": (5.0, 5.0), "trimmed_mean": (5.0, 5.0)}
+    for keyword, prices in data.items():
+        if len(prices):
+            expected = naive_approx(prices, 0.9)
+            for name in ("median", "trimmed_mean"):
+                assert results[keyword][name] == pytest.approx(expected[name]), keyword
+            assert approximate_intervals(prices, level=0.9) == results[keyword]
+
+    assert approximate_intervals_many([("a", [1.0, 2.0, 3.0])]).keys() == {"a"}
+    assert approximate_intervals_many({}) == {}
+
+
+def test_assess_confidence():
+    prices = [float(p) for p in range(10, 60)]
+    summary = summarize_prices(prices)
+    result = assess_confidence(prices, method="approx")
+    assert result["label"] == compute_confidence(summary)
+    assert result["method"] == "approx" and result["level"] == 0.95
+    assert result["median_ci"][0] <= summary["median"] <= result["median_ci"][1]
+    assert result["trimmed_mean_ci"][0] <= summary["trimmed_mean"] <= result["trimmed_mean_ci"][1]
+
+    with pytest.raises(ValueError):
+        assess_confidence(prices, method="magic")
+    with pytest.raises(EbayPricingError):
+        assess_confidence([])
@@ -0,0 +1,58 @@
+from scout.pricing import (
+    BAD_PHRASES,
+    PhraseMatcher,
+    classify_titles,
+    is_suspicious_title,
+    match_suspicious_phrase,
+)
+
+
+def naive_match(phrases, title):
+    # Reference: leftmost match, longest phrase at that position
+    folded = title.casefold()
+    best = None
+    for phrase in phrases:
+        index = folded.find(phrase)
+        if index >= 0 and (best is None or (index, -len(phrase)) < (best[0], -len(best[1]))):
+            best = (index, phrase)
+    return best[1] if best else None
+
+
+def test_prefix_phrases_prefer_the_longer_match():
+    assert match_suspicious_phrase("Nintendo DS FOR PARTS only") == "for parts"
+    assert match_suspicious_phrase("sold for part") == "for part"
+    assert match_suspicious_phrase("Sold AS-IS") == "as-is"
+    assert match_suspicious_phrase("Nintendo DS Lite tested") is None
+
+
+def test_matcher_agrees_with_naive_search():
+    titles = [
+        "Game Boy broken screen",
+        "Works great, not working wifi",
+        "",
+        "Does Not Work, sold as is",
+        "ipad parts only lot",
+        "camera doesn't work for parts",
+    ]
+    for title in titles:
+        assert match_suspicious_phrase(title) == naive_match(BAD_PHRASES, title)
+
+
+def test_classify_matches_single_search_and_keeps_titles_apart():
+    # The last word of one title plus the first of the next must not match
+    titles = ["xbox for", "parts console", "BROKEN", "fine"]
+    assert classify_titles(titles) == [match_suspicious_phrase(t) for t in titles]
+    assert classify_titles(titles) == [None, None, "broken", None]
+
+
+def test_casefold_and_empty_phrase_lists():
+    matcher = PhraseMatcher(["defekt", "STRASSE"])
+    assert matcher.search("Kamera DEFEKT") == "defekt"
+    assert matcher.search("straße") == "strasse"
+    assert PhraseMatcher([]).search("broken") is None
+    assert PhraseMatcher([]).classify(["a", "b"]) == [None, None]
+
+
+def test_phrase_list_changes_are_picked_up(monkeypatch):
+    monkeypatch.setattr("scout.pricing.BAD_PHRASES", BAD_PHRASES + ["cracked"])
+    assert is_suspicious_title("Cracked screen")
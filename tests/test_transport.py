@@ -0,0 +1,86 @@
+import pytest
+
+from scout import pricing
+from scout.standin import BrowseStandIn, synthetic_page
+from scout.transport import (
+    HttpTransport,
+    RecordingTransport,
+    ReplayTransport,
+    request_key,
+    transport_from_env,
+)
+
+
+@pytest.fixture
+def standin():
+    with BrowseStandIn(port=0, total_items=300) as server:
+        yield server
+
+
+@pytest.fixture
+def use_transport():
+    def install(transport):
+        pricing.set_transport(transport)
+        return transport
+
+    yield install
+    pricing.set_transport(None)
+
+
+def test_request_key_ignores_host_and_param_order():
+    a = request_key("https://api.ebay.com/search?q=ds&limit=5")
+    b = request_key("http://127.0.0.1:8765/search", {"limit": "5", "q": "ds"})
+    assert a == b
+    assert a != request_key("https://api.ebay.com/search?q=ds&limit=6")
+
+
+def test_synthetic_pages_are_deterministic():
+    assert synthetic_page("DS Lite", 0, 10, 100) == synthetic_page("ds lite", 0, 10, 100)
+    assert len(synthetic_page("x", 95, 10, 100)["itemSummaries"]) == 5
+
+
+def test_standin_serves_paginated_search(standin, use_transport):
+    use_transport(HttpTransport(standin.base_url))
+    records = list(pricing.iter_ebay_items("gameboy", max_items=300, page_size=100, include_filtered=True))
+
+    assert len(records) == 300
+    assert standin.stats["requests"] == 3
+
+
+def test_record_then_replay_without_network(standin, use_transport, tmp_path):
+    fixtures = str(tmp_path / "fixtures")
+    use_transport(RecordingTransport(HttpTransport(standin.base_url), fixtures))
+    recorded = pricing.fetch_ebay_prices("gameboy", limit=50)
+
+    standin.stop()
+    use_transport(ReplayTransport(fixtures))
+    assert pricing.fetch_ebay_prices("gameboy", limit=50) == recorded
+
+    with pytest.raises(pricing.EbayPricingError) as info:
+        pricing.fetch_ebay_prices("never recorded", limit=50)
+    assert info.value.status_code == 404
+
+
+def test_standin_injects_errors_and_throttling():
+    with BrowseStandIn(port=0, error_rate=1.0) as server:
+        resp = HttpTransport(server.base_url).get(pricing.EBAY_BROWSE_URL, {}, {"q": "x"})
+        assert resp.status_code in (500, 503)
+
+    with BrowseStandIn(port=0, rate_limit=0.001, burst=1) as server:
+        transport = HttpTransport(server.base_url)
+        assert transport.get(pricing.EBAY_BROWSE_URL, {}, {"q": "x"}).status_code == 200
+        throttled = transport.get(pricing.EBAY_BROWSE_URL, {}, {"q": "x"})
+        assert throttled.status_code == 429
+        assert throttled.headers["Retry-After"] == "1"
+
+
+def test_transport_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("SCOUT_EBAY_FIXTURES", str(tmp_path))
+    for mode, cls in (("live", HttpTransport), ("record", RecordingTransport),
+                      ("replay", ReplayTransport), ("standin", HttpTransport)):
+        monkeypatch.setenv("SCOUT_EBAY_TRANSPORT", mode)
+        assert isinstance(transport_from_env(), cls)
+
+    monkeypatch.setenv("SCOUT_EBAY_TRANSPORT", "bogus")
+    with pytest.raises(ValueError):
+        transport_from_env()
@@ -0,0 +1,127 @@
+import requests
+
+from scout.pricing import EbayPricingError
+from scout.watchlist import WatchItem, Watchlist
+
+
+class Lookup:
+    def __init__(self, medians):
+        self.medians = medians
+        self.calls = []
+
+    def __call__(self, keyword):
+        self.calls.append(keyword)
+        value = self.medians[keyword]
+        if isinstance(value, BaseException):
+            raise value
+        return {"median": value, "count": 20}
+
+
+def item(item_id, keyword="ds", bid=20.0, shipping=5.0, end_time=1000.0):
+    return WatchItem(item_id, keyword, bid, shipping, end_time)
+
+
+def test_alerts_once_per_crossing():
+    alerts = []
+    lookup = Lookup({"ds": 50.0})
+    watchlist = Watchlist(lookup, profit_threshold=10.0, on_alert=alerts.append)
+    watchlist.add(item("a"))
+
+    assert len(watchlist.run_once(now=0)) == 1
+    assert watchlist.run_once(now=1) == []
+
+    watchlist.update("a", current_bid=45.0)
+    assert watchlist.run_once(now=2) == []
+    watchlist.update("a", current_bid=10.0)
+    assert len(watchlist.run_once(now=3)) == 1
+    assert len(alerts) == 2
+
+
+def test_only_changed_items_are_repriced_and_summary_is_shared():
+    lookup = Lookup({"ds": 50.0})
+    watchlist = Watchlist(lookup)
+    for i in range(5):
+        watchlist.add(item(str(i)))
+
+    watchlist.run_once(now=0)
+    assert lookup.calls == ["ds"]
+    assert watchlist.stats["evaluated"] == 5
+
+    watchlist.update("3", current_bid=20.0)  # unchanged
+    watchlist.update("4", shipping_cost=1.0)
+    watchlist.run_once(now=1)
+    assert watchlist.stats["evaluated"] == 6
+
+
+def test_ended_auctions_are_dropped_and_extensions_respected():
+    watchlist = Watchlist(Lookup({"ds": 50.0}))
+    watchlist.add(item("a", end_time=10))
+    watchlist.add(item("b", end_time=10))
+    watchlist.update("b", end_time=100)
+
+    watchlist.run_once(now=50)
+    assert len(watchlist) == 1
+    assert watchlist.stats["ended"] == 1
+
+
+def test_summaries_refresh_after_ttl():
+    lookup = Lookup({"ds": 50.0})
+    watchlist = Watchlist(lookup, summary_ttl=60)
+    watchlist.add(item("a"))
+    watchlist.run_once(now=0)
+    watchlist.run_once(now=30)
+    watchlist.run_once(now=61)
+    assert lookup.calls == ["ds", "ds"]
+
+
+def test_failing_keyword_is_looked_up_once_per_retry_with_backoff():
+    lookup = Lookup({"bad": EbayPricingError("offline"), "ds": 50.0})
+    watchlist = Watchlist(lookup, retry_delay=10, max_retry_delay=40)
+    for i in range(20):
+        watchlist.add(item(f"bad{i}", keyword="bad"))
+    watchlist.add(item("good", keyword="ds"))
+
+    watchlist.run_once(now=0)
+    assert lookup.calls.count("bad") == 1
+    assert watchlist.stats["evaluated"] == 1
+
+    # Nothing due: no lookups at all on the following ticks
+    for now in range(1, 10):
+        watchlist.run_once(now=now)
+    assert lookup.calls.count("bad") == 1
+
+    # Retries at 10, then 10 + 20, then 30 + 40, then every 40 (capped)
+    retry_times = []
+    for now in range(10, 200):
+        before = lookup.calls.count("bad")
+        watchlist.run_once(now=now)
+        if lookup.calls.count("bad") > before:
+            retry_times.append(now)
+    assert retry_times == [10, 30, 70, 110, 150, 190]
+
+
+def test_recovered_keyword_reprices_waiting_items():
+    lookup = Lookup({"ds": requests.ConnectionError("down")})
+    watchlist = Watchlist(lookup, retry_delay=5)
+    watchlist.add(item("a"))
+    watchlist.add(item("b"))
+
+    # A network error must not escape run_once
+    assert watchlist.run_once(now=0) == []
+    assert watchlist.stats["lookup_errors"] == 1
+
+    lookup.medians["ds"] = 50.0
+    assert watchlist.run_once(now=1) == []
+    alerts = watchlist.run_once(now=5)
+    assert sorted(alert.item.item_id for alert in alerts) == ["a", "b"]
+    assert watchlist.stats["lookups"] == 2
+
+
+def test_removing_items_clears_failure_state():
+    lookup = Lookup({"bad": EbayPricingError("offline")})
+    watchlist = Watchlist(lookup)
+    watchlist.add(item("a", keyword="bad"))
+    watchlist.run_once(now=0)
+
+    watchlist.remove("a")
+    assert watchlist._failures == {} and watchlist._waiting == {}